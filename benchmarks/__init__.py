@@ -0,0 +1,7 @@
+"""
+Benchmarks reproducibles de planificación y simulación
+"""
+from .medicion import medir, estadisticas
+from .mapas import generar_obstaculos
+
+__all__ = ['medir', 'estadisticas', 'generar_obstaculos']
@@ -0,0 +1,238 @@
+"""
+Comparación planificador × algoritmo sobre consultas aleatorias
+Para cada nivel se muestrean pares inicio/objetivo en celdas libres y se
+resuelven como lo hace Fantasma.perseguir_pacman, midiendo calidad y costo.
+La razón de longitud compara el costo euclidiano del camino con el óptimo
+8-conexo de la grilla; los caminos de ángulo libre que rozan las esquinas de
+los obstáculos pueden quedar por debajo de 1
+
+Uso:
+    python -m benchmarks.comparacion --pares 2000
+"""
+import argparse
+import heapq
+import json
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from clases.obstaculo import Obstaculo
+from config.configuracion import LIMITE
+from config.niveles import NIVELES
+from planificacion.busqueda_grafo import BusquedaEnGrafo
+from planificacion.diagrama_voronoi import DiagramaVoronoi
+from planificacion.estadisticas import EstadisticasBusqueda
+from planificacion.grilla import celdas_libres, construir_grilla_libre
+from planificacion.visibility_graph import VisibilityGraph
+from benchmarks.medicion import metadatos
+
+
+METODOS = ['visibility', 'voronoi']
+ALGORITMOS = ['a_star', 'bpa', 'greedy']
+TAMANIO_LOTE = 250
+_VECINOS_OCTILES = [(dx, dy, math.hypot(dx, dy)) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy]
+
+
+def distancias_grilla(libre: np.ndarray, inicio: Tuple[int, int], limite: int) -> np.ndarray:
+    """
+    Dijkstra 8-conexo (diagonales de costo √2) desde una celda.
+    Las diagonales no pueden cortar esquinas de celdas ocupadas.
+
+    Returns:
+        Arreglo de distancias (inf en celdas inalcanzables)
+    """
+    lado = libre.shape[0]
+    distancias = np.full(libre.shape, np.inf)
+    origen = (inicio[0] + limite, inicio[1] + limite)
+    distancias[origen] = 0.0
+    heap = [(0.0, origen)]
+
+    while heap:
+        d, (x, y) = heapq.heappop(heap)
+        if d > distancias[x, y]:
+            continue
+        for dx, dy, costo in _VECINOS_OCTILES:
+            nx, ny = x + dx, y + dy
+            if not (0 <= nx < lado and 0 <= ny < lado and libre[nx, ny]):
+                continue
+            if dx and dy and not (libre[x + dx, y] and libre[x, y + dy]):
+                continue
+            nueva = d + costo
+            if nueva < distancias[nx, ny]:
+                distancias[nx, ny] = nueva
+                heapq.heappush(heap, (nueva, (nx, ny)))
+
+    return distancias
+
+
+def clearance_camino(camino: List[Tuple[int, int]], voronoi: DiagramaVoronoi,
+                     paso: float = 0.25) -> float:
+    """Clearance mínima a obstáculos muestreando los segmentos del camino"""
+    minimo = float('inf')
+    for (x1, y1), (x2, y2) in zip(camino, camino[1:]):
+        largo = max(abs(x2 - x1), abs(y2 - y1))
+        muestras = max(1, int(largo / paso))
+        for i in range(muestras + 1):
+            t = i / muestras
+            celda = (round(x1 + t * (x2 - x1)), round(y1 + t * (y2 - y1)))
+            minimo = min(minimo, voronoi.obtener_clearance(celda))
+    if len(camino) == 1:
+        minimo = voronoi.obtener_clearance(camino[0])
+    return minimo
+
+
+# Planificadores construidos en cada proceso trabajador, por nivel
+_planificadores: Dict[int, Tuple[VisibilityGraph, DiagramaVoronoi, np.ndarray]] = {}
+
+
+def _planificadores_nivel(nivel: int) -> Tuple[VisibilityGraph, DiagramaVoronoi, np.ndarray]:
+    """Construye (una vez por proceso) los planificadores y la grilla de un nivel"""
+    if nivel not in _planificadores:
+        obstaculos = [Obstaculo(x, y, tam) for x, y, tam in NIVELES[nivel]['obstaculos']]
+        _planificadores[nivel] = (
+            VisibilityGraph(obstaculos, (LIMITE, LIMITE)),
+            DiagramaVoronoi(obstaculos, (LIMITE, LIMITE), silencioso=True),
+            construir_grilla_libre(obstaculos, LIMITE)
+        )
+    return _planificadores[nivel]
+
+
+def _resolver_lote(nivel: int, metodo: str, algoritmo: str,
+                   pares: List[Tuple[Tuple[int, int], Tuple[int, int]]]) -> List[Dict]:
+    """Resuelve un lote de consultas en un proceso trabajador"""
+    visibility_graph, voronoi, libre = _planificadores_nivel(nivel)
+    planificador = voronoi if metodo == 'voronoi' else visibility_graph
+
+    filas = []
+    optimos = {}
+    for inicio, objetivo in pares:
+        if inicio not in optimos:
+            optimos[inicio] = distancias_grilla(libre, inicio, LIMITE)
+        optimo = float(optimos[inicio][objetivo[0] + LIMITE, objetivo[1] + LIMITE])
+
+        estadisticas = EstadisticasBusqueda(metodo=metodo)
+        camino = BusquedaEnGrafo.planificar_ruta(planificador, algoritmo, inicio, objetivo, estadisticas)
+
+        filas.append({
+            'encontrado': bool(camino),
+            'optimo': optimo,
+            'costo': estadisticas.costo_camino,
+            'clearance': clearance_camino(camino, voronoi) if camino else None,
+            'expansiones': estadisticas.expansiones,
+            'latencia': estadisticas.tiempo_total,
+        })
+    return filas
+
+
+def muestrear_pares(nivel: int, cantidad: int, semilla: int) -> List[Tuple[Tuple[int, int], Tuple[int, int]]]:
+    """Pares inicio/objetivo distintos en celdas libres, con semilla fija"""
+    obstaculos = [Obstaculo(x, y, tam) for x, y, tam in NIVELES[nivel]['obstaculos']]
+    libres = celdas_libres(construir_grilla_libre(obstaculos, LIMITE), LIMITE)
+    rng = random.Random(semilla + nivel)
+    return [tuple(rng.sample(libres, 2)) for _ in range(cantidad)]
+
+
+def resumir(filas: List[Dict]) -> Dict:
+    """Agrega las consultas de una combinación nivel/método/algoritmo"""
+    resueltas = [f for f in filas if f['encontrado'] and 0 < f['optimo'] < math.inf]
+    latencias = np.array([f['latencia'] for f in filas]) * 1000
+    expansiones = np.array([f['expansiones'] for f in filas])
+    razones = np.array([f['costo'] / f['optimo'] for f in resueltas])
+    clearances = np.array([f['clearance'] for f in resueltas])
+
+    def pct(datos, p):
+        return float(np.percentile(datos, p)) if len(datos) else None
+
+    return {
+        'consultas': len(filas),
+        'tasa_exito': sum(f['encontrado'] for f in filas) / len(filas) if filas else 0.0,
+        'razon_longitud_media': float(razones.mean()) if len(razones) else None,
+        'razon_longitud_p90': pct(razones, 90),
+        'clearance_media': float(clearances.mean()) if len(clearances) else None,
+        'clearance_min': float(clearances.min()) if len(clearances) else None,
+        'expansiones_media': float(expansiones.mean()) if len(expansiones) else 0.0,
+        'expansiones_p90': pct(expansiones, 90),
+        'latencia_ms_p50': pct(latencias, 50),
+        'latencia_ms_p90': pct(latencias, 90),
+        'latencia_ms_p99': pct(latencias, 99),
+    }
+
+
+def ejecutar(pares: int = 1000, niveles: Optional[List[int]] = None, semilla: int = 0,
+             procesos: Optional[int] = None, metodos: Optional[List[str]] = None,
+             algoritmos: Optional[List[str]] = None) -> Dict:
+    """
+    Ejecuta la comparación en paralelo
+
+    Args:
+        pares: Consultas por nivel (las mismas para todas las combinaciones)
+        niveles: Índices de nivel (por defecto todos)
+        semilla: Semilla del muestreo
+        procesos: Procesos del pool (por defecto todos los núcleos)
+        metodos: Planificadores a comparar
+        algoritmos: Algoritmos de búsqueda a comparar
+
+    Returns:
+        Diccionario con metadatos y resumen por 'nivel/metodo/algoritmo'
+    """
+    niveles = niveles if niveles is not None else list(range(len(NIVELES)))
+    metodos = metodos or METODOS
+    algoritmos = algoritmos or ALGORITMOS
+    procesos = procesos or os.cpu_count() or 1
+
+    filas: Dict[str, List[Dict]] = {}
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        futuros = {}
+        for nivel in niveles:
+            consultas = muestrear_pares(nivel, pares, semilla)
+            for metodo in metodos:
+                for algoritmo in algoritmos:
+                    clave = f"nivel_{nivel + 1}/{metodo}/{algoritmo}"
+                    filas[clave] = []
+                    for i in range(0, len(consultas), TAMANIO_LOTE):
+                        lote = consultas[i:i + TAMANIO_LOTE]
+                        futuros[pool.submit(_resolver_lote, nivel, metodo, algoritmo, lote)] = clave
+
+        for futuro in as_completed(futuros):
+            filas[futuros[futuro]].extend(futuro.result())
+
+    return {
+        'metadatos': metadatos(suite='comparacion', pares=pares, semilla=semilla, procesos=procesos),
+        'resultados': {clave: resumir(f) for clave, f in filas.items()}
+    }
+
+
+def imprimir_tabla(datos: Dict):
+    """Tabla legible del resumen"""
+    def fmt(valor, decimales=2):
+        return f"{valor:.{decimales}f}" if valor is not None else '-'
+
+    print(f"{'Combinación':<30}{'éxito':>7}{'razón':>7}{'r p90':>7}{'clear':>7}"
+          f"{'exp':>8}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}")
+    for clave, r in datos['resultados'].items():
+        print(f"{clave:<30}{r['tasa_exito'] * 100:>6.1f}%{fmt(r['razon_longitud_media']):>7}"
+              f"{fmt(r['razon_longitud_p90']):>7}{fmt(r['clearance_media']):>7}"
+              f"{fmt(r['expansiones_media'], 1):>8}{fmt(r['latencia_ms_p50']):>9}"
+              f"{fmt(r['latencia_ms_p90']):>9}{fmt(r['latencia_ms_p99']):>9}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Comparación de planificadores y algoritmos")
+    parser.add_argument('--pares', type=int, default=1000, help="Consultas por nivel")
+    parser.add_argument('--niveles', type=int, nargs='+', default=None, help="Índices de nivel (desde 0)")
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--procesos', type=int, default=None)
+    parser.add_argument('--json', action='store_true', help="Salida en JSON")
+    args = parser.parse_args(argv)
+
+    datos = ejecutar(args.pares, args.niveles, args.semilla, args.procesos)
+    if args.json:
+        print(json.dumps(datos, indent=2))
+    else:
+        imprimir_tabla(datos)
+
+
+if __name__ == "__main__":
+    main()
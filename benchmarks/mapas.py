@@ -0,0 +1,43 @@
+"""
+Generador reproducible de mapas para benchmarks
+"""
+import random
+from typing import List
+from clases.obstaculo import Obstaculo
+
+
+def generar_obstaculos(limite: int, densidad: float = 0.12, semilla: int = 0) -> List[Obstaculo]:
+    """
+    Genera obstáculos cuadrados aleatorios en el mundo [-limite, limite]²
+
+    Args:
+        limite: Coordenada máxima del mapa en cada eje
+        densidad: Fracción aproximada de celdas ocupadas
+        semilla: Semilla del generador
+
+    Returns:
+        Lista de obstáculos (el centro y las esquinas quedan libres)
+    """
+    rng = random.Random(semilla)
+    celdas = (2 * limite + 1) ** 2
+    objetivo = int(celdas * densidad)
+
+    obstaculos = []
+    ocupadas = 0
+    intentos = 0
+    while ocupadas < objetivo and intentos < celdas * 10:
+        intentos += 1
+        tam = rng.choice((1, 1, 2))
+        x = rng.randint(-limite + 1, limite - 1)
+        y = rng.randint(-limite + 1, limite - 1)
+
+        # Dejar libre el spawn de Pac-Man y las esquinas de los fantasmas
+        if abs(x) <= 2 and abs(y) <= 2:
+            continue
+        if abs(abs(x) - (limite - 2)) <= 1 and abs(abs(y) - (limite - 2)) <= 1:
+            continue
+
+        obstaculos.append(Obstaculo(x, y, tam))
+        ocupadas += tam * tam
+
+    return obstaculos
@@ -0,0 +1,68 @@
+"""
+Utilidades de medición: calentamiento, repeticiones y percentiles
+"""
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+import numpy as np
+
+
+def estadisticas(muestras: List[float]) -> Dict[str, float]:
+    """
+    Resume una lista de tiempos (segundos)
+
+    Returns:
+        Diccionario con media, desviación, mínimo, máximo y percentiles 50/90/99
+    """
+    datos = np.asarray(muestras, dtype=float)
+    return {
+        'repeticiones': int(len(datos)),
+        'media': float(datos.mean()),
+        'desviacion': float(datos.std()),
+        'min': float(datos.min()),
+        'max': float(datos.max()),
+        'p50': float(np.percentile(datos, 50)),
+        'p90': float(np.percentile(datos, 90)),
+        'p99': float(np.percentile(datos, 99)),
+    }
+
+
+def medir(funcion: Callable[[], None], repeticiones: int = 5, calentamiento: int = 1,
+          preparar: Optional[Callable[[], None]] = None) -> Dict[str, float]:
+    """
+    Mide el tiempo de una función con perf_counter
+
+    Args:
+        funcion: Función sin argumentos a medir
+        repeticiones: Ejecuciones medidas
+        calentamiento: Ejecuciones previas descartadas
+        preparar: Función opcional ejecutada (sin medir) antes de cada ejecución
+
+    Returns:
+        Estadísticas de los tiempos en segundos
+    """
+    muestras = []
+    for i in range(calentamiento + repeticiones):
+        if preparar is not None:
+            preparar()
+        inicio = time.perf_counter()
+        funcion()
+        duracion = time.perf_counter() - inicio
+        if i >= calentamiento:
+            muestras.append(duracion)
+    return estadisticas(muestras)
+
+
+def metadatos(**extra) -> Dict:
+    """Información del entorno de ejecución para acompañar los resultados"""
+    datos = {
+        'fecha': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'plataforma': platform.platform(),
+        'procesador': platform.processor() or platform.machine(),
+        'numpy': np.__version__,
+    }
+    datos.update(extra)
+    return datos
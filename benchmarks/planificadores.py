@@ -0,0 +1,167 @@
+"""
+Benchmark de planificación: construcción de grafos, puntos temporales y búsquedas
+
+Uso:
+    python -m benchmarks.planificadores --salida resultados.json
+"""
+import argparse
+import json
+import random
+from typing import Callable, Dict, List, Optional, Tuple
+from clases.obstaculo import Obstaculo
+from config.configuracion import LIMITE
+from config.niveles import NIVELES
+from planificacion.busqueda_grafo import BusquedaEnGrafo
+from planificacion.diagrama_voronoi import DiagramaVoronoi
+from planificacion.grilla import celdas_libres, construir_grilla_libre
+from planificacion.visibility_graph import VisibilityGraph
+from benchmarks.mapas import generar_obstaculos
+from benchmarks.medicion import medir, metadatos
+
+
+ALGORITMOS = ['a_star', 'bpa', 'greedy']
+NUM_PUNTOS_TEMPORALES = 20
+NUM_CONSULTAS = 50
+
+
+def construir_planificador(metodo: str, obstaculos: List[Obstaculo], limite: int):
+    """Construye un VisibilityGraph o un DiagramaVoronoi"""
+    if metodo == 'voronoi':
+        return DiagramaVoronoi(obstaculos, (limite, limite), silencioso=True)
+    return VisibilityGraph(obstaculos, (limite, limite))
+
+
+def escenarios(tamanios: List[int]) -> List[Tuple[str, List[Obstaculo], int]]:
+    """Niveles del juego y mapas generados: (nombre, obstáculos, límite)"""
+    lista = []
+    for i, nivel in enumerate(NIVELES):
+        obstaculos = [Obstaculo(x, y, tam) for x, y, tam in nivel['obstaculos']]
+        lista.append((f"nivel_{i + 1}", obstaculos, LIMITE))
+    for limite in tamanios:
+        lista.append((f"mapa_{2 * limite + 1}x{2 * limite + 1}",
+                      generar_obstaculos(limite, semilla=limite), limite))
+    return lista
+
+
+def casos_escenario(nombre: str, obstaculos: List[Obstaculo], limite: int,
+                    repeticiones: int, calentamiento: int,
+                    filtro: str = '') -> List[Tuple[str, Callable, Dict]]:
+    """
+    Casos de un escenario como (nombre, función, parámetros de medir).
+    Los puntos de consulta se eligen con semilla fija para que sean reproducibles.
+    """
+    libres = celdas_libres(construir_grilla_libre(obstaculos, limite), limite)
+    casos = []
+
+    for metodo in ('visibility', 'voronoi'):
+        nombres = [f"construccion/{metodo}/{nombre}", f"agregar_punto_temporal/{metodo}/{nombre}"]
+        nombres += [f"busqueda/{metodo}/{alg}/{nombre}" for alg in ALGORITMOS]
+        if filtro and not any(filtro in n for n in nombres):
+            continue  # Evita construir planificadores que no se medirán
+
+        rng = random.Random(0)
+        casos.append((
+            f"construccion/{metodo}/{nombre}",
+            lambda m=metodo: construir_planificador(m, obstaculos, limite),
+            {'repeticiones': repeticiones, 'calentamiento': calentamiento}
+        ))
+
+        planificador = construir_planificador(metodo, obstaculos, limite)
+
+        # Costo de conectar y desconectar puntos que no son nodos del grafo
+        externos = [p for p in libres if p not in planificador.grafo]
+        temporales = rng.sample(externos, min(NUM_PUNTOS_TEMPORALES, len(externos)))
+
+        def agregar_y_eliminar(p=planificador, puntos=temporales):
+            for punto in puntos:
+                p.agregar_punto_temporal(punto)
+                p.eliminar_punto_temporal(punto)
+
+        casos.append((
+            f"agregar_punto_temporal/{metodo}/{nombre}",
+            agregar_y_eliminar,
+            {'repeticiones': repeticiones * 4, 'calentamiento': calentamiento}
+        ))
+
+        # Búsquedas entre nodos del grafo (sin costo de puntos temporales)
+        nodos = sorted(planificador.grafo.keys())
+        consultas = [tuple(rng.sample(nodos, 2)) for _ in range(NUM_CONSULTAS)] if len(nodos) >= 2 else []
+
+        for algoritmo in ALGORITMOS:
+            def buscar(g=planificador.grafo, alg=algoritmo, pares=consultas):
+                for inicio, objetivo in pares:
+                    BusquedaEnGrafo.buscar(g, alg, inicio, objetivo)
+
+            casos.append((
+                f"busqueda/{metodo}/{algoritmo}/{nombre}",
+                buscar,
+                {'repeticiones': repeticiones * 4, 'calentamiento': calentamiento}
+            ))
+
+    return casos
+
+
+def ejecutar(repeticiones: int = 5, calentamiento: int = 1,
+             tamanios: Optional[List[int]] = None, filtro: str = '',
+             progreso: bool = False) -> Dict:
+    """
+    Ejecuta todos los casos del benchmark
+
+    Args:
+        repeticiones: Repeticiones base por caso
+        calentamiento: Ejecuciones descartadas por caso
+        tamanios: Límites de los mapas generados (además de los niveles)
+        filtro: Solo se ejecutan los casos cuyo nombre contiene este texto
+        progreso: Imprime el nombre de cada caso al ejecutarlo
+
+    Returns:
+        Diccionario con metadatos y estadísticas por caso (segundos)
+    """
+    tamanios = [10, 14] if tamanios is None else tamanios
+    resultados = {}
+
+    for nombre, obstaculos, limite in escenarios(tamanios):
+        for caso, funcion, parametros in casos_escenario(nombre, obstaculos, limite,
+                                                         repeticiones, calentamiento, filtro):
+            if filtro and filtro not in caso:
+                continue
+            if progreso:
+                print(f"  {caso}", flush=True)
+            resultados[caso] = medir(funcion, **parametros)
+
+    return {
+        'metadatos': metadatos(
+            suite='planificadores',
+            repeticiones=repeticiones,
+            calentamiento=calentamiento,
+            tamanios=tamanios,
+            consultas=NUM_CONSULTAS,
+            puntos_temporales=NUM_PUNTOS_TEMPORALES
+        ),
+        'resultados': resultados
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de planificadores")
+    parser.add_argument('--salida', default='', help="Archivo JSON de salida (por defecto stdout)")
+    parser.add_argument('--repeticiones', type=int, default=5)
+    parser.add_argument('--calentamiento', type=int, default=1)
+    parser.add_argument('--tamanios', type=int, nargs='*', default=[10, 14],
+                        help="Límites de los mapas generados")
+    parser.add_argument('--filtro', default='', help="Subcadena del nombre de los casos")
+    args = parser.parse_args(argv)
+
+    datos = ejecutar(args.repeticiones, args.calentamiento, args.tamanios, args.filtro,
+                     progreso=bool(args.salida))
+    texto = json.dumps(datos, indent=2)
+
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as archivo:
+            archivo.write(texto + '\n')
+    else:
+        print(texto)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Control de regresiones de rendimiento contra una línea base guardada
+
+Uso:
+    python -m benchmarks.regresion                 # compara y falla si hay regresiones
+    python -m benchmarks.regresion --actualizar    # registra una nueva línea base
+"""
+import argparse
+import json
+import os
+import sys
+from typing import Dict, List, Optional, Tuple
+from benchmarks import planificadores, simulacion
+from benchmarks.medicion import metadatos
+
+
+BASELINE_POR_DEFECTO = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+# Estados de cada caso en la comparación
+ESTADO_OK = 'ok'
+ESTADO_REGRESION = 'REGRESION'
+ESTADO_MEJORA = 'mejora'
+ESTADO_NUEVO = 'nuevo'
+ESTADO_FALTANTE = 'faltante'
+
+
+def ejecutar_suites(repeticiones: int, calentamiento: int, filtro: str = '') -> Dict:
+    """Ejecuta los benchmarks de planificadores y de simulación"""
+    resultados = {}
+    resultados.update(planificadores.ejecutar(repeticiones, calentamiento, tamanios=[10],
+                                              filtro=filtro, progreso=True)['resultados'])
+    resultados.update(simulacion.ejecutar(repeticiones, calentamiento, filtro=filtro,
+                                          progreso=True)['resultados'])
+    return {
+        'metadatos': metadatos(suite='regresion', repeticiones=repeticiones,
+                               calentamiento=calentamiento),
+        'resultados': resultados
+    }
+
+
+def comparar(base: Dict, actual: Dict, tolerancia: float, metrica: str = 'p50',
+             minimo_absoluto: float = 0.0) -> List[Tuple[str, Optional[float], Optional[float], Optional[float], str]]:
+    """
+    Compara dos conjuntos de resultados caso por caso
+
+    Args:
+        base: Resultados de la línea base ({caso: estadísticas})
+        actual: Resultados actuales
+        tolerancia: Aumento relativo permitido (0.25 = 25%)
+        metrica: Estadística a comparar ('p50', 'media', 'min', ...)
+        minimo_absoluto: Diferencias menores a esto (segundos) nunca son regresión
+
+    Returns:
+        Filas (caso, base, actual, delta relativo, estado)
+    """
+    filas = []
+    for caso in sorted(set(base) | set(actual)):
+        if caso not in actual:
+            filas.append((caso, base[caso][metrica], None, None, ESTADO_FALTANTE))
+            continue
+        if caso not in base:
+            filas.append((caso, None, actual[caso][metrica], None, ESTADO_NUEVO))
+            continue
+
+        valor_base = base[caso][metrica]
+        valor_actual = actual[caso][metrica]
+        delta = (valor_actual - valor_base) / valor_base if valor_base > 0 else 0.0
+        diferencia = abs(valor_actual - valor_base)
+
+        if delta > tolerancia and diferencia >= minimo_absoluto:
+            estado = ESTADO_REGRESION
+        elif delta < -tolerancia and diferencia >= minimo_absoluto:
+            estado = ESTADO_MEJORA
+        else:
+            estado = ESTADO_OK
+        filas.append((caso, valor_base, valor_actual, delta, estado))
+
+    return filas
+
+
+def imprimir_tabla(filas: List[Tuple], metrica: str):
+    """Imprime la tabla de deltas por benchmark"""
+    def ms(valor):
+        return f"{valor * 1000:.3f}" if valor is not None else '-'
+
+    ancho = max([len(f[0]) for f in filas] + [10])
+    print(f"{'Benchmark':<{ancho}}  {'base ms':>11}  {'actual ms':>11}  {'delta':>8}  estado")
+    print('-' * (ancho + 46))
+    for caso, valor_base, valor_actual, delta, estado in filas:
+        texto_delta = f"{delta * 100:+.1f}%" if delta is not None else '-'
+        print(f"{caso:<{ancho}}  {ms(valor_base):>11}  {ms(valor_actual):>11}  {texto_delta:>8}  {estado}")
+    print(f"(métrica: {metrica})")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Control de regresiones de rendimiento")
+    parser.add_argument('--baseline', default=BASELINE_POR_DEFECTO, help="Archivo JSON de línea base")
+    parser.add_argument('--resultados', default='',
+                        help="Usa un JSON de resultados existente en lugar de ejecutar los benchmarks")
+    parser.add_argument('--actualizar', action='store_true', help="Guarda los resultados como nueva línea base")
+    parser.add_argument('--tolerancia', type=float, default=0.25,
+                        help="Aumento relativo permitido antes de fallar (0.25 = 25%%)")
+    parser.add_argument('--minimo-absoluto', type=float, default=0.0005,
+                        help="Diferencia mínima en segundos para considerar un cambio")
+    parser.add_argument('--metrica', default='p50', help="Estadística a comparar")
+    parser.add_argument('--repeticiones', type=int, default=5)
+    parser.add_argument('--calentamiento', type=int, default=1)
+    parser.add_argument('--filtro', default='', help="Subcadena del nombre de los casos")
+    args = parser.parse_args(argv)
+
+    if args.resultados:
+        with open(args.resultados, encoding='utf-8') as archivo:
+            actual = json.load(archivo)
+        if args.filtro:
+            actual['resultados'] = {k: v for k, v in actual['resultados'].items() if args.filtro in k}
+    else:
+        actual = ejecutar_suites(args.repeticiones, args.calentamiento, args.filtro)
+
+    if args.actualizar:
+        nueva = actual
+        if args.filtro and os.path.exists(args.baseline):
+            # Con filtro solo se reemplazan los casos medidos; el resto se conserva
+            with open(args.baseline, encoding='utf-8') as archivo:
+                nueva = json.load(archivo)
+            nueva['resultados'].update(actual['resultados'])
+        with open(args.baseline, 'w', encoding='utf-8') as archivo:
+            archivo.write(json.dumps(nueva, indent=2) + '\n')
+        print(f"Línea base actualizada: {args.baseline} ({len(actual['resultados'])} casos medidos, "
+              f"{len(nueva['resultados'])} en total)")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No existe la línea base {args.baseline}; ejecuta con --actualizar", file=sys.stderr)
+        return 2
+
+    with open(args.baseline, encoding='utf-8') as archivo:
+        base = json.load(archivo)
+
+    resultados_base = base['resultados']
+    resultados_actuales = actual['resultados']
+    if args.filtro:
+        resultados_base = {k: v for k, v in resultados_base.items() if args.filtro in k}
+
+    filas = comparar(resultados_base, resultados_actuales, args.tolerancia,
+                     args.metrica, args.minimo_absoluto)
+    imprimir_tabla(filas, args.metrica)
+
+    regresiones = [f for f in filas if f[4] == ESTADO_REGRESION]
+    if regresiones:
+        print(f"\n{len(regresiones)} regresión(es) por encima de {args.tolerancia * 100:.0f}%")
+        return 1
+
+    print("\nSin regresiones")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
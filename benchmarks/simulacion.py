@@ -0,0 +1,93 @@
+"""
+Benchmark de simulación: episodios headless y entorno vectorizado
+
+Uso:
+    python -m benchmarks.simulacion --salida resultados.json
+"""
+import argparse
+import json
+from typing import Dict
+import numpy as np
+from config.niveles import NIVELES
+from simulacion.entorno_vectorizado import EntornoVectorizado
+from simulacion.motor_headless import MotorHeadless
+from benchmarks.medicion import medir, metadatos
+
+
+EPISODIOS_POR_REPETICION = 5
+NUM_ENTORNOS_VECTORIZADOS = 64
+PASOS_VECTORIZADOS = 100
+
+
+def ejecutar(repeticiones: int = 5, calentamiento: int = 1, filtro: str = '',
+             progreso: bool = False) -> Dict:
+    """
+    Ejecuta los casos de simulación para cada nivel
+
+    Returns:
+        Diccionario con metadatos y estadísticas por caso (segundos)
+    """
+    resultados = {}
+
+    for i in range(len(NIVELES)):
+        nombre = f"nivel_{i + 1}"
+
+        caso = f"simulacion/headless/{nombre}"
+        if not filtro or filtro in caso:
+            if progreso:
+                print(f"  {caso}", flush=True)
+            motor = MotorHeadless(max_pasos=2000, reutilizar_planificadores=True)
+            resultados[caso] = medir(
+                lambda m=motor, n=i: m.ejecutar(EPISODIOS_POR_REPETICION, nivel=n, semilla=0),
+                repeticiones, calentamiento
+            )
+
+        caso = f"simulacion/vectorizado/{nombre}"
+        if not filtro or filtro in caso:
+            if progreso:
+                print(f"  {caso}", flush=True)
+            entorno = EntornoVectorizado(NUM_ENTORNOS_VECTORIZADOS, nivel=i, semilla=0)
+            rng = np.random.default_rng(0)
+            acciones = rng.integers(0, 5, (PASOS_VECTORIZADOS, NUM_ENTORNOS_VECTORIZADOS))
+
+            def avanzar(e=entorno, a=acciones):
+                for fila in a:
+                    e.step(fila)
+
+            # El calentamiento además llena la caché de rutas de los fantasmas
+            resultados[caso] = medir(avanzar, repeticiones, max(calentamiento, 1),
+                                     preparar=lambda e=entorno: e.reset())
+
+    return {
+        'metadatos': metadatos(
+            suite='simulacion',
+            repeticiones=repeticiones,
+            calentamiento=calentamiento,
+            episodios_por_repeticion=EPISODIOS_POR_REPETICION,
+            entornos_vectorizados=NUM_ENTORNOS_VECTORIZADOS,
+            pasos_vectorizados=PASOS_VECTORIZADOS
+        ),
+        'resultados': resultados
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de simulación")
+    parser.add_argument('--salida', default='', help="Archivo JSON de salida (por defecto stdout)")
+    parser.add_argument('--repeticiones', type=int, default=5)
+    parser.add_argument('--calentamiento', type=int, default=1)
+    parser.add_argument('--filtro', default='', help="Subcadena del nombre de los casos")
+    args = parser.parse_args(argv)
+
+    datos = ejecutar(args.repeticiones, args.calentamiento, args.filtro, progreso=bool(args.salida))
+    texto = json.dumps(datos, indent=2)
+
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as archivo:
+            archivo.write(texto + '\n')
+    else:
+        print(texto)
+
+
+if __name__ == "__main__":
+    main()
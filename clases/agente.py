@@ -1,35 +1,82 @@
 """
 Clase base para todos los agentes (Pac-Man y Fantasmas)
 """
-from typing import List, Tuple, Optional
+from collections import deque
+from typing import Deque, Iterable, List, Tuple, Optional
 from clases.nodo import Nodo
+from planificacion.estadisticas import EstadisticasBusqueda
+from planificacion.rasterizacion import CacheRasterizacion
+from config.configuracion import RASTERIZAR_TRAYECTORIAS
 
 class Agente:
     def __init__(self, posx: int, posy: int):
         self.pos = [posx, posy]
-        self.trayectoria: List[List[int]] = []
+        # Posición al comenzar el tick actual (captura por cruce con un fantasma)
+        self.pos_anterior: Tuple[int, int] = (posx, posy)
+        # La cabeza de la trayectoria es la posición actual del agente
+        self.trayectoria: Deque[Tuple[int, int]] = deque()
         self.nodos_visitados: List = []
         self.nodos_expandidos: List = []
         self.algoritmo_usado: str = ""
         self.tiempo_calculo: float = 0.0
 
+        # Estadísticas de la última búsqueda y, opcionalmente, de todas
+        self.estadisticas_busqueda: Optional[EstadisticasBusqueda] = None
+        self.registrar_historial = False
+        self.historial_busquedas: List[EstadisticasBusqueda] = []
+
     def get_pos_tuple(self) -> Tuple[int, int]:
         """Retorna la posición como tupla"""
         return tuple(self.pos)
 
+    def recordar_posicion(self):
+        """Guarda la posición actual como la del inicio del tick"""
+        self.pos_anterior = (self.pos[0], self.pos[1])
+
+    def registrar_busqueda(self, estadisticas: EstadisticasBusqueda):
+        """Guarda las estadísticas de una búsqueda recién ejecutada"""
+        self.estadisticas_busqueda = estadisticas
+        self.nodos_visitados = estadisticas.nodos_visitados
+        self.nodos_expandidos = estadisticas.nodos_expandidos
+        if self.registrar_historial:
+            self.historial_busquedas.append(estadisticas)
+
+    @staticmethod
+    def celdas_camino(camino: List[Tuple[int, int]],
+                      rasterizacion: Optional[CacheRasterizacion] = None) -> List[Tuple[int, int]]:
+        """
+        Convierte un camino de vértices en uno de celdas adyacentes usando las
+        aristas rasterizadas del planificador (si RASTERIZAR_TRAYECTORIAS)
+        """
+        if rasterizacion is None or not RASTERIZAR_TRAYECTORIAS:
+            return camino
+        return rasterizacion.expandir(camino)
+
+    def asignar_trayectoria(self, camino: Iterable[Tuple[int, int]],
+                            rasterizacion: Optional[CacheRasterizacion] = None):
+        """
+        Reemplaza la trayectoria por el camino calculado por un planificador.
+        Los puntos se guardan como tuplas inmutables para avanzar sin copias.
+        Con `rasterizacion` el agente avanza una celda por paso en lugar de
+        saltar de vértice en vértice.
+        """
+        if rasterizacion is not None:
+            camino = self.celdas_camino(list(camino), rasterizacion)
+        self.trayectoria = deque(tuple(pos) for pos in camino)
+
     def mover_siguiente(self) -> bool:
         """
-        Mueve al agente al siguiente punto de su trayectoria
+        Mueve al agente al siguiente punto de su trayectoria en O(1)
         Returns: True si se movió, False si no hay más trayectoria
         """
         if len(self.trayectoria) > 1:
-            self.trayectoria.pop(0)
-            self.pos = self.trayectoria[0][:]
+            self.trayectoria.popleft()
+            self.pos[0], self.pos[1] = self.trayectoria[0]
             return True
         return False
 
     def limpiar_trayectoria(self):
         """Limpia la trayectoria y estadísticas"""
-        self.trayectoria = []
+        self.trayectoria = deque()
         self.nodos_visitados = []
         self.nodos_expandidos = []
\ No newline at end of file
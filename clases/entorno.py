@@ -1,22 +1,158 @@
 """
 Clase que representa el mundo del juego
 """
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from clases.pacman import PacMan
 from clases.fantasma import Fantasma
 from clases.obstaculo import Obstaculo
 from clases.punto import Punto
 from planificacion.visibility_graph import VisibilityGraph
 from planificacion.diagrama_voronoi import DiagramaVoronoi
+from planificacion.servicio_planificacion import ServicioPlanificacion
+from planificacion.politica_replanificacion import PoliticaReplanificacion, SEGUIR
+from planificacion.tour_puntos import TourPuntos
+from planificacion.campo_amenaza import CampoAmenaza
 from config.configuracion import *
 from config.niveles import NIVELES
 import random
+import time
+
+
+# Configuraciones FIJAS de los fantasmas: (algoritmo, método_planificación, color)
+CONFIGURACIONES_FANTASMAS = [
+    ('a_star', 'visibility', COLOR_FANTASMA_VG_ASTAR),      # Fantasma 1
+    ('bpa', 'visibility', COLOR_FANTASMA_VG_BPA),           # Fantasma 2
+    ('a_star', 'voronoi', COLOR_FANTASMA_VORONOI_ASTAR),    # Fantasma 3
+    ('bpa', 'voronoi', COLOR_FANTASMA_VORONOI_BPA)          # Fantasma 4
+]
+
+# Pac-Man arranca en el centro
+POSICION_INICIAL_PACMAN = (0, 0)
+
+# Posiciones iniciales de los fantasmas en las 4 esquinas
+POSICIONES_INICIALES_FANTASMAS = [
+    (-8, 8),   # Esquina superior izquierda
+    (8, 8),    # Esquina superior derecha
+    (-8, -8),  # Esquina inferior izquierda
+    (8, -8)    # Esquina inferior derecha
+]
+
+# Planificadores ya construidos por nivel (compartidos entre entornos del proceso)
+_CACHE_PLANIFICADORES: Dict[int, Tuple[VisibilityGraph, DiagramaVoronoi]] = {}
+
+
+def posiciones_iniciales_fantasmas(cantidad: int) -> List[Tuple[int, int]]:
+    """Esquina de arranque de cada fantasma (se repiten si hay más de 4)"""
+    return [POSICIONES_INICIALES_FANTASMAS[i % len(POSICIONES_INICIALES_FANTASMAS)]
+            for i in range(cantidad)]
+
+
+def generar_posiciones_puntos(rng: random.Random, obstaculos: List[Obstaculo],
+                              fantasmas: List[Tuple[int, int]], cantidad: int) -> List[Tuple[int, int]]:
+    """
+    Posiciones al azar para los puntos de un nivel, lejos de los obstáculos y
+    de los spawns de Pac-Man y de los fantasmas. Entorno y EntornoVectorizado
+    la usan con la misma semilla, así generan los mismos puntos.
+
+    Args:
+        rng: Generador sembrado del episodio
+        obstaculos: Obstáculos del nivel
+        fantasmas: Posiciones iniciales de los fantasmas
+        cantidad: Puntos a generar
+
+    Returns:
+        Hasta `cantidad` posiciones (menos si se agotan los intentos)
+    """
+    posiciones = []
+    intentos = 0
+    max_intentos = cantidad * 50
+
+    while len(posiciones) < cantidad and intentos < max_intentos:
+        x = rng.randint(-LIMITE + 2, LIMITE - 2)
+        y = rng.randint(-LIMITE + 2, LIMITE - 2)
+
+        # Verificar colisiones
+        colision = False
+
+        # Con obstáculos
+        for obs in obstaculos:
+            if obs.in_collission(x, y):
+                colision = True
+                break
+
+        # Con spawn de Pac-Man (más espacio)
+        if abs(x) <= 2 and abs(y) <= 2:
+            colision = True
+
+        # Con spawn de fantasmas (más espacio)
+        for fx, fy in fantasmas:
+            if abs(x - fx) <= 3 and abs(y - fy) <= 3:
+                colision = True
+                break
+
+        if not colision:
+            posiciones.append((x, y))
+
+        intentos += 1
+
+    return posiciones
+
 
 class Entorno:
-    def __init__(self, nivel: int = 0, modo_interactivo: bool = True):
+    def __init__(self, nivel: int = 0, modo_interactivo: bool = True,
+                 silencioso: bool = False, semilla: Optional[int] = None,
+                 avanzar_niveles: bool = True,
+                 configuraciones: Optional[List[Tuple[str, str]]] = None,
+                 reutilizar_planificadores: bool = False,
+                 registrar_busquedas: bool = False,
+                 servicio_planificacion: Optional[ServicioPlanificacion] = None,
+                 politica_replanificacion: Optional[PoliticaReplanificacion] = None,
+                 tour_puntos: bool = TOUR_PUNTOS,
+                 rutas_seguras: bool = RUTAS_SEGURAS,
+                 agente_pacman=None):
+        """
+        Inicializa el mundo del juego
+
+        Args:
+            nivel: Índice del nivel inicial
+            modo_interactivo: True si Pac-Man lo controla el jugador
+            silencioso: Suprime los mensajes de consola (modo headless)
+            semilla: Semilla para la generación de puntos (reproducibilidad)
+            avanzar_niveles: Si es False el juego termina al completar el nivel
+            configuraciones: (algoritmo, método) de cada fantasma; por defecto
+                las 4 combinaciones fijas
+            reutilizar_planificadores: Comparte los grafos ya construidos de cada
+                nivel entre entornos del mismo proceso
+            registrar_busquedas: Guarda las estadísticas de todas las búsquedas
+                del episodio (ver exportar_estadisticas_busqueda)
+            servicio_planificacion: Si se indica, los fantasmas planifican en su
+                pool y las rutas se aplican en un tick posterior (el tiempo de esas
+                búsquedas no se suma a tiempo_planificacion)
+            politica_replanificacion: Si se indica (y no hay servicio), decide en
+                cada paso de fantasma si seguir, extender o replanificar la ruta;
+                por defecto se replanifica solo al agotar la trayectoria
+            tour_puntos: En modo automático, Pac-Man sigue un TourPuntos del
+                nivel en lugar de ir al punto más cercano
+            rutas_seguras: En modo automático, las rutas de Pac-Man son un A* en
+                la grilla ponderado por el campo de amenaza de los fantasmas
+            agente_pacman: En modo automático, agente con `decidir(entorno)` que
+                elige cada paso de Pac-Man (p. ej. AgenteAlfaBeta) en lugar de
+                seguir rutas
+        """
         self.size = TAMANIO_MUNDO
         self.nivel_actual = nivel
         self.modo_interactivo = modo_interactivo
+        self.silencioso = silencioso
+        self.avanzar_niveles = avanzar_niveles
+        self.configuraciones = configuraciones
+        self.reutilizar_planificadores = reutilizar_planificadores
+        self.registrar_busquedas = registrar_busquedas
+        self.servicio_planificacion = servicio_planificacion
+        self.politica_replanificacion = politica_replanificacion
+        self.tour_puntos = tour_puntos
+        self.rutas_seguras = rutas_seguras
+        self.agente_pacman = agente_pacman
+        self.rng = random.Random(semilla)
 
         self.pacman: Optional[PacMan] = None
         self.fantasmas: List[Fantasma] = []
@@ -29,146 +165,194 @@ class Entorno:
         # AMBOS métodos de planificación
         self.visibility_graph: Optional[VisibilityGraph] = None
         self.voronoi_diagram: Optional[DiagramaVoronoi] = None
+        # Orden de visita de los puntos (modo automático, se arma al primer uso)
+        self.tour: Optional[TourPuntos] = None
+        # Distancia de cada celda al fantasma más cercano (rutas_seguras, se arma al primer uso)
+        self.campo_amenaza: Optional[CampoAmenaza] = None
+
+        # Estadísticas de ejecución
+        self.pasos = 0
+        self.tiempo_planificacion = 0.0
+        self._busquedas_niveles_previos: List[Dict] = []
 
         self._inicializar_nivel()
 
+    def _log(self, mensaje: str):
+        """Imprime un mensaje salvo en modo silencioso"""
+        if not self.silencioso:
+            print(mensaje)
+
     def _inicializar_nivel(self):
         """Inicializa el nivel actual"""
         if self.nivel_actual >= len(NIVELES):
-            print("¡Completaste todos los niveles!")
+            self._log("¡Completaste todos los niveles!")
             self.juego_terminado = True
             self.victoria = True
             return
 
         nivel_config = NIVELES[self.nivel_actual]
-        print(f"\n{'=' * 60}")
-        print(f"NIVEL {self.nivel_actual + 1}: {nivel_config['nombre']}")
-        print(f"{'=' * 60}\n")
+        self._log(f"\n{'=' * 60}")
+        self._log(f"NIVEL {self.nivel_actual + 1}: {nivel_config['nombre']}")
+        self._log(f"{'=' * 60}\n")
 
         # Crear obstáculos del nivel
         for x, y, tam in nivel_config['obstaculos']:
             self.obstaculos.append(Obstaculo(x, y, tam))
 
-        # Visibility Graph (caminos óptimos)
-        self.visibility_graph = VisibilityGraph(
-            self.obstaculos,
-            (LIMITE, LIMITE)
-        )
+        if self.reutilizar_planificadores and self.nivel_actual in _CACHE_PLANIFICADORES:
+            self.visibility_graph, self.voronoi_diagram = _CACHE_PLANIFICADORES[self.nivel_actual]
+        else:
+            # Visibility Graph (caminos óptimos)
+            self.visibility_graph = VisibilityGraph(
+                self.obstaculos,
+                (LIMITE, LIMITE)
+            )
+
+            # Diagrama de Voronoi (caminos seguros)
+            self.voronoi_diagram = DiagramaVoronoi(
+                self.obstaculos,
+                (LIMITE, LIMITE),
+                silencioso=self.silencioso
+            )
+
+            if self.reutilizar_planificadores:
+                _CACHE_PLANIFICADORES[self.nivel_actual] = (self.visibility_graph, self.voronoi_diagram)
+
+        self.pacman = PacMan(*POSICION_INICIAL_PACMAN, self.modo_interactivo)
+        self._nivel_agentes = self.nivel_actual
+        self.pacman.registrar_historial = self.registrar_busquedas
+
+        configuraciones = self._configuraciones_fantasmas()
+        posiciones = posiciones_iniciales_fantasmas(len(configuraciones))
+        for (algoritmo, metodo, color), (x, y) in zip(configuraciones, posiciones):
+            fantasma = Fantasma(x, y, algoritmo, metodo, color)
+            fantasma.registrar_historial = self.registrar_busquedas
+            self.fantasmas.append(fantasma)
 
-        # Diagrama de Voronoi (caminos seguros)
-        self.voronoi_diagram = DiagramaVoronoi(
-            self.obstaculos,
-            (LIMITE, LIMITE)
-        )
 
-        self.pacman = PacMan(0, 0, self.modo_interactivo) # Pac-Man en el centro
 
+        # Generar puntos a recolectar de manera random
+        self._generar_puntos(nivel_config['puntos'])
 
+    def _configuraciones_fantasmas(self) -> List[Tuple[str, str, tuple]]:
+        """Retorna (algoritmo, método, color) para cada fantasma del nivel"""
+        if self.configuraciones is None:
+            return CONFIGURACIONES_FANTASMAS
 
-        # Configuraciones FIJAS: (algoritmo, método_planificación, color)
-        configuraciones = [
-            ('a_star', 'visibility', COLOR_FANTASMA_VG_ASTAR),      # Fantasma 1
-            ('bpa', 'visibility', COLOR_FANTASMA_VG_BPA),           # Fantasma 2
-            ('a_star', 'voronoi', COLOR_FANTASMA_VORONOI_ASTAR),    # Fantasma 3
-            ('bpa', 'voronoi', COLOR_FANTASMA_VORONOI_BPA)          # Fantasma 4
+        colores = {(alg, met): color for alg, met, color in CONFIGURACIONES_FANTASMAS}
+        return [
+            (algoritmo, metodo, colores.get((algoritmo, metodo), (255, 255, 255)))
+            for algoritmo, metodo in self.configuraciones
         ]
 
-        # Posiciones iniciales de los fantasmas en las 4 esquinas
-        posiciones_iniciales = [
-            (-8, 8),   # Esquina superior izquierda
-            (8, 8),    # Esquina superior derecha
-            (-8, -8),  # Esquina inferior izquierda
-            (8, -8)    # Esquina inferior derecha
-        ]
+    def _generar_puntos(self, cantidad: int):
+        """Genera puntos válidos en el mapa"""
+        fantasmas = [fantasma.get_pos_tuple() for fantasma in self.fantasmas]
+        for x, y in generar_posiciones_puntos(self.rng, self.obstaculos, fantasmas, cantidad):
+            self.puntos.append(Punto(x, y))
 
-        for i in range(4):
-            x, y = posiciones_iniciales[i]
-            algoritmo, metodo, color = configuraciones[i]
+        if len(self.puntos) < cantidad:
+            self._log(f"Solo se pudieron generar {len(self.puntos)}/{cantidad} puntos")
 
-            fantasma = Fantasma(x, y, algoritmo, metodo, color)
-            self.fantasmas.append(fantasma)
+    def actualizar(self):
+        """Actualiza el juego cada frame"""
+        if self.juego_terminado:
+            return
 
+        if self.verificar_captura():
+            return
 
+        self.pasos += 1
+        self.recordar_posiciones()
 
-        # Generar puntos a recolectar de manera random
-        self._generar_puntos(nivel_config['puntos'])
+        # Verificar victoria
+        if self.verificar_nivel_completado():
+            return
 
-    def _generar_puntos(self, cantidad: int):
-        """Genera puntos válidos en el mapa"""
-        puntos_generados = 0
-        intentos = 0
-        max_intentos = cantidad * 50
+        self.mover_pacman()
 
-        while puntos_generados < cantidad and intentos < max_intentos:
-            x = random.randint(-LIMITE + 2, LIMITE - 2)
-            y = random.randint(-LIMITE + 2, LIMITE - 2)
+        for fantasma in self.fantasmas:
+            self.mover_fantasma(fantasma)
 
-            # Verificar colisiones
-            colision = False
+        # VERIFICAR COLISIONES
+        self.pacman.verificar_colision_fantasma(self.fantasmas)
 
-            # Con obstáculos
-            for obs in self.obstaculos:
-                if obs.in_collission(x, y):
-                    colision = True
-                    break
+    def recordar_posiciones(self):
+        """Guarda la posición de cada agente al comenzar el tick (captura por cruce)"""
+        self.pacman.recordar_posicion()
+        for fantasma in self.fantasmas:
+            fantasma.recordar_posicion()
 
-            # Con spawn de Pac-Man (más espacio)
-            if abs(x) <= 2 and abs(y) <= 2:
-                colision = True
+    def verificar_captura(self) -> bool:
+        """Termina el juego si Pac-Man fue atrapado. Returns: True si terminó"""
+        if self.pacman.vivo:
+            return False
 
-            # Con spawn de fantasmas (más espacio)
-            for fantasma in self.fantasmas:
-                if abs(x - fantasma.pos[0]) <= 3 and abs(y - fantasma.pos[1]) <= 3:
-                    colision = True
-                    break
+        self.juego_terminado = True
+        self.victoria = False
+        self._log("\nGAME OVER - Pac-Man fue atrapado")
+        return True
 
-            if not colision:
-                self.puntos.append(Punto(x, y))
-                puntos_generados += 1
+    def verificar_nivel_completado(self) -> bool:
+        """
+        Si no quedan puntos, pasa al siguiente nivel (o termina el juego)
+        Returns: True si el nivel se completó
+        """
+        if any(not p.recolectado for p in self.puntos):
+            return False
 
-            intentos += 1
+        self._log(f"\n¡Nivel {self.nivel_actual + 1} completado!")
 
-        if puntos_generados < cantidad:
-            print(f"Solo se pudieron generar {puntos_generados}/{cantidad} puntos")
+        if not self.avanzar_niveles:
+            self.juego_terminado = True
+            self.victoria = True
+            return True
 
-    def actualizar(self):
-        """Actualiza el juego cada frame"""
-        if self.juego_terminado:
-            return
+        self.nivel_actual += 1
 
-        if not self.pacman.vivo:
+        if self.nivel_actual >= len(NIVELES):
             self.juego_terminado = True
-            self.victoria = False
-            print("\nGAME OVER - Pac-Man fue atrapado")
-            return
-
-        # Verificar victoria
-        puntos_restantes = [p for p in self.puntos if not p.recolectado]
-        if not puntos_restantes:
-            print(f"\n¡Nivel {self.nivel_actual + 1} completado!")
-            self.nivel_actual += 1
-
-            if self.nivel_actual >= len(NIVELES):
-                self.juego_terminado = True
-                self.victoria = True
-                print("\n¡GANASTE EL JUEGO COMPLETO!")
-            else:
-                self._reiniciar_nivel()
-            return
+            self.victoria = True
+            self._log("\n¡GANASTE EL JUEGO COMPLETO!")
+        else:
+            self._reiniciar_nivel()
+        return True
 
-        # MOVER PAC-MAN
+    def mover_pacman(self):
+        """Un paso de Pac-Man (jugador o automático) y recolección de puntos"""
         if self.modo_interactivo:
             self.pacman.actualizar_movimiento_interactivo(self.obstaculos)
+        elif self.agente_pacman is not None:
+            inicio = time.perf_counter()
+            direccion = self.agente_pacman.decidir(self)
+            self.tiempo_planificacion += time.perf_counter() - inicio
+            if direccion is not None:
+                self.pacman.mover_en_direccion(list(direccion), self.obstaculos)
         else:
+            if self.rutas_seguras:
+                if self.campo_amenaza is None:
+                    self.campo_amenaza = CampoAmenaza(self.obstaculos)
+                self.campo_amenaza.actualizar(self.fantasmas)
+                # Se abandona la ruta si el próximo paso queda junto a un fantasma
+                if (len(self.pacman.trayectoria) > 1
+                        and self.campo_amenaza.distancia(self.pacman.trayectoria[1]) <= 1):
+                    self.pacman.asignar_trayectoria([self.pacman.get_pos_tuple()])
+
             if not self.pacman.trayectoria or len(self.pacman.trayectoria) <= 1:
-                punto_objetivo = self._buscar_mejor_punto()
-                if punto_objetivo:
-                    self.pacman.calcular_ruta_hacia_punto(
-                        punto_objetivo,
-                        self.visibility_graph,
-                        self.obstaculos,
-                        self.fantasmas
-                    )
+                if self.tour_puntos:
+                    self._seguir_tour()
+                else:
+                    punto_objetivo = self._buscar_mejor_punto()
+                    if punto_objetivo:
+                        self.pacman.calcular_ruta_hacia_punto(
+                            punto_objetivo,
+                            self.visibility_graph,
+                            self.obstaculos,
+                            self.fantasmas,
+                            campo_amenaza=self.campo_amenaza,
+                            rutas_seguras=self.rutas_seguras
+                        )
+                        self.tiempo_planificacion += self.pacman.tiempo_calculo
 
             if self.pacman.trayectoria and len(self.pacman.trayectoria) > 1:
                 self.pacman.mover_siguiente()
@@ -178,22 +362,74 @@ class Entorno:
             if not punto.recolectado and self.pacman.pos == punto.pos:
                 self.pacman.recolectar_punto(punto)
                 self.puntaje = self.pacman.puntaje
-
-        # MOVER FANTASMAS
-        for fantasma in self.fantasmas:
-            if not fantasma.trayectoria or len(fantasma.trayectoria) <= 1:
-                fantasma.perseguir_pacman(
-                    self.pacman.pos,
-                    self.visibility_graph,
-                    self.voronoi_diagram,
-                    self.obstaculos
-                )
-
-            if fantasma.trayectoria and len(fantasma.trayectoria) > 1:
-                fantasma.mover_siguiente()
-
-        # VERIFICAR COLISIONES
-        self.pacman.verificar_colision_fantasma(self.fantasmas)
+                if self.tour is not None:
+                    self.tour.recolectar(punto.get_pos_tuple())
+
+    def mover_fantasma(self, fantasma: Fantasma):
+        """Un paso de un fantasma: replanifica si hace falta y avanza"""
+        servicio = self.servicio_planificacion
+        if servicio is not None:
+            servicio.aplicar_resultados()
+            # La continuación se pide un paso antes de que la ruta se agote
+            if len(fantasma.trayectoria) <= 2 and not servicio.pendiente(fantasma):
+                fantasma.solicitar_persecucion(servicio, self.pacman.pos,
+                                               self.visibility_graph, self.voronoi_diagram)
+        elif self.politica_replanificacion is not None:
+            accion = self.politica_replanificacion.aplicar(
+                fantasma,
+                self.pacman.pos,
+                self.visibility_graph,
+                self.voronoi_diagram,
+                self.obstaculos
+            )
+            if accion != SEGUIR:
+                self.tiempo_planificacion += fantasma.tiempo_calculo
+        elif not fantasma.trayectoria or len(fantasma.trayectoria) <= 1:
+            fantasma.perseguir_pacman(
+                self.pacman.pos,
+                self.visibility_graph,
+                self.voronoi_diagram,
+                self.obstaculos
+            )
+            self.tiempo_planificacion += fantasma.tiempo_calculo
+
+        if fantasma.trayectoria and len(fantasma.trayectoria) > 1:
+            fantasma.mover_siguiente()
+
+    def _seguir_tour(self) -> bool:
+        """
+        Modo automático con tour: va al primer punto del recorrido que sea
+        seguro; si los fantasmas lo bloquean prueba con los siguientes
+
+        Returns:
+            True si Pac-Man tiene una nueva ruta
+        """
+        if self.tour is None:
+            pendientes = [p.get_pos_tuple() for p in self.puntos if not p.recolectado]
+            # Con rutas seguras calcular_ruta_hacia_punto no usa los caminos del tour
+            self.tour = TourPuntos(self.visibility_graph, pendientes, self.pacman.get_pos_tuple(),
+                                   guardar_caminos=not self.rutas_seguras)
+            self.tiempo_planificacion += self.tour.tiempo_matriz + self.tour.tiempo_orden
+
+        por_posicion = {p.get_pos_tuple(): p for p in self.puntos if not p.recolectado}
+        for posicion in self.tour.siguientes():
+            punto = por_posicion.get(posicion)
+            if punto is None:
+                continue
+            encontrada = self.pacman.calcular_ruta_hacia_punto(
+                punto,
+                self.visibility_graph,
+                self.obstaculos,
+                self.fantasmas,
+                tour=self.tour,
+                campo_amenaza=self.campo_amenaza,
+                rutas_seguras=self.rutas_seguras
+            )
+            self.tiempo_planificacion += self.pacman.tiempo_calculo
+            if encontrada:
+                return True
+
+        return False
 
     def _buscar_mejor_punto(self) -> Optional[Punto]:
         """Busca el mejor punto para recolectar (modo automático)"""
@@ -202,8 +438,32 @@ class Entorno:
             return None
         return min(puntos_disponibles, key=lambda p: p.distancia_a(self.pacman.pos))
 
+    def exportar_estadisticas_busqueda(self) -> List[Dict]:
+        """
+        Estadísticas de todas las búsquedas del episodio (requiere registrar_busquedas)
+
+        Returns:
+            Lista de diccionarios con nivel, agente y trabajo de cada búsqueda
+        """
+        registros = list(self._busquedas_niveles_previos)
+        if self.pacman is None:
+            return registros
+
+        agentes = [('pacman', self.pacman)] + [
+            (f"fantasma_{i + 1}", fantasma) for i, fantasma in enumerate(self.fantasmas)
+        ]
+        for nombre, agente in agentes:
+            for estadisticas in agente.historial_busquedas:
+                registro = {'nivel': self._nivel_agentes, 'agente': nombre}
+                registro.update(estadisticas.a_dict())
+                registros.append(registro)
+        return registros
+
     def _reiniciar_nivel(self):
         """Reinicia variables para el siguiente nivel"""
+        if self.registrar_busquedas:
+            self._busquedas_niveles_previos = self.exportar_estadisticas_busqueda()
+
         self.pacman = None
         self.fantasmas = []
         self.obstaculos = []
@@ -213,4 +473,8 @@ class Entorno:
         self.victoria = False
         self.visibility_graph = None
         self.voronoi_diagram = None
+        self.tour = None
+        self.campo_amenaza = None
+        if self.servicio_planificacion is not None:
+            self.servicio_planificacion.invalidar_instantaneas()
         self._inicializar_nivel()
\ No newline at end of file
@@ -3,11 +3,14 @@ Clase Fantasma - Usa diferentes algoritmos para perseguir a Pac-Man
 Soporta dos métodos de planificación: Visibility Graph y Diagrama de Voronoi
 """
 import time
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from clases.agente import Agente
 from planificacion.visibility_graph import VisibilityGraph
 from planificacion.diagrama_voronoi import DiagramaVoronoi
 from planificacion.busqueda_grafo import BusquedaEnGrafo
+from planificacion.estadisticas import EstadisticasBusqueda
+from planificacion.rasterizacion import CacheRasterizacion
+from config.configuracion import LIMITE
 
 
 class Fantasma(Agente):
@@ -41,6 +44,18 @@ class Fantasma(Agente):
 
         self.algoritmo_usado = f"{nombre_metodo} + {nombre_algoritmo}"
 
+        # Posición de Pac-Man hacia la que apunta la trayectoria vigente
+        self.objetivo_plan: Optional[Tuple[int, int]] = None
+        # Aristas rasterizadas del planificador de la última solicitud diferida
+        self.rasterizacion_pendiente: Optional[CacheRasterizacion] = None
+
+    def planificador(self, visibility_graph: VisibilityGraph,
+                     voronoi_diagram: DiagramaVoronoi):
+        """Grafo que corresponde al método de planificación del fantasma"""
+        if self.metodo_planificacion == 'voronoi':
+            return voronoi_diagram
+        return visibility_graph  # 'visibility'
+
     def perseguir_pacman(
         self,
         pacman_pos: List[int],
@@ -61,51 +76,153 @@ class Fantasma(Agente):
         Returns:
             True si se encontró ruta, False en caso contrario
         """
-        inicio = time.time()
+        inicio = time.perf_counter()
 
         pos_actual = self.get_pos_tuple()
         pos_objetivo = tuple(pacman_pos)
 
-        # Seleccionar el grafo según el método de planificación
-        if self.metodo_planificacion == 'voronoi':
-            grafo_planificacion = voronoi_diagram
-        else:  # 'visibility'
-            grafo_planificacion = visibility_graph
-
-        # Agregar puntos temporales al grafo seleccionado
-        grafo_planificacion.agregar_punto_temporal(pos_actual)
-        grafo_planificacion.agregar_punto_temporal(pos_objetivo)
-
-        # Seleccionar algoritmo de búsqueda
-        camino = None
-
-        if self.algoritmo == "bpa":
-            camino = BusquedaEnGrafo.bpa_grafo(
-                grafo_planificacion.grafo,
-                pos_actual,
-                pos_objetivo
-            )
-        elif self.algoritmo == "greedy":
-            camino = BusquedaEnGrafo.greedy_grafo(
-                grafo_planificacion.grafo,
-                pos_actual,
-                pos_objetivo
-            )
-        elif self.algoritmo == "a_star":
-            camino = BusquedaEnGrafo.a_estrella_grafo(
-                grafo_planificacion.grafo,
-                pos_actual,
-                pos_objetivo
-            )
-
-        # Limpiar puntos temporales
-        grafo_planificacion.eliminar_punto_temporal(pos_actual)
-        grafo_planificacion.eliminar_punto_temporal(pos_objetivo)
-
-        self.tiempo_calculo = time.time() - inicio
+        grafo_planificacion = self.planificador(visibility_graph, voronoi_diagram)
+
+        estadisticas = EstadisticasBusqueda(metodo=self.metodo_planificacion)
+        camino = BusquedaEnGrafo.planificar_ruta(
+            grafo_planificacion,
+            self.algoritmo,
+            pos_actual,
+            pos_objetivo,
+            estadisticas
+        )
+
+        self.tiempo_calculo = time.perf_counter() - inicio
+        self.registrar_busqueda(estadisticas)
 
         if camino:
-            self.trayectoria = [list(pos) for pos in camino]
+            self.asignar_trayectoria(camino, grafo_planificacion.rasterizacion)
+            self.objetivo_plan = pos_objetivo
+            return True
+
+        return False
+
+    def extender_persecucion(
+        self,
+        pacman_pos: List[int],
+        visibility_graph: VisibilityGraph,
+        voronoi_diagram: DiagramaVoronoi
+    ) -> bool:
+        """
+        Prolonga la trayectoria desde su último punto hasta Pac-Man sin
+        descartar lo que falta recorrer (búsqueda corta cuando Pac-Man se
+        movió poco respecto del objetivo planificado)
+
+        Returns:
+            True si se encontró la extensión
+        """
+        inicio = time.perf_counter()
+
+        desde = self.trayectoria[-1] if self.trayectoria else self.get_pos_tuple()
+        pos_objetivo = tuple(pacman_pos)
+
+        grafo_planificacion = self.planificador(visibility_graph, voronoi_diagram)
+        estadisticas = EstadisticasBusqueda(metodo=self.metodo_planificacion)
+        camino = BusquedaEnGrafo.planificar_ruta(
+            grafo_planificacion,
+            self.algoritmo,
+            desde,
+            pos_objetivo,
+            estadisticas
+        )
+
+        self.tiempo_calculo = time.perf_counter() - inicio
+        self.registrar_busqueda(estadisticas)
+
+        if not camino:
+            return False
+
+        camino = self.celdas_camino(camino, grafo_planificacion.rasterizacion)
+        if self.trayectoria:
+            self.trayectoria.extend(camino[1:])
+        else:
+            self.asignar_trayectoria(camino)
+        self.objetivo_plan = pos_objetivo
+        return True
+
+    def solicitar_persecucion(self, planificacion, pacman_pos: List[int],
+                              visibility_graph: VisibilityGraph,
+                              voronoi_diagram: DiagramaVoronoi):
+        """
+        Encola en un PlanificadorPorTiempo la ruta hacia Pac-Man. La ruta parte
+        del final de la trayectoria actual, así el fantasma sigue su camino
+        previo mientras se calcula la continuación.
+
+        Args:
+            planificacion: PlanificadorPorTiempo compartido
+            pacman_pos: Posición actual de Pac-Man
+            visibility_graph: Grafo de visibilidad
+            voronoi_diagram: Diagrama de Voronoi
+        """
+        inicio = self.trayectoria[-1] if self.trayectoria else self.get_pos_tuple()
+
+        grafo_planificacion = self.planificador(visibility_graph, voronoi_diagram)
+        # La ruta llega en un tick posterior: se rasteriza con las aristas de este planificador
+        self.rasterizacion_pendiente = grafo_planificacion.rasterizacion
+
+        planificacion.solicitar(self, grafo_planificacion, self.algoritmo, inicio,
+                                tuple(pacman_pos), self.incorporar_plan,
+                                metodo=self.metodo_planificacion)
+
+    def incorporar_plan(self, camino: Optional[List[Tuple[int, int]]],
+                        estadisticas: EstadisticasBusqueda) -> bool:
+        """
+        Aplica una ruta calculada en diferido
+
+        Returns:
+            True si la ruta se pudo empalmar con la posición/trayectoria actual
+        """
+        self.tiempo_calculo = estadisticas.tiempo_total
+        self.registrar_busqueda(estadisticas)
+
+        if not camino:
+            return False
+
+        camino = self.celdas_camino(camino, self.rasterizacion_pendiente)
+        if self.trayectoria and self.trayectoria[-1] == camino[0]:
+            self.trayectoria.extend(camino[1:])
+            self.objetivo_plan = camino[-1]
+            return True
+
+        # El fantasma se movió mientras tanto: se usa solo si sigue sobre la ruta
+        pos_actual = self.get_pos_tuple()
+        if pos_actual in camino:
+            self.asignar_trayectoria(camino[camino.index(pos_actual):])
+            self.objetivo_plan = camino[-1]
             return True
 
-        return False
\ No newline at end of file
+        return False
+
+    def paso_greedy(self, objetivo: List[int], obstaculos: List) -> bool:
+        """
+        Respaldo mientras no hay ruta: un paso en la grilla hacia el objetivo,
+        solo si acerca al fantasma
+
+        Returns:
+            True si se movió
+        """
+        x, y = self.pos
+        mejor = None
+        mejor_distancia = BusquedaEnGrafo.distancia_euclidiana((x, y), tuple(objetivo))
+
+        for dx, dy in ((0, 1), (1, 0), (0, -1), (-1, 0)):
+            nx, ny = x + dx, y + dy
+            if not (-LIMITE <= nx <= LIMITE and -LIMITE <= ny <= LIMITE):
+                continue
+            if any(obs.in_collission(nx, ny) for obs in obstaculos):
+                continue
+            distancia = BusquedaEnGrafo.distancia_euclidiana((nx, ny), tuple(objetivo))
+            if distancia < mejor_distancia:
+                mejor, mejor_distancia = (nx, ny), distancia
+
+        if mejor is None:
+            return False
+
+        self.asignar_trayectoria([mejor])
+        self.pos[0], self.pos[1] = mejor
+        return True
@@ -8,6 +8,9 @@ from clases.punto import Punto
 from clases.fantasma import Fantasma
 from planificacion.visibility_graph import VisibilityGraph
 from planificacion.busqueda_grafo import BusquedaEnGrafo
+from planificacion.estadisticas import EstadisticasBusqueda
+from planificacion.tour_puntos import TourPuntos
+from planificacion.campo_amenaza import CampoAmenaza
 
 class PacMan(Agente):
     def __init__(self, posx: int, posy: int, modo_interactivo: bool = True):
@@ -79,44 +82,66 @@ class PacMan(Agente):
         punto: Punto,
         visibility_graph: VisibilityGraph,
         obstaculos: List,
-        fantasmas: List[Fantasma]
+        fantasmas: List[Fantasma],
+        tour: Optional[TourPuntos] = None,
+        campo_amenaza: Optional[CampoAmenaza] = None,
+        rutas_seguras: bool = False
     ) -> bool:
         """
-        Modo automático: Calcula ruta con A*
+        Modo automático: Calcula ruta con A*. Si Pac-Man está sobre un nodo del
+        `tour` se usa el camino ya calculado en su matriz de distancias.
+        Con `campo_amenaza` la seguridad del punto se mide en pasos reales hasta
+        los fantasmas y, si `rutas_seguras`, la ruta es un A* en la grilla que
+        evita acercarse a ellos.
         """
         if self.modo_interactivo:
             return False
 
-        inicio = time.time()
+        inicio = time.perf_counter()
 
-        if not self._es_punto_seguro(punto.pos, fantasmas):
+        if not self._es_punto_seguro(punto.pos, fantasmas, campo_amenaza):
+            self.tiempo_calculo = time.perf_counter() - inicio
             return False
 
         pos_actual = self.get_pos_tuple()
         pos_objetivo = punto.get_pos_tuple()
 
-        visibility_graph.agregar_punto_temporal(pos_actual)
-        visibility_graph.agregar_punto_temporal(pos_objetivo)
-
-        camino = BusquedaEnGrafo.a_estrella_grafo(
-            visibility_graph.grafo,
-            pos_actual,
-            pos_objetivo
-        )
-
-        visibility_graph.eliminar_punto_temporal(pos_actual)
-        visibility_graph.eliminar_punto_temporal(pos_objetivo)
-
-        self.tiempo_calculo = time.time() - inicio
+        camino = None
+        rasterizacion = visibility_graph.rasterizacion
+        if campo_amenaza is not None and rutas_seguras:
+            estadisticas = EstadisticasBusqueda(metodo='amenaza')
+            camino = campo_amenaza.ruta_segura(pos_actual, pos_objetivo, estadisticas)
+            self.registrar_busqueda(estadisticas)
+            rasterizacion = None  # Ya son celdas adyacentes
+        elif tour is not None:
+            # Solo sin rutas seguras: el camino del tour ignora a los fantasmas
+            camino = tour.ruta(pos_actual, pos_objetivo)
+
+        if camino is None:
+            rasterizacion = visibility_graph.rasterizacion
+            estadisticas = EstadisticasBusqueda(metodo='visibility')
+            camino = BusquedaEnGrafo.planificar_ruta(
+                visibility_graph,
+                "a_star",
+                pos_actual,
+                pos_objetivo,
+                estadisticas
+            )
+            self.registrar_busqueda(estadisticas)
+
+        self.tiempo_calculo = time.perf_counter() - inicio
 
         if camino:
-            self.trayectoria = [list(pos) for pos in camino]
+            self.asignar_trayectoria(camino, rasterizacion)
             return True
 
         return False
 
-    def _es_punto_seguro(self, punto_pos: List[int], fantasmas: List[Fantasma]) -> bool:
-        """Verifica si un punto está lejos de fantasmas"""
+    def _es_punto_seguro(self, punto_pos: List[int], fantasmas: List[Fantasma],
+                         campo_amenaza: Optional[CampoAmenaza] = None) -> bool:
+        """Verifica si un punto está lejos de fantasmas (en pasos si hay campo de amenaza)"""
+        if campo_amenaza is not None:
+            return campo_amenaza.es_seguro(punto_pos, self.distancia_seguridad)
         for fantasma in fantasmas:
             distancia = ((punto_pos[0] - fantasma.pos[0])**2 +
                         (punto_pos[1] - fantasma.pos[1])**2)**0.5
@@ -131,9 +156,16 @@ class PacMan(Agente):
         self.puntaje += punto.valor
 
     def verificar_colision_fantasma(self, fantasmas: List[Fantasma]) -> bool:
-        """Verifica colisión con fantasmas"""
+        """
+        Verifica colisión con fantasmas: misma celda, o intercambio de celdas
+        en el mismo tick (se cruzaron sin coincidir; usa pos_anterior)
+        """
+        pos = self.get_pos_tuple()
         for fantasma in fantasmas:
             if self.pos == fantasma.pos:
                 self.vivo = False
                 return True
+            if fantasma.pos_anterior == pos and fantasma.get_pos_tuple() == self.pos_anterior:
+                self.vivo = False
+                return True
         return False
\ No newline at end of file
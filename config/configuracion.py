@@ -7,9 +7,16 @@ TAMANIO_MUNDO = 20
 LIMITE = TAMANIO_MUNDO // 2
 
 
-# Velocidades (en frames: más alto = más lento)
-VELOCIDAD_PACMAN = 5  # Pac-Man se mueve cada 5 frames
-VELOCIDAD_FANTASMA_BASE = 1000  # Fantasmas se mueven cada 1000 frames (muy lento)
+# Velocidades (en ticks de simulación: más alto = más lento)
+VELOCIDAD_PACMAN = 5  # Pac-Man se mueve cada 5 ticks
+VELOCIDAD_FANTASMA_BASE = 1000  # Fantasmas se mueven cada 1000 ticks (muy lento)
+
+# Las rutas de los planificadores se recorren celda por celda (False: de vértice en vértice)
+RASTERIZAR_TRAYECTORIAS = True
+
+# Reloj de simulación (paso fijo, independiente del dibujo)
+DURACION_TICK = 1 / 60  # Segundos por tick
+MAX_TICKS_POR_FRAME = 5  # Tope de ticks para ponerse al día tras un frame lento
 
 # Visualización Pygame
 FPS = 60  # Frames por segundo
@@ -41,6 +48,9 @@ COLOR_OBSTACULO = (33, 33, 222)  # Azul oscuro
 
 # VISUALIZACIÓN DE GRAFOS DE PLANIFICACIÓN
 
+# Cuadrícula de fondo
+MOSTRAR_GRID = False
+
 # Visibility Graph (caminos óptimos)
 MOSTRAR_VISIBILITY_GRAPH = False  # Cambiar a True para visualizar
 COLOR_VG_NODO = (0, 200, 100)  # Verde claro
@@ -50,3 +60,48 @@ COLOR_VG_LINEA = (0, 100, 50)  # Verde oscuro
 MOSTRAR_VORONOI = False  # Cambiar a True para visualizar
 COLOR_VORONOI_NODO = (100, 100, 150)  # Gris azulado
 COLOR_VORONOI_LINEA = (60, 60, 90)  # Gris oscuro
+
+
+# RENDERIZADO
+RECTANGULOS_SUCIOS = False  # Presentar solo las regiones que cambian (renderizado por software)
+CAPACIDAD_CACHE_TEXTO = 256  # Superficies de texto guardadas (LRU)
+
+# PLANIFICACIÓN DE FANTASMAS EN EL MODO PYGAME
+# 'sincronica', 'por_tiempo' (repartida entre frames) o 'asincrona' (pool de hilos);
+# las dos últimas son opcionales (main.py --planificacion-fantasmas)
+PLANIFICACION_FANTASMAS = 'sincronica'
+PRESUPUESTO_PLANIFICACION_US = 2000  # Microsegundos de planificación por frame ('por_tiempo')
+TRABAJADORES_PLANIFICACION = 1  # Hilos del pool ('asincrona')
+FALLBACK_GREEDY = True  # Paso en la grilla hacia Pac-Man si la ruta sigue pendiente
+
+# PAC-MAN AUTOMÁTICO
+TOUR_PUNTOS = False  # Orden de visita optimizado (inserción + 2-opt) en lugar del punto más cercano (headless --tour-puntos)
+RUTAS_SEGURAS = False  # A* en la grilla penalizando la cercanía de fantasmas (headless --rutas-seguras)
+RADIO_AMENAZA = 5  # Pasos desde un fantasma dentro de los que una celda es peligrosa
+PESO_AMENAZA = 4.0  # Costo extra de pisar una celda junto a un fantasma
+
+# POLÍTICA DE REPLANIFICACIÓN BAJO DEMANDA (Entorno con politica_replanificacion)
+UMBRAL_REPLANIFICACION = 3.0  # Distancia de Pac-Man al objetivo planificado que fuerza replanificar
+SEGMENTOS_VALIDADOS = 2  # Tramos de la ruta verificados contra obstáculos en cada decisión
+
+# INSTRUMENTACIÓN DE RENDIMIENTO
+INSTRUMENTAR = True  # Temporizadores por frame (costo de ~1 µs por sección)
+MOSTRAR_RENDIMIENTO = False  # Overlay de tiempos (tecla F3)
+VENTANA_RENDIMIENTO = 300  # Frames en los histogramas móviles
+
+# PERFILADOR POR MUESTREO (tecla F5 o main.py --perfilar SEGUNDOS)
+DURACION_PERFIL = 5.0  # Segundos de cada ventana de muestreo
+INTERVALO_PERFIL = 0.005  # Segundos entre muestras (200 Hz)
+
+# BÚSQUEDA EN ÁRBOL PARA PAC-MAN (Entorno con agente_pacman, headless --agente)
+PROFUNDIDAD_BUSQUEDA = 6  # Rondas (Pac-Man + fantasmas) máximas del alfa-beta / expectimax
+PRESUPUESTO_JUGADA_MS = 20.0  # Tiempo por jugada para la profundización iterativa
+CAPACIDAD_TABLA_TRANSPOSICION = 200000  # Entradas antes de vaciar la tabla
+
+# MONTE CARLO TREE SEARCH PARA PAC-MAN (headless --agente mcts)
+MCTS_EXPLORACION = 1.0  # Constante C de UCT (valores de simulación en [0, 1])
+MCTS_LOTE = 8  # Descensos por árbol simulados juntos en un lote NumPy (con pérdida virtual)
+MCTS_HORIZONTE = 6  # Rondas máximas de cada simulación (más largas casi siempre terminan en captura)
+MCTS_PROCESOS = 1  # Árboles en paralelo (raíz paralela); 1 = sin pool de procesos
+MCTS_EPSILON = 0.2  # Probabilidad de paso al azar de Pac-Man en las simulaciones
+MCTS_PERSECUCION = 0.8  # Probabilidad de que un fantasma simulado se acerque a Pac-Man
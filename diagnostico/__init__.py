@@ -0,0 +1,9 @@
+"""
+Herramientas de diagnóstico de rendimiento
+"""
+from .instrumentacion import Instrumentacion, HistogramaMovil
+from .perfilador import PerfiladorMuestreo
+from .memoria import reporte_memoria, tamanio_profundo
+
+__all__ = ['Instrumentacion', 'HistogramaMovil', 'PerfiladorMuestreo', 'reporte_memoria',
+           'tamanio_profundo']
@@ -0,0 +1,147 @@
+"""
+Instrumentación ligera por frame con temporizadores perf_counter_ns
+Los tiempos se agregan por frame en histogramas móviles
+"""
+import time
+from collections import deque
+from typing import Dict, List, Sequence, Tuple
+import numpy as np
+
+
+class HistogramaMovil:
+    """
+    Ventana móvil de las últimas N muestras (nanosegundos)
+    """
+
+    def __init__(self, ventana: int = 300):
+        self.muestras = deque(maxlen=ventana)
+
+    def agregar(self, valor_ns: int):
+        """Agrega una muestra; la más antigua sale si la ventana está llena"""
+        self.muestras.append(valor_ns)
+
+    def percentiles(self, ps: Sequence[float] = (50, 90, 99)) -> List[float]:
+        """Percentiles de la ventana en milisegundos"""
+        if not self.muestras:
+            return [0.0 for _ in ps]
+        return [float(v) / 1e6 for v in np.percentile(np.fromiter(self.muestras, dtype=np.int64), ps)]
+
+    def media_ms(self) -> float:
+        """Media de la ventana en milisegundos"""
+        if not self.muestras:
+            return 0.0
+        return sum(self.muestras) / len(self.muestras) / 1e6
+
+    def cubetas(self, limites_ms: Sequence[float]) -> np.ndarray:
+        """Conteo de muestras por cubeta (límites en milisegundos)"""
+        datos = np.fromiter(self.muestras, dtype=np.int64) / 1e6
+        conteo, _ = np.histogram(datos, bins=limites_ms)
+        return conteo
+
+
+class _Temporizador:
+    """Context manager que suma la duración del bloque a una sección"""
+    __slots__ = ('instrumentacion', 'nombre', 'inicio')
+
+    def __init__(self, instrumentacion: 'Instrumentacion', nombre: str):
+        self.instrumentacion = instrumentacion
+        self.nombre = nombre
+        self.inicio = 0
+
+    def __enter__(self):
+        self.inicio = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *args):
+        self.instrumentacion.registrar(self.nombre, time.perf_counter_ns() - self.inicio)
+        return False
+
+
+class _TemporizadorNulo:
+    """Temporizador sin costo para cuando la instrumentación está apagada"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+_NULO = _TemporizadorNulo()
+
+
+class Instrumentacion:
+    """
+    Temporizadores con nombre agregados por frame.
+
+    Durante un frame, cada `medir(nombre)` suma su duración a la sección;
+    al cerrar el frame, el total de cada sección (0 si no se ejecutó) y la
+    duración del frame entran en sus histogramas móviles.
+    """
+
+    FRAME = 'frame'
+
+    def __init__(self, activo: bool = True, ventana: int = 300):
+        """
+        Args:
+            activo: Si es False, medir() no toma tiempos
+            ventana: Frames que conserva cada histograma
+        """
+        self.activo = activo
+        self.ventana = ventana
+        self.histogramas: Dict[str, HistogramaMovil] = {}
+        self._frame_actual: Dict[str, int] = {}
+        self._inicio_frame = 0
+
+    def medir(self, nombre: str):
+        """Context manager que mide el bloque bajo el nombre dado"""
+        if not self.activo:
+            return _NULO
+        return _Temporizador(self, nombre)
+
+    def registrar(self, nombre: str, duracion_ns: int):
+        """Suma una duración a la sección en el frame actual"""
+        self._frame_actual[nombre] = self._frame_actual.get(nombre, 0) + duracion_ns
+
+    def iniciar_frame(self):
+        """Marca el comienzo de un frame"""
+        self._frame_actual = {}
+        self._inicio_frame = time.perf_counter_ns()
+
+    def terminar_frame(self):
+        """Cierra el frame y vuelca sus totales a los histogramas"""
+        if not self.activo:
+            return
+
+        self._frame_actual[self.FRAME] = time.perf_counter_ns() - self._inicio_frame
+        for nombre in self._frame_actual.keys() - self.histogramas.keys():
+            self.histogramas[nombre] = HistogramaMovil(self.ventana)
+        for nombre, histograma in self.histogramas.items():
+            histograma.agregar(self._frame_actual.get(nombre, 0))
+
+    def percentiles_frame(self, ps: Sequence[float] = (50, 90, 99)) -> List[float]:
+        """Percentiles de la duración del frame en milisegundos"""
+        if self.FRAME not in self.histogramas:
+            return [0.0 for _ in ps]
+        return self.histogramas[self.FRAME].percentiles(ps)
+
+    def puntos_calientes(self, cantidad: int = 5) -> List[Tuple[str, float, float]]:
+        """
+        Secciones más costosas por frame
+
+        Returns:
+            Lista (nombre, media ms por frame, p99 ms) ordenada de mayor a menor
+        """
+        filas = [
+            (nombre, h.media_ms(), h.percentiles((99,))[0])
+            for nombre, h in self.histogramas.items()
+            if nombre != self.FRAME
+        ]
+        filas.sort(key=lambda f: f[1], reverse=True)
+        return filas[:cantidad]
+
+    def reiniciar(self):
+        """Descarta todas las muestras"""
+        self.histogramas = {}
+        self._frame_actual = {}
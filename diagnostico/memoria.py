@@ -0,0 +1,154 @@
+"""
+Contabilidad de memoria de las estructuras de planificación
+Combina instantáneas de tracemalloc durante la construcción con recorridos
+profundos de sys.getsizeof sobre cada estructura del planificador
+"""
+import sys
+import tracemalloc
+import types
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from clases.obstaculo import Obstaculo
+from config.configuracion import LIMITE
+from config.niveles import NIVELES
+from planificacion.diagrama_voronoi import DiagramaVoronoi
+from planificacion.visibility_graph import VisibilityGraph
+from benchmarks.mapas import generar_obstaculos
+
+
+# Tipos que no pertenecen a la estructura (se comparten con todo el programa)
+_TIPOS_EXCLUIDOS = (type, types.ModuleType, types.FunctionType, types.MethodType,
+                    types.BuiltinFunctionType)
+
+
+def tamanio_profundo(obj, vistos: Optional[Set[int]] = None) -> int:
+    """
+    Bytes de un objeto y todo lo que referencia (contenedores, __dict__, __slots__).
+    Cada objeto se cuenta una sola vez dentro de `vistos`.
+
+    Args:
+        obj: Objeto raíz
+        vistos: Ids ya contados (permite medir varias estructuras sin duplicar)
+
+    Returns:
+        Tamaño total en bytes
+    """
+    if vistos is None:
+        vistos = set()
+
+    total = 0
+    pendientes = [obj]
+    while pendientes:
+        actual = pendientes.pop()
+        if id(actual) in vistos or isinstance(actual, _TIPOS_EXCLUIDOS):
+            continue
+        vistos.add(id(actual))
+        total += sys.getsizeof(actual)
+
+        if isinstance(actual, dict):
+            pendientes.extend(actual.keys())
+            pendientes.extend(actual.values())
+        elif isinstance(actual, (list, tuple, set, frozenset)):
+            pendientes.extend(actual)
+        elif isinstance(actual, (str, bytes, int, float, bool)) or actual is None:
+            continue
+        else:
+            if hasattr(actual, '__dict__'):
+                pendientes.append(vars(actual))
+            for nombre in getattr(type(actual), '__slots__', ()):
+                if hasattr(actual, nombre):
+                    pendientes.append(getattr(actual, nombre))
+
+    return total
+
+
+def medir_construccion(construir: Callable[[], object]) -> Tuple[object, int, int]:
+    """
+    Construye un objeto midiendo con tracemalloc
+
+    Returns:
+        (objeto, bytes netos retenidos, pico de bytes durante la construcción)
+    """
+    ya_activo = tracemalloc.is_tracing()
+    if not ya_activo:
+        tracemalloc.start()
+
+    tracemalloc.reset_peak()
+    antes = tracemalloc.take_snapshot()
+    base, _ = tracemalloc.get_traced_memory()
+
+    objeto = construir()
+
+    _, pico = tracemalloc.get_traced_memory()
+    despues = tracemalloc.take_snapshot()
+    neto = sum(d.size_diff for d in despues.compare_to(antes, 'filename'))
+
+    if not ya_activo:
+        tracemalloc.stop()
+
+    return objeto, neto, pico - base
+
+
+def desglose_planificador(planificador) -> Dict[str, int]:
+    """
+    Bytes por atributo del planificador. Cada estructura se mide por separado,
+    por lo que las tuplas compartidas (p.ej. claves de grafo y puntos_voronoi)
+    aparecen en ambas; el total sin duplicados está en 'total'.
+    """
+    desglose = {}
+    for nombre, valor in vars(planificador).items():
+        desglose[nombre] = tamanio_profundo(valor)
+    desglose['total'] = tamanio_profundo(planificador)
+    return desglose
+
+
+def reporte_planificador(nombre: str, metodo: str, obstaculos: List[Obstaculo],
+                         limite: int) -> Dict:
+    """
+    Construye un planificador y reporta su memoria
+
+    Returns:
+        Diccionario con escenario, método, nodos, aristas, tracemalloc y desglose
+    """
+    if metodo == 'voronoi':
+        construir = lambda: DiagramaVoronoi(obstaculos, (limite, limite), silencioso=True)
+    else:
+        construir = lambda: VisibilityGraph(obstaculos, (limite, limite))
+
+    planificador, neto, pico = medir_construccion(construir)
+
+    return {
+        'escenario': nombre,
+        'metodo': metodo,
+        'nodos': len(planificador.grafo),
+        'aristas': sum(len(v) for v in planificador.grafo.values()) // 2,
+        'tracemalloc_neto': neto,
+        'tracemalloc_pico': pico,
+        'estructuras': desglose_planificador(planificador),
+    }
+
+
+def reporte_memoria(niveles: Optional[List[int]] = None,
+                    tamanios: Optional[List[int]] = None) -> List[Dict]:
+    """
+    Reporte de memoria de ambos planificadores por nivel y por mapa generado
+
+    Args:
+        niveles: Índices de nivel (por defecto todos)
+        tamanios: Límites de mapas generados adicionales
+
+    Returns:
+        Lista de reportes (ver reporte_planificador)
+    """
+    escenarios = []
+    for i in (niveles if niveles is not None else range(len(NIVELES))):
+        obstaculos = [Obstaculo(x, y, tam) for x, y, tam in NIVELES[i]['obstaculos']]
+        escenarios.append((f"nivel_{i + 1}", obstaculos, LIMITE))
+    for limite in tamanios or []:
+        escenarios.append((f"mapa_{2 * limite + 1}x{2 * limite + 1}",
+                           generar_obstaculos(limite, semilla=limite), limite))
+
+    return [
+        reporte_planificador(nombre, metodo, obstaculos, limite)
+        for nombre, obstaculos, limite in escenarios
+        for metodo in ('visibility', 'voronoi')
+    ]
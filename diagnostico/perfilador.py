@@ -0,0 +1,121 @@
+"""
+Perfilador por muestreo basado en la biblioteca estándar
+Un hilo toma la pila del hilo observado a intervalos fijos y la acumula
+en formato "collapsed stacks" (compatible con flamegraph.pl, speedscope, inferno)
+"""
+import sys
+import threading
+import time
+from collections import Counter
+from typing import List, Optional, Tuple
+
+
+# Módulos propios del juego (para el resumen de puntos calientes)
+MODULOS_PROPIOS = ('planificacion', 'clases', 'visualizacion', 'simulacion', 'ia',
+                   'benchmarks', 'diagnostico', 'config', '__main__')
+
+
+def etiqueta_frame(frame) -> str:
+    """Nombre 'modulo.Clase.funcion' de un frame (sin ';' ni espacios)"""
+    codigo = frame.f_code
+    modulo = frame.f_globals.get('__name__', '?')
+    funcion = getattr(codigo, 'co_qualname', codigo.co_name)
+    return f"{modulo}.{funcion}".replace(';', ':').replace(' ', '_')
+
+
+class PerfiladorMuestreo:
+    """
+    Muestrea la pila de un hilo (por defecto el que lo crea) cada `intervalo`
+    segundos durante una ventana de tiempo.
+    """
+
+    def __init__(self, intervalo: float = 0.005, hilo: Optional[int] = None):
+        """
+        Args:
+            intervalo: Segundos entre muestras
+            hilo: Identificador del hilo a observar (por defecto el actual)
+        """
+        self.intervalo = intervalo
+        self.hilo = hilo if hilo is not None else threading.get_ident()
+        self.pilas: Counter = Counter()
+        self.muestras = 0
+        self._detener = threading.Event()
+        self._hilo_muestreo: Optional[threading.Thread] = None
+        self._al_terminar = None
+
+    @property
+    def activo(self) -> bool:
+        """True mientras el hilo de muestreo está corriendo"""
+        return self._hilo_muestreo is not None and self._hilo_muestreo.is_alive()
+
+    def iniciar(self, duracion: Optional[float] = None, al_terminar=None):
+        """
+        Comienza a muestrear
+
+        Args:
+            duracion: Segundos de la ventana (None = hasta llamar a detener)
+            al_terminar: Callback sin argumentos al cerrar la ventana
+        """
+        if self.activo:
+            return
+        self.pilas = Counter()
+        self.muestras = 0
+        self._al_terminar = al_terminar
+        self._detener.clear()
+        self._hilo_muestreo = threading.Thread(
+            target=self._muestrear, args=(duracion,), name="perfilador", daemon=True
+        )
+        self._hilo_muestreo.start()
+
+    def detener(self):
+        """Detiene el muestreo y espera al hilo"""
+        self._detener.set()
+        if self._hilo_muestreo is not None and self._hilo_muestreo is not threading.current_thread():
+            self._hilo_muestreo.join()
+
+    def _muestrear(self, duracion: Optional[float]):
+        """Bucle del hilo de muestreo"""
+        fin = time.perf_counter() + duracion if duracion is not None else None
+
+        while not self._detener.wait(self.intervalo):
+            if fin is not None and time.perf_counter() >= fin:
+                break
+
+            frame = sys._current_frames().get(self.hilo)
+            if frame is None:
+                break  # El hilo observado terminó
+
+            pila = []
+            while frame is not None:
+                pila.append(etiqueta_frame(frame))
+                frame = frame.f_back
+            pila.reverse()
+
+            self.pilas[tuple(pila)] += 1
+            self.muestras += 1
+
+        if self._al_terminar is not None:
+            self._al_terminar()
+
+    def lineas_collapsed(self) -> List[str]:
+        """Pilas en formato 'raiz;...;hoja cantidad'"""
+        return [f"{';'.join(pila)} {cantidad}" for pila, cantidad in self.pilas.most_common()]
+
+    def escribir_collapsed(self, ruta: str):
+        """Guarda las pilas acumuladas para herramientas de flamegraph"""
+        with open(ruta, 'w', encoding='utf-8') as archivo:
+            for linea in self.lineas_collapsed():
+                archivo.write(linea + '\n')
+
+    def puntos_calientes(self, cantidad: int = 10) -> List[Tuple[str, int]]:
+        """
+        Funciones propias con más muestras propias (el frame propio más profundo
+        de cada pila; el tiempo en bibliotecas se atribuye a quien las llamó)
+        """
+        conteo = Counter()
+        for pila, muestras in self.pilas.items():
+            for etiqueta in reversed(pila):
+                if etiqueta.split('.', 1)[0] in MODULOS_PROPIOS:
+                    conteo[etiqueta] += muestras
+                    break
+        return conteo.most_common(cantidad)
@@ -0,0 +1,221 @@
+"""
+Pac-Man con IA - Modo headless (sin pygame)
+Ejecuta episodios automáticos lo más rápido posible y reporta el rendimiento
+"""
+import argparse
+import json
+import sys
+from simulacion.motor_headless import MotorHeadless
+from simulacion.torneo import Torneo
+from diagnostico.memoria import reporte_memoria
+from benchmarks import comparacion
+from config.configuracion import PRESUPUESTO_JUGADA_MS, MCTS_PROCESOS
+
+
+def comando_correr(args):
+    """Ejecuta N episodios y muestra el resumen de rendimiento"""
+    motor = MotorHeadless(max_pasos=args.max_pasos,
+                          registrar_busquedas=bool(args.exportar_busquedas),
+                          umbral_replanificacion=args.umbral_replanificacion,
+                          agente=args.agente,
+                          presupuesto_jugada_ms=args.presupuesto_ms,
+                          procesos_mcts=args.procesos_mcts,
+                          tour_puntos=args.tour_puntos,
+                          rutas_seguras=args.rutas_seguras)
+    resultados = motor.ejecutar(args.episodios, nivel=args.nivel, semilla=args.semilla)
+    resumen = MotorHeadless.resumir(resultados)
+
+    if args.exportar_busquedas:
+        # Una línea JSON por episodio con todas sus búsquedas
+        with open(args.exportar_busquedas, 'w', encoding='utf-8') as archivo:
+            for resultado in resultados:
+                archivo.write(json.dumps(resultado.a_dict()) + '\n')
+        for resultado in resultados:
+            resultado.busquedas = None
+
+    if args.json:
+        print(json.dumps({
+            'resumen': resumen,
+            'episodios': [r.a_dict() for r in resultados]
+        }, indent=2))
+        return
+
+    print("=" * 60)
+    print(f"HEADLESS - Nivel {args.nivel + 1}, {resumen['episodios']} episodios")
+    print("=" * 60)
+    print(f"Pasos totales:        {resumen['pasos']}")
+    print(f"Tiempo total:         {resumen['tiempo_total']:.3f} s")
+    print(f"Pasos por segundo:    {resumen['pasos_por_segundo']:.1f}")
+    print(f"Tiempo planificación: {resumen['tiempo_planificacion']:.3f} s "
+          f"({resumen['fraccion_planificacion'] * 100:.1f}%)")
+    print("Resultados:")
+    for resultado, cantidad in resumen['resultados'].items():
+        print(f"  {resultado:<14} {cantidad}")
+    if 'replanificacion' in resumen:
+        politica = resumen['replanificacion']
+        print(f"Replanificación (umbral {politica['umbral']}):")
+        print(f"  decisiones     {politica['decisiones']}")
+        for motivo, cantidad in sorted(politica['motivos'].items()):
+            print(f"  {motivo:<14} {cantidad}")
+        print(f"  reutilización  {politica['tasa_reutilizacion'] * 100:.1f}%")
+    if 'agente' in resumen:
+        agente = resumen['agente']
+        print(f"Agente {agente['modo']}:")
+        print(f"  jugadas        {agente['jugadas']}")
+        print(f"  nodos/s        {agente['nodos_por_segundo']:.0f}")
+        if 'profundidad_media' in agente:
+            print(f"  profundidad    {agente['profundidad_media']:.2f}")
+            print(f"  aciertos tabla {agente['aciertos_tabla']}")
+        if 'simulaciones' in agente:
+            print(f"  simulaciones   {agente['simulaciones']}")
+            print(f"  simulaciones/s {agente['simulaciones_por_segundo']:.0f}")
+    print("=" * 60)
+
+
+def comando_torneo(args):
+    """Barre configuraciones × niveles × semillas en paralelo"""
+    configuraciones = None
+    if args.configuraciones:
+        configuraciones = [tuple(c.split('+')) for c in args.configuraciones.split(',')]
+
+    torneo = Torneo(
+        configuraciones=configuraciones,
+        niveles=args.niveles,
+        semillas=args.semillas,
+        semilla_inicial=args.semilla,
+        max_pasos=args.max_pasos,
+        procesos=args.procesos
+    )
+
+    def progreso(resultado, completados, total):
+        if not args.json and (completados % 50 == 0 or completados == total):
+            print(f"\r  {completados}/{total} episodios", end='', file=sys.stderr, flush=True)
+
+    estadisticas = torneo.ejecutar(progreso)
+    filas = [e.a_dict() for e in estadisticas.values()]
+
+    if args.json:
+        print(json.dumps(filas, indent=2))
+        return
+
+    print(file=sys.stderr)
+    print("=" * 78)
+    print(f"TORNEO - {torneo.procesos} procesos, niveles {[n + 1 for n in torneo.niveles]}, "
+          f"{torneo.semillas} semillas")
+    print("=" * 78)
+    print(f"{'Configuración':<22}{'Episodios':>10}{'Captura':>10}"
+          f"{'Pasos (med)':>13}{'ms/episodio':>12}{'us/paso':>11}")
+    for fila in filas:
+        mediana = fila['pasos_captura_mediana']
+        print(f"{fila['configuracion']:<22}{fila['episodios']:>10}"
+              f"{fila['tasa_captura'] * 100:>9.1f}%"
+              f"{mediana if mediana is not None else '-':>13}"
+              f"{fila['planificacion_ms_por_episodio']:>12.2f}"
+              f"{fila['planificacion_us_por_paso']:>11.1f}")
+    print("=" * 78)
+
+
+def comando_memoria(args):
+    """Reporte de memoria de los planificadores por nivel y tamaño de mapa"""
+    reportes = reporte_memoria(args.niveles, args.tamanios)
+
+    if args.json:
+        print(json.dumps(reportes, indent=2))
+        return
+
+    def kib(valor):
+        return f"{valor / 1024:.1f}"
+
+    print("=" * 78)
+    print("MEMORIA DE PLANIFICADORES (KiB)")
+    print("=" * 78)
+    for r in reportes:
+        print(f"{r['escenario']} / {r['metodo']}: {r['nodos']} nodos, {r['aristas']} aristas")
+        print(f"   tracemalloc neto {kib(r['tracemalloc_neto'])}, pico construcción {kib(r['tracemalloc_pico'])}")
+        for estructura, tamanio in r['estructuras'].items():
+            print(f"   {estructura:<20}{kib(tamanio):>12}")
+    print("=" * 78)
+
+
+def comando_comparar(args):
+    """Compara planificadores y algoritmos sobre consultas aleatorias"""
+    datos = comparacion.ejecutar(args.pares, args.niveles, args.semilla, args.procesos)
+
+    if args.json:
+        print(json.dumps(datos, indent=2))
+        return
+
+    print("=" * 94)
+    print(f"COMPARACIÓN DE PLANIFICADORES ({args.pares} consultas por nivel)")
+    print("=" * 94)
+    comparacion.imprimir_tabla(datos)
+    print("=" * 94)
+
+
+def crear_parser() -> argparse.ArgumentParser:
+    """Construye el parser de la línea de comandos"""
+    parser = argparse.ArgumentParser(description="Pac-Man IA sin interfaz gráfica")
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+
+    correr = subparsers.add_parser('correr', help="Ejecuta episodios automáticos")
+    correr.add_argument('--episodios', type=int, default=10)
+    correr.add_argument('--nivel', type=int, default=0, help="Índice del nivel (desde 0)")
+    correr.add_argument('--semilla', type=int, default=0, help="Semilla del primer episodio")
+    correr.add_argument('--max-pasos', type=int, default=5000)
+    correr.add_argument('--json', action='store_true', help="Salida en JSON")
+    correr.add_argument('--exportar-busquedas', default='', metavar='ARCHIVO',
+                        help="Guarda las estadísticas de búsqueda por episodio (JSON Lines)")
+    correr.add_argument('--umbral-replanificacion', type=float, default=None, metavar='DISTANCIA',
+                        help="Replanificación bajo demanda: distancia de Pac-Man al objetivo "
+                             "planificado que fuerza una nueva ruta")
+    correr.add_argument('--tour-puntos', action='store_true',
+                        help="Pac-Man sigue un recorrido optimizado de los puntos (inserción + 2-opt)")
+    correr.add_argument('--rutas-seguras', action='store_true',
+                        help="Rutas de Pac-Man que evitan la cercanía de los fantasmas (campo de amenaza)")
+    correr.add_argument('--agente', choices=['alfa_beta', 'expectimax', 'mcts'], default=None,
+                        help="Pac-Man decide cada paso con búsqueda en árbol")
+    correr.add_argument('--presupuesto-ms', type=float, default=PRESUPUESTO_JUGADA_MS,
+                        help="Tiempo de búsqueda por jugada del agente")
+    correr.add_argument('--procesos-mcts', type=int, default=MCTS_PROCESOS,
+                        help="Árboles en paralelo del agente mcts (raíz paralela)")
+    correr.set_defaults(funcion=comando_correr)
+
+    torneo = subparsers.add_parser('torneo', help="Torneo paralelo de configuraciones de fantasmas")
+    torneo.add_argument('--configuraciones', default='',
+                        help="Lista 'algoritmo+metodo' separada por comas (por defecto las 4 fijas)")
+    torneo.add_argument('--niveles', type=int, nargs='+', default=None,
+                        help="Índices de nivel (desde 0); por defecto todos")
+    torneo.add_argument('--semillas', type=int, default=100, help="Semillas por configuración y nivel")
+    torneo.add_argument('--semilla', type=int, default=0, help="Primera semilla")
+    torneo.add_argument('--max-pasos', type=int, default=5000)
+    torneo.add_argument('--procesos', type=int, default=None, help="Por defecto todos los núcleos")
+    torneo.add_argument('--json', action='store_true', help="Salida en JSON")
+    torneo.set_defaults(funcion=comando_torneo)
+
+    memoria = subparsers.add_parser('memoria', help="Reporte de memoria de los planificadores")
+    memoria.add_argument('--niveles', type=int, nargs='+', default=None,
+                         help="Índices de nivel (desde 0); por defecto todos")
+    memoria.add_argument('--tamanios', type=int, nargs='*', default=[],
+                         help="Límites de mapas generados adicionales (p.ej. 15 20)")
+    memoria.add_argument('--json', action='store_true', help="Salida en JSON")
+    memoria.set_defaults(funcion=comando_memoria)
+
+    comparar = subparsers.add_parser('comparar', help="Compara planificadores y algoritmos en consultas aleatorias")
+    comparar.add_argument('--pares', type=int, default=1000, help="Consultas inicio/objetivo por nivel")
+    comparar.add_argument('--niveles', type=int, nargs='+', default=None,
+                          help="Índices de nivel (desde 0); por defecto todos")
+    comparar.add_argument('--semilla', type=int, default=0, help="Semilla del muestreo de consultas")
+    comparar.add_argument('--procesos', type=int, default=None, help="Por defecto todos los núcleos")
+    comparar.add_argument('--json', action='store_true', help="Salida en JSON")
+    comparar.set_defaults(funcion=comando_comparar)
+
+    return parser
+
+
+def main(argv=None):
+    args = crear_parser().parse_args(argv)
+    args.funcion(args)
+
+
+if __name__ == "__main__":
+    main()
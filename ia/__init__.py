@@ -0,0 +1,8 @@
+"""
+Módulo de agentes de búsqueda en árbol para Pac-Man
+"""
+from .estado_compacto import ModeloNivel, EstadoCompacto, modelo_para
+from .alfa_beta import AgenteAlfaBeta
+from .mcts import AgenteMCTS, ArbolMCTS
+
+__all__ = ['ModeloNivel', 'EstadoCompacto', 'modelo_para', 'AgenteAlfaBeta', 'AgenteMCTS', 'ArbolMCTS']
@@ -0,0 +1,300 @@
+"""
+Agente de búsqueda en árbol para Pac-Man
+Alfa-beta (fantasmas adversarios) o expectimax (fantasmas al azar) sobre
+EstadoCompacto, con profundización iterativa bajo un presupuesto de tiempo por
+jugada y tabla de transposición indexada por el hash Zobrist del estado.
+Una ronda es un paso de Pac-Man seguido de un paso de cada fantasma, igual
+que Entorno.actualizar; la captura se verifica al final de la ronda.
+"""
+import time
+from typing import Dict, List, Optional, Tuple
+from ia.estado_compacto import EstadoCompacto, modelo_para
+from config.configuracion import (PROFUNDIDAD_BUSQUEDA, PRESUPUESTO_JUGADA_MS,
+                                  CAPACIDAD_TABLA_TRANSPOSICION, RADIO_AMENAZA)
+
+# Modos de búsqueda
+MODO_ALFA_BETA = 'alfa_beta'
+MODO_EXPECTIMAX = 'expectimax'
+
+# Tipos de entrada de la tabla de transposición
+EXACTO = 0
+COTA_INFERIOR = 1
+COTA_SUPERIOR = 2
+
+# Valores terminales (se descuentan las jugadas para preferir ganar antes y perder después)
+GANAR = 100000.0
+PERDER = -100000.0
+INFINITO = float('inf')
+
+# Nodos entre consultas del reloj
+INTERVALO_RELOJ = 1024
+
+
+class _TiempoAgotado(Exception):
+    """Corta la iteración en curso cuando se acaba el presupuesto"""
+
+
+class AgenteAlfaBeta:
+    """
+    Decide el próximo paso de Pac-Man buscando `profundidad` rondas hacia adelante.
+    Solo los fantasmas que pueden alcanzar a Pac-Man dentro del horizonte se
+    mueven en la búsqueda; el resto queda quieto (no cambia el resultado y
+    reduce el factor de ramificación).
+    """
+
+    def __init__(self, profundidad: int = PROFUNDIDAD_BUSQUEDA,
+                 presupuesto_ms: float = PRESUPUESTO_JUGADA_MS,
+                 modo: str = MODO_ALFA_BETA,
+                 capacidad_tabla: int = CAPACIDAD_TABLA_TRANSPOSICION):
+        """
+        Args:
+            profundidad: Rondas máximas de la profundización iterativa
+            presupuesto_ms: Tiempo por jugada (None o 0 = sin límite)
+            modo: 'alfa_beta' o 'expectimax'
+            capacidad_tabla: Entradas de la tabla de transposición antes de vaciarla
+        """
+        if modo not in (MODO_ALFA_BETA, MODO_EXPECTIMAX):
+            raise ValueError(f"Modo de búsqueda desconocido: {modo}")
+        self.profundidad = profundidad
+        self.presupuesto_ms = presupuesto_ms
+        self.modo = modo
+        self.capacidad_tabla = capacidad_tabla
+
+        # clave Zobrist -> (rondas, valor, tipo, mejor celda de Pac-Man)
+        self.tabla: Dict[int, Tuple[int, float, int, int]] = {}
+        self._activos: List[int] = []
+        self._limite = INFINITO
+
+        # Estadísticas
+        self.jugadas = 0
+        self.nodos = 0
+        self.aciertos_tabla = 0
+        self.tiempo = 0.0
+        self.profundidad_alcanzada = 0
+        self.profundidad_total = 0
+
+    @property
+    def nodos_por_segundo(self) -> float:
+        return self.nodos / self.tiempo if self.tiempo > 0 else 0.0
+
+    def decidir(self, entorno) -> Optional[Tuple[int, int]]:
+        """
+        Próximo paso de Pac-Man en un Entorno
+
+        Returns:
+            Dirección (dx, dy) o None si Pac-Man no puede moverse
+        """
+        modelo = modelo_para(entorno.obstaculos)
+        estado = EstadoCompacto.desde_entorno(entorno, modelo)
+        if not estado.puntos:
+            return None
+
+        celda = self.buscar(estado)
+        if celda is None or celda == estado.pacman:
+            return None
+        x, y = modelo.posicion(celda)
+        return x - entorno.pacman.pos[0], y - entorno.pacman.pos[1]
+
+    def buscar(self, estado: EstadoCompacto) -> Optional[int]:
+        """
+        Profundización iterativa desde `estado` (no se modifica)
+
+        Returns:
+            Celda a la que conviene mover a Pac-Man
+        """
+        inicio = time.perf_counter()
+        self._limite = (inicio + self.presupuesto_ms / 1000.0) if self.presupuesto_ms else INFINITO
+        # El valor de un estado depende de lo comido desde la raíz: la tabla es por jugada
+        self.tabla.clear()
+
+        distancias = estado.modelo.distancias_fantasma
+        self._activos = [k for k, celda in enumerate(estado.fantasmas)
+                         if distancias[celda][estado.pacman] <= 2 * self.profundidad + 1]
+
+        jugadas = estado.jugadas_pacman()
+        mejor = jugadas[0]
+        profundidad_alcanzada = 0
+        for profundidad in range(1, self.profundidad + 1):
+            try:
+                # Copia: una iteración cortada deja el estado a mitad de jugada
+                celda, valor = self._raiz(estado.copia(), profundidad, mejor)
+            except _TiempoAgotado:
+                break
+            mejor = celda
+            profundidad_alcanzada = profundidad
+            # Resultado forzado: buscar más profundo no lo cambia
+            if abs(valor) >= GANAR / 2:
+                break
+
+        self.jugadas += 1
+        self.profundidad_alcanzada = profundidad_alcanzada
+        self.profundidad_total += profundidad_alcanzada
+        self.tiempo += time.perf_counter() - inicio
+        return mejor
+
+    def _contar_nodo(self):
+        self.nodos += 1
+        if self.nodos % INTERVALO_RELOJ == 0 and time.perf_counter() > self._limite:
+            raise _TiempoAgotado()
+
+    def _ordenar_pacman(self, estado: EstadoCompacto, primera: Optional[int]) -> List[int]:
+        """Jugada de la tabla primero, luego las que comen o acercan al punto más cercano"""
+        distancias = estado.modelo.distancias_pacman
+        puntos = estado.puntos
+
+        def prioridad(celda: int) -> int:
+            if celda == primera:
+                return -2
+            if celda in puntos:
+                return -1
+            fila = distancias[celda]
+            return min(fila[p] for p in puntos)
+
+        return sorted(estado.jugadas_pacman(), key=prioridad)
+
+    def _raiz(self, estado: EstadoCompacto, rondas: int,
+              anterior: Optional[int]) -> Tuple[int, float]:
+        """Primera jugada de Pac-Man con ventana completa"""
+        alfa = -INFINITO
+        mejor_celda, mejor_valor = None, -INFINITO
+        pacman_anterior = estado.pacman
+        fantasmas_anteriores = tuple(estado.fantasmas)
+
+        for celda in self._ordenar_pacman(estado, anterior):
+            deshacer = estado.mover_pacman(celda)
+            valor = self._fantasmas(estado, 0, rondas, alfa, INFINITO, 1,
+                                    pacman_anterior, fantasmas_anteriores)
+            estado.deshacer_pacman(*deshacer)
+            if valor > mejor_valor:
+                mejor_celda, mejor_valor = celda, valor
+            if self.modo == MODO_ALFA_BETA:
+                alfa = max(alfa, valor)
+
+        return mejor_celda, mejor_valor
+
+    def _pacman(self, estado: EstadoCompacto, rondas: int, alfa: float, beta: float,
+                jugadas: int) -> float:
+        """Nodo de Pac-Man al comienzo de una ronda (máximo)"""
+        self._contar_nodo()
+        if rondas == 0:
+            return self.evaluar(estado)
+
+        # Solo al comienzo de la ronda el estado determina el futuro (la captura
+        # por cruce depende de las posiciones previas)
+        clave = estado.hash
+        entrada = self.tabla.get(clave)
+        primera = None
+        if entrada is not None:
+            rondas_tabla, valor, tipo, primera = entrada
+            if rondas_tabla >= rondas:
+                if tipo == EXACTO:
+                    self.aciertos_tabla += 1
+                    return valor
+                if tipo == COTA_INFERIOR:
+                    alfa = max(alfa, valor)
+                elif tipo == COTA_SUPERIOR:
+                    beta = min(beta, valor)
+                if alfa >= beta:
+                    self.aciertos_tabla += 1
+                    return valor
+
+        alfa_original, beta_original = alfa, beta
+        pacman_anterior = estado.pacman
+        fantasmas_anteriores = tuple(estado.fantasmas)
+        mejor_celda, mejor_valor = None, -INFINITO
+
+        for celda in self._ordenar_pacman(estado, primera):
+            deshacer = estado.mover_pacman(celda)
+            valor = self._fantasmas(estado, 0, rondas, alfa, beta, jugadas + 1,
+                                    pacman_anterior, fantasmas_anteriores)
+            estado.deshacer_pacman(*deshacer)
+            if valor > mejor_valor:
+                mejor_celda, mejor_valor = celda, valor
+            if self.modo == MODO_ALFA_BETA:
+                alfa = max(alfa, valor)
+                if alfa >= beta:
+                    break
+
+        if self.modo == MODO_EXPECTIMAX or alfa_original < mejor_valor < beta_original:
+            tipo = EXACTO
+        elif mejor_valor >= beta_original:
+            tipo = COTA_INFERIOR
+        else:
+            tipo = COTA_SUPERIOR
+        if len(self.tabla) >= self.capacidad_tabla:
+            self.tabla.clear()
+        self.tabla[clave] = (rondas, mejor_valor, tipo, mejor_celda)
+        return mejor_valor
+
+    def _fantasmas(self, estado: EstadoCompacto, i: int, rondas: int, alfa: float, beta: float,
+                   jugadas: int, pacman_anterior: int, fantasmas_anteriores: Tuple[int, ...]) -> float:
+        """Nodo del i-ésimo fantasma activo (mínimo o promedio según el modo)"""
+        if i == len(self._activos):
+            # Fin de la ronda, mismo orden que Entorno.actualizar
+            if estado.captura(pacman_anterior, fantasmas_anteriores):
+                return PERDER + jugadas
+            if not estado.puntos:
+                return GANAR - jugadas
+            return self._pacman(estado, rondas - 1, alfa, beta, jugadas)
+
+        self._contar_nodo()
+        k = self._activos[i]
+        # Primero los pasos que más acercan al fantasma (más cortes)
+        distancias = estado.modelo.distancias_fantasma
+        pacman = estado.pacman
+        celdas = sorted(estado.jugadas_fantasma(k), key=lambda c: distancias[c][pacman])
+
+        if self.modo == MODO_EXPECTIMAX:
+            total = 0.0
+            for celda in celdas:
+                anterior = estado.mover_fantasma(k, celda)
+                total += self._fantasmas(estado, i + 1, rondas, -INFINITO, INFINITO, jugadas,
+                                         pacman_anterior, fantasmas_anteriores)
+                estado.deshacer_fantasma(k, anterior)
+            return total / len(celdas)
+
+        peor = INFINITO
+        for celda in celdas:
+            anterior = estado.mover_fantasma(k, celda)
+            valor = self._fantasmas(estado, i + 1, rondas, alfa, beta, jugadas,
+                                    pacman_anterior, fantasmas_anteriores)
+            estado.deshacer_fantasma(k, anterior)
+            peor = min(peor, valor)
+            beta = min(beta, valor)
+            if alfa >= beta:
+                break
+        return peor
+
+    def evaluar(self, estado: EstadoCompacto) -> float:
+        """
+        Valor de un estado no terminal: puntos comidos, cercanía al próximo
+        punto y penalización por fantasmas dentro del radio de amenaza
+        """
+        modelo = estado.modelo
+        fila = modelo.distancias_pacman[estado.pacman]
+        valor = 100.0 * estado.comidos - min(fila[p] for p in estado.puntos)
+
+        pacman = estado.pacman
+        distancias = modelo.distancias_fantasma
+        for celda in estado.fantasmas:
+            distancia = distancias[celda][pacman]
+            if distancia <= 1:
+                valor -= 500.0
+            elif distancia < RADIO_AMENAZA:
+                valor -= 50.0 / distancia
+        return valor
+
+    def cerrar(self):
+        """Sin recursos que liberar (misma interfaz que AgenteMCTS)"""
+
+    def resumen(self) -> Dict:
+        """Contadores acumulados de la búsqueda"""
+        return {
+            'modo': self.modo,
+            'jugadas': self.jugadas,
+            'nodos': self.nodos,
+            'tiempo': self.tiempo,
+            'nodos_por_segundo': self.nodos_por_segundo,
+            'aciertos_tabla': self.aciertos_tabla,
+            'profundidad_media': self.profundidad_total / self.jugadas if self.jugadas else 0.0
+        }
@@ -0,0 +1,234 @@
+"""
+Estado compacto del juego para búsqueda en árbol
+Las celdas se numeran (i * lado + j) y todo lo estático del nivel (vecinos,
+distancias entre celdas, tablas Zobrist) se precalcula una vez en ModeloNivel.
+EstadoCompacto guarda solo lo que cambia (Pac-Man, fantasmas, puntos) y se
+modifica en el lugar con deshacer, manteniendo su hash Zobrist incremental.
+"""
+import random
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from planificacion.grilla import construir_grilla_libre
+from planificacion.campo_amenaza import bfs_multiorigen
+from config.configuracion import LIMITE
+
+Punto = Tuple[int, int]
+
+# Direcciones de Pac-Man (mismas que PacMan.set_direccion)
+DIRECCIONES = ((0, 1), (0, -1), (-1, 0), (1, 0))
+
+# Distancia usada para pares de celdas sin camino
+SIN_CAMINO = 10 ** 4
+
+
+def _vecinos(libre: np.ndarray) -> Tuple[Tuple[int, ...], ...]:
+    """
+    Celdas libres alcanzables en un paso desde cada celda. Las celdas bloqueadas
+    también tienen vecinos: algunos vértices del Visibility Graph caen sobre un
+    obstáculo de una celda y un fantasma puede detenerse en uno.
+    """
+    lado = libre.shape[0]
+    vecinos = []
+    for i in range(lado):
+        for j in range(lado):
+            celdas = []
+            for dx, dy in DIRECCIONES:
+                ni, nj = i + dx, j + dy
+                if 0 <= ni < lado and 0 <= nj < lado and libre[ni, nj]:
+                    celdas.append(ni * lado + nj)
+            vecinos.append(tuple(celdas))
+    return tuple(vecinos)
+
+
+def _tabla_vecinos(vecinos: Tuple[Tuple[int, ...], ...]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vecinos en forma de arreglo para simulaciones por lotes
+
+    Returns:
+        (tabla (n, 4) rellenada con la propia celda, cantidad de vecinos válidos (mínimo 1))
+    """
+    n = len(vecinos)
+    tabla = np.repeat(np.arange(n)[:, None], len(DIRECCIONES), axis=1)
+    grado = np.ones(n, dtype=np.int64)
+    for celda, celdas in enumerate(vecinos):
+        if celdas:
+            tabla[celda, :len(celdas)] = celdas
+            grado[celda] = len(celdas)
+    return tabla, grado
+
+
+def _distancias(libre: np.ndarray) -> np.ndarray:
+    """Distancias en pasos entre todas las celdas (un BFS vectorizado por celda)"""
+    lado = libre.shape[0]
+    n = lado * lado
+    distancias = np.full((n, n), SIN_CAMINO, dtype=np.int32)
+    for celda in range(n):
+        i, j = divmod(celda, lado)
+        desde = bfs_multiorigen(libre, [(i, j)])
+        alcanzadas = np.isfinite(desde)
+        distancias[celda][alcanzadas.ravel()] = desde[alcanzadas].astype(np.int32)
+    return distancias
+
+
+# Modelos ya construidos por nivel (firma de los obstáculos), como _CACHE_PLANIFICADORES
+_CACHE_MODELOS: Dict[Tuple, 'ModeloNivel'] = {}
+
+
+def modelo_para(obstaculos: List, limite: int = LIMITE) -> 'ModeloNivel':
+    """ModeloNivel de un conjunto de obstáculos, construido una vez por proceso"""
+    firma = (limite,) + tuple((obs.pos[0], obs.pos[1], obs.tam) for obs in obstaculos)
+    if firma not in _CACHE_MODELOS:
+        _CACHE_MODELOS[firma] = ModeloNivel(obstaculos, limite)
+    return _CACHE_MODELOS[firma]
+
+
+class ModeloNivel:
+    """Datos estáticos de un nivel compartidos por todos los estados de una búsqueda"""
+
+    def __init__(self, obstaculos: List, limite: int = LIMITE, semilla: int = 0,
+                 max_fantasmas: int = 8):
+        """
+        Args:
+            obstaculos: Obstáculos del nivel
+            limite: Coordenada máxima en cada eje
+            semilla: Semilla de las tablas Zobrist
+            max_fantasmas: Fantasmas con tabla Zobrist propia
+        """
+        self.limite = limite
+        self.lado = 2 * limite + 1
+        n = self.lado * self.lado
+
+        # Pac-Man no pisa obstáculos; los fantasmas recorren sus bordes
+        libre = construir_grilla_libre(obstaculos, limite)
+        transitable = construir_grilla_libre(obstaculos, limite, bordes_transitables=True)
+        self.vecinos_pacman = _vecinos(libre)
+        self.vecinos_fantasma = _vecinos(transitable)
+
+        # Distancias de Pac-Man a los puntos y de los fantasmas a Pac-Man
+        # (listas para la búsqueda nodo a nodo, arreglos para los lotes)
+        self.matriz_pacman = _distancias(libre)
+        self.matriz_fantasma = _distancias(transitable)
+        self.distancias_pacman = self.matriz_pacman.tolist()
+        self.distancias_fantasma = self.matriz_fantasma.tolist()
+        self.tabla_pacman, self.grado_pacman = _tabla_vecinos(self.vecinos_pacman)
+        self.tabla_fantasma, self.grado_fantasma = _tabla_vecinos(self.vecinos_fantasma)
+
+        rng = random.Random(semilla)
+        self.zobrist_pacman = [rng.getrandbits(64) for _ in range(n)]
+        self.zobrist_fantasma = [[rng.getrandbits(64) for _ in range(n)] for _ in range(max_fantasmas)]
+        self.zobrist_punto = [rng.getrandbits(64) for _ in range(n)]
+
+    def celda(self, pos: Sequence[int]) -> int:
+        """Índice de celda de una posición del mundo"""
+        return (pos[0] + self.limite) * self.lado + (pos[1] + self.limite)
+
+    def posicion(self, celda: int) -> Punto:
+        """Posición del mundo de un índice de celda"""
+        i, j = divmod(celda, self.lado)
+        return i - self.limite, j - self.limite
+
+
+class EstadoCompacto:
+    """
+    Pac-Man, fantasmas y puntos pendientes como enteros. Las jugadas devuelven
+    lo necesario para deshacerlas, así la búsqueda no copia estados.
+    """
+
+    __slots__ = ('modelo', 'pacman', 'fantasmas', 'puntos', 'comidos', 'hash')
+
+    def __init__(self, modelo: ModeloNivel, pacman: int, fantasmas: List[int], puntos: set):
+        self.modelo = modelo
+        self.pacman = pacman
+        self.fantasmas = list(fantasmas)
+        self.puntos = set(puntos)
+        self.comidos = 0
+
+        self.hash = modelo.zobrist_pacman[pacman]
+        for k, celda in enumerate(self.fantasmas):
+            self.hash ^= modelo.zobrist_fantasma[k][celda]
+        for celda in self.puntos:
+            self.hash ^= modelo.zobrist_punto[celda]
+
+    @classmethod
+    def desde_entorno(cls, entorno, modelo: ModeloNivel) -> 'EstadoCompacto':
+        """Toma la situación actual de un Entorno"""
+        return cls(
+            modelo,
+            modelo.celda(entorno.pacman.pos),
+            [modelo.celda(f.pos) for f in entorno.fantasmas],
+            {modelo.celda(p.pos) for p in entorno.puntos if not p.recolectado}
+        )
+
+    def copia(self) -> 'EstadoCompacto':
+        """Copia independiente (sin recalcular el hash)"""
+        copia = EstadoCompacto.__new__(EstadoCompacto)
+        copia.modelo = self.modelo
+        copia.pacman = self.pacman
+        copia.fantasmas = list(self.fantasmas)
+        copia.puntos = set(self.puntos)
+        copia.comidos = self.comidos
+        copia.hash = self.hash
+        return copia
+
+    def jugadas_pacman(self) -> Tuple[int, ...]:
+        """Celdas a las que puede moverse Pac-Man (se queda quieto solo si no hay otra)"""
+        return self.modelo.vecinos_pacman[self.pacman] or (self.pacman,)
+
+    def jugadas_fantasma(self, k: int) -> Tuple[int, ...]:
+        return self.modelo.vecinos_fantasma[self.fantasmas[k]] or (self.fantasmas[k],)
+
+    def mover_pacman(self, celda: int) -> Tuple[int, bool]:
+        """
+        Mueve a Pac-Man y come el punto de la celda
+
+        Returns:
+            (celda anterior, comió) para deshacer
+        """
+        modelo = self.modelo
+        anterior = self.pacman
+        self.hash ^= modelo.zobrist_pacman[anterior] ^ modelo.zobrist_pacman[celda]
+        self.pacman = celda
+
+        comio = celda in self.puntos
+        if comio:
+            self.puntos.remove(celda)
+            self.comidos += 1
+            self.hash ^= modelo.zobrist_punto[celda]
+        return anterior, comio
+
+    def deshacer_pacman(self, anterior: int, comio: bool):
+        modelo = self.modelo
+        celda = self.pacman
+        if comio:
+            self.puntos.add(celda)
+            self.comidos -= 1
+            self.hash ^= modelo.zobrist_punto[celda]
+        self.hash ^= modelo.zobrist_pacman[celda] ^ modelo.zobrist_pacman[anterior]
+        self.pacman = anterior
+
+    def mover_fantasma(self, k: int, celda: int) -> int:
+        """Mueve el fantasma k. Returns: celda anterior"""
+        tabla = self.modelo.zobrist_fantasma[k]
+        anterior = self.fantasmas[k]
+        self.hash ^= tabla[anterior] ^ tabla[celda]
+        self.fantasmas[k] = celda
+        return anterior
+
+    def deshacer_fantasma(self, k: int, anterior: int):
+        tabla = self.modelo.zobrist_fantasma[k]
+        self.hash ^= tabla[self.fantasmas[k]] ^ tabla[anterior]
+        self.fantasmas[k] = anterior
+
+    def captura(self, pacman_anterior: Optional[int] = None,
+                fantasmas_anteriores: Optional[Sequence[int]] = None) -> bool:
+        """
+        Misma regla que PacMan.verificar_colision_fantasma: misma celda o
+        intercambio de celdas durante la ronda
+        """
+        for k, celda in enumerate(self.fantasmas):
+            if celda == self.pacman:
+                return True
+            if (pacman_anterior is not None and fantasmas_anteriores is not None
+                    and fantasmas_anteriores[k] == self.pacman and celda == pacman_anterior):
+                return True
+        return False
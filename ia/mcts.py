@@ -0,0 +1,414 @@
+"""
+Agente Monte Carlo Tree Search para Pac-Man
+El árbol tiene solo las jugadas de Pac-Man (lazo abierto): en cada descenso
+los pasos de los fantasmas se sortean con la política de simulación, así un
+mismo nodo promedia muchas respuestas de los fantasmas. La selección es UCT,
+los descensos se juntan en lotes (con pérdida virtual) y sus simulaciones
+corren a la vez en arreglos NumPy. Con varios procesos cada uno arma su propio
+árbol desde la misma raíz y las visitas de la raíz se suman (raíz paralela).
+Vecinos, distancias y captura salen de ModeloNivel / EstadoCompacto, que
+aplican las reglas de movimiento y colisión de Entorno.
+"""
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from ia.estado_compacto import EstadoCompacto, ModeloNivel, modelo_para
+from config.configuracion import (PRESUPUESTO_JUGADA_MS, MCTS_EXPLORACION, MCTS_LOTE,
+                                  MCTS_HORIZONTE, MCTS_PROCESOS, MCTS_EPSILON, MCTS_PERSECUCION)
+
+# Valores de las simulaciones
+VALOR_VICTORIA = 1.0
+VALOR_CAPTURA = 0.0
+
+# Distancia usada para puntos ya comidos y vecinos de relleno
+LEJOS = 10 ** 6
+
+
+def simular_lote(modelo: ModeloNivel, pacman: np.ndarray, fantasmas: np.ndarray,
+                 activos: np.ndarray, celdas_puntos: np.ndarray, puntos_raiz: int,
+                 horizonte: int, rng: np.random.Generator,
+                 epsilon: float = MCTS_EPSILON, persecucion: float = MCTS_PERSECUCION) -> np.ndarray:
+    """
+    Simula B partidas a la vez durante `horizonte` rondas
+
+    Pac-Man va al punto más cercano evitando las celdas junto a un fantasma
+    (con probabilidad epsilon da un paso al azar); cada fantasma se acerca a
+    Pac-Man con probabilidad `persecucion` y si no se mueve al azar.
+
+    Args:
+        modelo: Tablas del nivel
+        pacman: Celda de Pac-Man de cada partida (B,)
+        fantasmas: Celdas de los fantasmas (B, m)
+        activos: Puntos sin comer de cada partida (B, P)
+        celdas_puntos: Celda de cada punto (P,)
+        puntos_raiz: Puntos pendientes en la raíz de la búsqueda
+        horizonte: Rondas máximas
+        rng: Generador de NumPy
+
+    Returns:
+        Valor en [0, 1] de cada partida (1 victoria, 0 captura)
+    """
+    pacman = pacman.copy()
+    fantasmas = fantasmas.copy()
+    activos = activos.copy()
+    b, m = fantasmas.shape
+    filas = np.arange(b)
+    valores = np.full(b, -1.0)
+    vivas = np.ones(b, dtype=bool)
+    ranuras = np.arange(4)
+
+    tabla_p, grado_p = modelo.tabla_pacman, modelo.grado_pacman
+    tabla_f, grado_f = modelo.tabla_fantasma, modelo.grado_fantasma
+    matriz_p, matriz_f = modelo.matriz_pacman, modelo.matriz_fantasma
+
+    for _ in range(horizonte):
+        # Pac-Man: distancia de cada vecino al punto pendiente más cercano
+        candidatos = tabla_p[pacman]                                   # (B, 4)
+        hasta_puntos = matriz_p[candidatos[:, :, None], celdas_puntos[None, None, :]]
+        hasta_puntos = np.where(activos[:, None, :], hasta_puntos, LEJOS).min(axis=2)
+        cerca_fantasma = (matriz_f[fantasmas[:, :, None], candidatos[:, None, :]] <= 1).any(axis=1)
+        costo = hasta_puntos + np.where(cerca_fantasma, 1000, 0)
+        costo = np.where(ranuras[None, :] < grado_p[pacman][:, None], costo, LEJOS)
+        eleccion = costo.argmin(axis=1)
+        al_azar = rng.random(b) < epsilon
+        eleccion = np.where(al_azar, (rng.random(b) * grado_p[pacman]).astype(np.int64), eleccion)
+        pacman_anterior = pacman
+        pacman = np.where(vivas, candidatos[filas, eleccion], pacman)
+
+        activos &= ~((celdas_puntos[None, :] == pacman[:, None]) & vivas[:, None])
+
+        # Fantasmas: paso que más los acerca a Pac-Man o uno al azar
+        candidatos = tabla_f[fantasmas]                                # (B, m, 4)
+        hasta_pacman = matriz_f[candidatos, pacman[:, None, None]]
+        hasta_pacman = np.where(ranuras[None, None, :] < grado_f[fantasmas][:, :, None],
+                                hasta_pacman, LEJOS)
+        eleccion = hasta_pacman.argmin(axis=2)
+        al_azar = rng.random((b, m)) >= persecucion
+        eleccion = np.where(al_azar, (rng.random((b, m)) * grado_f[fantasmas]).astype(np.int64),
+                            eleccion)
+        fantasmas_anteriores = fantasmas
+        nuevos = np.take_along_axis(candidatos, eleccion[:, :, None], axis=2)[:, :, 0]
+        fantasmas = np.where(vivas[:, None], nuevos, fantasmas)
+
+        # Mismo orden que Entorno.actualizar: primero la captura, después la victoria
+        captura = ((fantasmas == pacman[:, None]) |
+                   ((fantasmas_anteriores == pacman[:, None]) &
+                    (fantasmas == pacman_anterior[:, None]))).any(axis=1) & vivas
+        valores[captura] = VALOR_CAPTURA
+        vivas &= ~captura
+        victoria = ~activos.any(axis=1) & vivas
+        valores[victoria] = VALOR_VICTORIA
+        vivas &= ~victoria
+        if not vivas.any():
+            break
+
+    if vivas.any():
+        # Sin final: fracción comida y cercanía al próximo punto
+        restantes = activos[vivas].sum(axis=1)
+        cercano = np.where(activos[vivas], matriz_p[pacman[vivas][:, None], celdas_puntos[None, :]],
+                           LEJOS).min(axis=1)
+        comida = 1.0 - restantes / max(puntos_raiz, 1)
+        valores[vivas] = 0.25 + 0.5 * comida + 0.25 / (1.0 + cercano)
+    return valores
+
+
+class NodoMCTS:
+    """Nodo del árbol: Pac-Man en una celda tras una secuencia de jugadas"""
+
+    __slots__ = ('jugada', 'padre', 'hijos', 'sin_explorar', 'visitas', 'valor')
+
+    def __init__(self, jugada: Optional[int], padre: Optional['NodoMCTS'], jugadas: Tuple[int, ...]):
+        self.jugada = jugada
+        self.padre = padre
+        self.hijos: Dict[int, 'NodoMCTS'] = {}
+        self.sin_explorar = list(jugadas)
+        self.visitas = 0
+        self.valor = 0.0
+
+    def seleccionar(self, exploracion: float) -> 'NodoMCTS':
+        """Hijo con mayor cota UCT"""
+        logaritmo = math.log(max(self.visitas, 1))
+        return max(self.hijos.values(),
+                   key=lambda h: h.valor / h.visitas + exploracion * math.sqrt(logaritmo / h.visitas))
+
+
+class ArbolMCTS:
+    """Un árbol de búsqueda desde una raíz fija"""
+
+    def __init__(self, raiz: EstadoCompacto, semilla: int = 0,
+                 exploracion: float = MCTS_EXPLORACION, lote: int = MCTS_LOTE,
+                 horizonte: int = MCTS_HORIZONTE, epsilon: float = MCTS_EPSILON,
+                 persecucion: float = MCTS_PERSECUCION):
+        """
+        Args:
+            raiz: Estado desde el que se busca (no se modifica)
+            semilla: Semilla de los sorteos del árbol y de las simulaciones
+            exploracion: Constante C de UCT
+            lote: Descensos por lote de simulaciones
+            horizonte: Rondas de cada simulación
+            epsilon: Probabilidad de paso al azar de Pac-Man simulado
+            persecucion: Probabilidad de que un fantasma simulado se acerque
+        """
+        self.estado = raiz.copia()
+        self.exploracion = exploracion
+        self.lote = lote
+        self.horizonte = horizonte
+        self.epsilon = epsilon
+        self.persecucion = persecucion
+        self.rng = random.Random(semilla)
+        self.rng_lotes = np.random.default_rng(semilla)
+
+        self.raiz = NodoMCTS(None, None, self.estado.jugadas_pacman())
+        self.celdas_puntos = np.array(sorted(self.estado.puntos), dtype=np.int64)
+        self.puntos_raiz = len(self.celdas_puntos)
+
+        self.nodos = 1
+        self.simulaciones = 0
+        self.lotes = 0
+
+    def _mover_fantasmas(self, estado: EstadoCompacto):
+        """Paso de todos los fantasmas con la política de simulación"""
+        distancias = estado.modelo.distancias_fantasma
+        pacman = estado.pacman
+        for k in range(len(estado.fantasmas)):
+            jugadas = estado.jugadas_fantasma(k)
+            if self.rng.random() < self.persecucion:
+                celda = min(jugadas, key=lambda c: distancias[c][pacman])
+            else:
+                celda = self.rng.choice(jugadas)
+            estado.mover_fantasma(k, celda)
+
+    def _descender(self) -> Tuple[NodoMCTS, EstadoCompacto, Optional[float]]:
+        """
+        Selección + expansión de un descenso (suma una visita en el camino como
+        pérdida virtual, para que los descensos del mismo lote se repartan)
+
+        Returns:
+            (hoja, estado al llegar, valor si la partida terminó en el árbol)
+        """
+        estado = self.estado.copia()
+        nodo = self.raiz
+        nodo.visitas += 1
+
+        while True:
+            if nodo.sin_explorar:
+                celda = nodo.sin_explorar.pop(self.rng.randrange(len(nodo.sin_explorar)))
+                expandir = True
+            else:
+                celda = nodo.seleccionar(self.exploracion).jugada
+                expandir = False
+
+            pacman_anterior = estado.pacman
+            fantasmas_anteriores = tuple(estado.fantasmas)
+            estado.mover_pacman(celda)
+            self._mover_fantasmas(estado)
+
+            if expandir:
+                hijo = NodoMCTS(celda, nodo, estado.jugadas_pacman())
+                nodo.hijos[celda] = hijo
+                self.nodos += 1
+            else:
+                hijo = nodo.hijos[celda]
+            nodo = hijo
+            nodo.visitas += 1
+
+            if estado.captura(pacman_anterior, fantasmas_anteriores):
+                return nodo, estado, VALOR_CAPTURA
+            if not estado.puntos:
+                return nodo, estado, VALOR_VICTORIA
+            if expandir:
+                return nodo, estado, None
+
+    def iterar_lote(self):
+        """Un lote de descensos, sus simulaciones juntas y la retropropagación"""
+        hojas: List[NodoMCTS] = []
+        valores: List[Optional[float]] = []
+        pendientes: List[int] = []
+        pacman, fantasmas, activos = [], [], []
+
+        for _ in range(self.lote):
+            hoja, estado, valor = self._descender()
+            hojas.append(hoja)
+            valores.append(valor)
+            if valor is None:
+                pendientes.append(len(hojas) - 1)
+                pacman.append(estado.pacman)
+                fantasmas.append(estado.fantasmas)
+                activos.append([celda in estado.puntos for celda in self.celdas_puntos])
+
+        if pendientes:
+            simulados = simular_lote(
+                self.estado.modelo, np.array(pacman, dtype=np.int64),
+                np.array(fantasmas, dtype=np.int64).reshape(len(pendientes), -1),
+                np.array(activos, dtype=bool).reshape(len(pendientes), -1),
+                self.celdas_puntos, self.puntos_raiz, self.horizonte, self.rng_lotes,
+                self.epsilon, self.persecucion)
+            for i, valor in zip(pendientes, simulados):
+                valores[i] = float(valor)
+            self.simulaciones += len(pendientes)
+
+        # Las visitas ya se sumaron al descender
+        for hoja, valor in zip(hojas, valores):
+            nodo = hoja
+            while nodo is not None:
+                nodo.valor += valor
+                nodo = nodo.padre
+        self.lotes += 1
+
+    def buscar_hasta(self, limite: float):
+        """
+        Itera lotes hasta el instante `limite` de time.monotonic (al menos uno).
+        Ese reloj es común a todos los procesos, así un plazo fijado en el
+        proceso principal vale igual en los del pool.
+        """
+        self.iterar_lote()
+        while time.monotonic() < limite:
+            self.iterar_lote()
+
+    def estadisticas_raiz(self) -> Dict[int, Tuple[int, float]]:
+        """Visitas y valor acumulado de cada jugada de la raíz"""
+        return {celda: (hijo.visitas, hijo.valor) for celda, hijo in self.raiz.hijos.items()}
+
+
+def _buscar_en_proceso(obstaculos: List, pacman: int, fantasmas: List[int], puntos: List[int],
+                       semilla: int, limite: float, parametros: Dict
+                       ) -> Tuple[Dict[int, Tuple[int, float]], int, int]:
+    """
+    Arma un árbol en un proceso del pool (el ModeloNivel queda en caché del
+    proceso) hasta el plazo `limite` de la jugada, en time.monotonic: la espera
+    en la cola y la deserialización se descuentan del presupuesto
+    """
+    modelo = modelo_para(obstaculos)
+    arbol = ArbolMCTS(EstadoCompacto(modelo, pacman, fantasmas, set(puntos)), semilla, **parametros)
+    arbol.buscar_hasta(limite)
+    return arbol.estadisticas_raiz(), arbol.nodos, arbol.simulaciones
+
+
+class AgenteMCTS:
+    """
+    Decide el próximo paso de Pac-Man con MCTS bajo un presupuesto fijo por
+    jugada. Con procesos > 1 se arman `procesos` árboles independientes (uno en
+    este proceso y el resto en un ProcessPoolExecutor) y gana la jugada con más
+    visitas sumadas.
+    """
+
+    modo = 'mcts'
+
+    def __init__(self, presupuesto_ms: float = PRESUPUESTO_JUGADA_MS,
+                 procesos: int = MCTS_PROCESOS, semilla: int = 0,
+                 exploracion: float = MCTS_EXPLORACION, lote: int = MCTS_LOTE,
+                 horizonte: int = MCTS_HORIZONTE, epsilon: float = MCTS_EPSILON,
+                 persecucion: float = MCTS_PERSECUCION):
+        """
+        Args:
+            presupuesto_ms: Tiempo por jugada
+            procesos: Árboles en paralelo (raíz paralela)
+            semilla: Semilla base (cada jugada y cada árbol usan una distinta)
+            exploracion, lote, horizonte, epsilon, persecucion: Ver ArbolMCTS
+        """
+        self.presupuesto_ms = presupuesto_ms
+        self.procesos = max(1, procesos)
+        self.semilla = semilla
+        self.parametros = {
+            'exploracion': exploracion,
+            'lote': lote,
+            'horizonte': horizonte,
+            'epsilon': epsilon,
+            'persecucion': persecucion,
+        }
+        self.pool: Optional[ProcessPoolExecutor] = None
+
+        # Estadísticas
+        self.jugadas = 0
+        self.nodos = 0
+        self.simulaciones = 0
+        self.tiempo = 0.0
+
+    @property
+    def simulaciones_por_segundo(self) -> float:
+        return self.simulaciones / self.tiempo if self.tiempo > 0 else 0.0
+
+    def decidir(self, entorno) -> Optional[Tuple[int, int]]:
+        """
+        Próximo paso de Pac-Man en un Entorno
+
+        Returns:
+            Dirección (dx, dy) o None si Pac-Man no puede moverse
+        """
+        modelo = modelo_para(entorno.obstaculos)
+        estado = EstadoCompacto.desde_entorno(entorno, modelo)
+        if not estado.puntos:
+            return None
+
+        celda = self.buscar(estado, entorno.obstaculos)
+        if celda is None or celda == estado.pacman:
+            return None
+        x, y = modelo.posicion(celda)
+        return x - entorno.pacman.pos[0], y - entorno.pacman.pos[1]
+
+    def buscar(self, estado: EstadoCompacto, obstaculos: Optional[List] = None) -> Optional[int]:
+        """
+        Busca desde `estado` durante el presupuesto
+
+        Args:
+            estado: Raíz (no se modifica)
+            obstaculos: Obstáculos del nivel, necesarios para los árboles en otros procesos
+
+        Returns:
+            Celda a la que conviene mover a Pac-Man
+        """
+        inicio = time.perf_counter()
+        # Plazo absoluto de la jugada, compartido con los procesos del pool
+        limite = time.monotonic() + self.presupuesto_ms / 1000.0
+        semilla = self.semilla + self.jugadas * self.procesos
+
+        futuros = []
+        if self.procesos > 1 and obstaculos is not None:
+            if self.pool is None:
+                self.pool = ProcessPoolExecutor(max_workers=self.procesos - 1)
+            futuros = [
+                self.pool.submit(_buscar_en_proceso, obstaculos, estado.pacman, list(estado.fantasmas),
+                                 sorted(estado.puntos), semilla + i, limite, self.parametros)
+                for i in range(1, self.procesos)
+            ]
+
+        arbol = ArbolMCTS(estado, semilla, **self.parametros)
+        arbol.buscar_hasta(limite)
+        visitas = {celda: conteo for celda, (conteo, _) in arbol.estadisticas_raiz().items()}
+        self.nodos += arbol.nodos
+        self.simulaciones += arbol.simulaciones
+
+        for futuro in futuros:
+            raiz, nodos, simulaciones = futuro.result()
+            for celda, (conteo, _) in raiz.items():
+                visitas[celda] = visitas.get(celda, 0) + conteo
+            self.nodos += nodos
+            self.simulaciones += simulaciones
+
+        self.jugadas += 1
+        self.tiempo += time.perf_counter() - inicio
+        if not visitas:
+            return None
+        return max(visitas, key=visitas.get)
+
+    def cerrar(self):
+        """Libera el pool de procesos"""
+        if self.pool is not None:
+            self.pool.shutdown(wait=True, cancel_futures=True)
+            self.pool = None
+
+    def resumen(self) -> Dict:
+        """Contadores acumulados de la búsqueda"""
+        return {
+            'modo': self.modo,
+            'jugadas': self.jugadas,
+            'nodos': self.nodos,
+            'tiempo': self.tiempo,
+            'nodos_por_segundo': self.nodos / self.tiempo if self.tiempo > 0 else 0.0,
+            'simulaciones': self.simulaciones,
+            'simulaciones_por_segundo': self.simulaciones_por_segundo,
+            'procesos': self.procesos
+        }
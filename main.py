@@ -1,11 +1,24 @@
 """
 Pac-Man con IA - Modo Pygame
 """
+import argparse
 from clases.entorno import Entorno
 from visualizacion.juego_pygame import JuegoPygame
 from config.niveles import NIVELES
 
 def main():
+    parser = argparse.ArgumentParser(description="Pac-Man con IA")
+    parser.add_argument('--perfilar', type=float, default=None, metavar='SEGUNDOS',
+                        help="Perfila por muestreo los primeros SEGUNDOS de juego")
+    parser.add_argument('--salida-perfil', default=None, metavar='ARCHIVO',
+                        help="Archivo collapsed-stack del perfil (por defecto perfil_<fecha>.folded)")
+    parser.add_argument('--rectangulos-sucios', action='store_true', default=None,
+                        help="Presenta solo las regiones que cambian en cada frame")
+    parser.add_argument('--planificacion-fantasmas', choices=['sincronica', 'por_tiempo', 'asincrona'],
+                        default=None,
+                        help="Búsquedas de los fantasmas en el tick, repartidas entre frames o en un pool")
+    args = parser.parse_args()
+
     print("="*60)
     print("PAC-MAN CON IA COMPETITIVA")
     print("="*60)
@@ -22,7 +35,9 @@ def main():
     print(f"✓ Grafo de visibilidad: {len(mundo.visibility_graph.grafo)} nodos\n")
 
     # Crear y ejecutar juego
-    juego = JuegoPygame(mundo)
+    juego = JuegoPygame(mundo, perfilar=args.perfilar, salida_perfil=args.salida_perfil,
+                        rectangulos_sucios=args.rectangulos_sucios,
+                        planificacion_fantasmas=args.planificacion_fantasmas)
     juego.ejecutar()
 
 if __name__ == "__main__":
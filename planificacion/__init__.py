@@ -4,5 +4,14 @@ Módulo de algoritmos de planificación topológica
 from .visibility_graph import VisibilityGraph
 from .busqueda_grafo import BusquedaEnGrafo
 from .diagrama_voronoi import DiagramaVoronoi
+from .estadisticas import EstadisticasBusqueda
+from .vista_grafo import VistaGrafoTemporal
+from .planificacion_por_tiempo import PlanificadorPorTiempo
+from .servicio_planificacion import ServicioPlanificacion
+from .politica_replanificacion import PoliticaReplanificacion
+from .tour_puntos import TourPuntos
+from .campo_amenaza import CampoAmenaza
 
-__all__ = ['VisibilityGraph', 'BusquedaEnGrafo', 'DiagramaVoronoi']
\ No newline at end of file
+__all__ = ['VisibilityGraph', 'BusquedaEnGrafo', 'DiagramaVoronoi', 'EstadisticasBusqueda',
+           'VistaGrafoTemporal', 'PlanificadorPorTiempo', 'ServicioPlanificacion',
+           'PoliticaReplanificacion', 'TourPuntos', 'CampoAmenaza']
@@ -1,8 +1,16 @@
 """
 Algoritmos de búsqueda sobre el grafo topológico
 """
-from typing import List, Tuple, Optional, Dict
+import time
+from typing import List, Tuple, Optional, Dict, Generator
 import numpy as np
+from planificacion.estadisticas import EstadisticasBusqueda
+from planificacion.vista_grafo import VistaGrafoTemporal
+
+
+# Lo que ceden las versiones reanudables en cada paso
+PASO_CONEXION = 'conexion'
+PASO_BUSQUEDA = 'busqueda'
 
 
 class BusquedaEnGrafo:
@@ -32,112 +40,380 @@ class BusquedaEnGrafo:
         return camino
 
     @staticmethod
-    def a_estrella_grafo(grafo: Dict, inicio: Tuple[int, int], objetivo: Tuple[int, int]) -> Optional[
+    def costo_camino(camino: List[Tuple[int, int]]) -> float:
+        """Longitud euclidiana total de un camino"""
+        return sum(
+            BusquedaEnGrafo.distancia_euclidiana(camino[i], camino[i + 1])
+            for i in range(len(camino) - 1)
+        )
+
+    @staticmethod
+    def a_estrella_grafo(grafo: Dict, inicio: Tuple[int, int], objetivo: Tuple[int, int],
+                         estadisticas: Optional[EstadisticasBusqueda] = None) -> Optional[
         List[Tuple[int, int]]]:
         """
         A* sobre el grafo de visibilidad
         """
-        if inicio not in grafo or objetivo not in grafo:
+        return _ejecutar(_AEstrella(grafo, inicio, objetivo), estadisticas)
+
+    @staticmethod
+    def a_estrella_pasos(grafo: Dict, inicio: Tuple[int, int], objetivo: Tuple[int, int],
+                         estadisticas: Optional[EstadisticasBusqueda] = None) -> Generator[
+        str, None, Optional[List[Tuple[int, int]]]]:
+        """
+        A* reanudable: cede el control después de cada expansión y
+        retorna el camino (o None) al terminar
+        """
+        return (yield from _ejecutar_pasos(_AEstrella(grafo, inicio, objetivo), estadisticas))
+
+    @staticmethod
+    def bpa_grafo(grafo: Dict, inicio: Tuple[int, int], objetivo: Tuple[int, int],
+                  estadisticas: Optional[EstadisticasBusqueda] = None) -> Optional[List[Tuple[int, int]]]:
+        """
+        Búsqueda Primero en Anchura sobre el grafo
+        """
+        return _ejecutar(_PrimeroEnFrontera(grafo, inicio, objetivo), estadisticas)
+
+    @staticmethod
+    def bpa_pasos(grafo: Dict, inicio: Tuple[int, int], objetivo: Tuple[int, int],
+                  estadisticas: Optional[EstadisticasBusqueda] = None) -> Generator[
+        str, None, Optional[List[Tuple[int, int]]]]:
+        """
+        BPA reanudable: cede el control después de cada expansión
+        """
+        return (yield from _ejecutar_pasos(_PrimeroEnFrontera(grafo, inicio, objetivo), estadisticas))
+
+    @staticmethod
+    def greedy_grafo(grafo: Dict, inicio: Tuple[int, int], objetivo: Tuple[int, int],
+                     estadisticas: Optional[EstadisticasBusqueda] = None) -> Optional[
+        List[Tuple[int, int]]]:
+        """
+        Búsqueda Greedy sobre el grafo
+        """
+        return _ejecutar(_PrimeroEnFrontera(grafo, inicio, objetivo, heuristica=True), estadisticas)
+
+    @staticmethod
+    def greedy_pasos(grafo: Dict, inicio: Tuple[int, int], objetivo: Tuple[int, int],
+                     estadisticas: Optional[EstadisticasBusqueda] = None) -> Generator[
+        str, None, Optional[List[Tuple[int, int]]]]:
+        """
+        Greedy reanudable: cede el control después de cada expansión
+        """
+        return (yield from _ejecutar_pasos(_PrimeroEnFrontera(grafo, inicio, objetivo, heuristica=True),
+                                           estadisticas))
+
+    @staticmethod
+    def _completar_estadisticas(estadisticas: EstadisticasBusqueda, algoritmo: str,
+                                camino: Optional[List[Tuple[int, int]]]):
+        """Algoritmo, resultado y costo del camino encontrado"""
+        estadisticas.algoritmo = algoritmo
+        estadisticas.encontrado = bool(camino)
+        if camino:
+            estadisticas.longitud_camino = len(camino)
+            estadisticas.costo_camino = BusquedaEnGrafo.costo_camino(camino)
+
+    @staticmethod
+    def _guardar_estadisticas(estadisticas: Optional[EstadisticasBusqueda], insertados: List,
+                              expandidos: List, frontera_maxima: int):
+        """Vuelca los contadores de una búsqueda en el registro de estadísticas"""
+        if estadisticas is None:
+            return
+        estadisticas.inserciones = len(insertados)
+        estadisticas.expansiones = len(expandidos)
+        estadisticas.frontera_maxima = frontera_maxima
+        estadisticas.nodos_visitados = insertados
+        estadisticas.nodos_expandidos = expandidos
+
+    @staticmethod
+    def buscar(grafo: Dict, algoritmo: str, inicio: Tuple[int, int],
+               objetivo: Tuple[int, int],
+               estadisticas: Optional[EstadisticasBusqueda] = None) -> Optional[List[Tuple[int, int]]]:
+        """
+        Ejecuta el algoritmo indicado ('bpa', 'greedy' o 'a_star') sobre el grafo.
+        Si se pasa un registro de estadísticas, también mide tiempo y costo del camino.
+        """
+        if algoritmo not in ALGORITMOS:
             return None
 
-        if inicio == objetivo:
-            return [inicio]
+        if estadisticas is None:
+            return ALGORITMOS[algoritmo](grafo, inicio, objetivo)
+
+        inicio_tiempo = time.perf_counter()
+        camino = ALGORITMOS[algoritmo](grafo, inicio, objetivo, estadisticas)
+        estadisticas.tiempo_busqueda = time.perf_counter() - inicio_tiempo
+        BusquedaEnGrafo._completar_estadisticas(estadisticas, algoritmo, camino)
+        return camino
+
+    @staticmethod
+    def buscar_pasos(grafo: Dict, algoritmo: str, inicio: Tuple[int, int],
+                     objetivo: Tuple[int, int],
+                     estadisticas: Optional[EstadisticasBusqueda] = None) -> Generator[
+        str, None, Optional[List[Tuple[int, int]]]]:
+        """
+        Versión reanudable de buscar. No mide tiempos: quien avanza el generador
+        sabe cuánto tiempo le dedica a cada paso.
+        """
+        if algoritmo not in ALGORITMOS_PASOS:
+            return None
+
+        camino = yield from ALGORITMOS_PASOS[algoritmo](grafo, inicio, objetivo, estadisticas)
+        if estadisticas is not None:
+            BusquedaEnGrafo._completar_estadisticas(estadisticas, algoritmo, camino)
+        return camino
+
+    @staticmethod
+    def planificar_ruta(planificador, algoritmo: str, inicio: Tuple[int, int],
+                        objetivo: Tuple[int, int],
+                        estadisticas: Optional[EstadisticasBusqueda] = None) -> Optional[List[Tuple[int, int]]]:
+        """
+        Busca una ruta entre dos posiciones arbitrarias de un planificador
+        (VisibilityGraph o DiagramaVoronoi), conectándolas como puntos temporales
+
+        Args:
+            planificador: Planificador con grafo y puntos temporales
+            algoritmo: Algoritmo de búsqueda ('bpa', 'greedy', 'a_star')
+            inicio: Posición inicial
+            objetivo: Posición objetivo
+            estadisticas: Registro opcional a llenar (incluye el tiempo de conexión)
+
+        Returns:
+            Lista de posiciones del camino o None si no existe
+        """
+        inicio_conexion = time.perf_counter()
+
+        # Solo se eliminan después los puntos que realmente se agregaron
+        agregado_inicio = planificador.agregar_punto_temporal(inicio)
+        agregado_objetivo = planificador.agregar_punto_temporal(objetivo)
+        tiempo_conexion = time.perf_counter() - inicio_conexion
+
+        camino = BusquedaEnGrafo.buscar(planificador.grafo, algoritmo, inicio, objetivo, estadisticas)
+
+        inicio_desconexion = time.perf_counter()
+        if agregado_inicio:
+            planificador.eliminar_punto_temporal(inicio)
+        if agregado_objetivo:
+            planificador.eliminar_punto_temporal(objetivo)
+
+        if estadisticas is not None:
+            estadisticas.tiempo_conexion = tiempo_conexion + time.perf_counter() - inicio_desconexion
+
+        return camino
+
+    @staticmethod
+    def planificar_ruta_pasos(planificador, algoritmo: str, inicio: Tuple[int, int],
+                              objetivo: Tuple[int, int],
+                              estadisticas: Optional[EstadisticasBusqueda] = None) -> Generator[
+        str, None, Optional[List[Tuple[int, int]]]]:
+        """
+        Versión reanudable de planificar_ruta que no modifica el planificador:
+        las conexiones de los puntos temporales se evalúan de a una (cediendo
+        PASO_CONEXION) y la búsqueda corre sobre una VistaGrafoTemporal.
+
+        Returns:
+            Lista de posiciones del camino o None si no existe
+        """
+        temporales = {}
+        for punto in (inicio, objetivo):
+            if punto in planificador.grafo or punto in temporales:
+                continue
+            # El objetivo también puede conectarse con el inicio temporal
+            candidatos = list(planificador.grafo.keys()) + list(temporales.keys())
+            vecinos = []
+            for nodo, conecta in planificador.vecinos_temporales(punto, candidatos):
+                if conecta:
+                    vecinos.append(nodo)
+                yield PASO_CONEXION
+            temporales[punto] = vecinos
+
+        vista = VistaGrafoTemporal(planificador.grafo, temporales)
+        return (yield from BusquedaEnGrafo.buscar_pasos(vista, algoritmo, inicio, objetivo, estadisticas))
 
-        abiertos = [inicio]
-        cerrados = set()
 
-        g_score = {inicio: 0}
-        f_score = {inicio: BusquedaEnGrafo.distancia_euclidiana(inicio, objetivo)}
-        padres = {}
+class _Busqueda:
+    """
+    Estado de una búsqueda en curso. avanzar(maximo) expande hasta `maximo`
+    nodos: la versión sincrónica lo llama una vez sin límite y la reanudable
+    de a un nodo, cediendo entre llamadas, así ambas comparten el algoritmo.
+    """
+
+    __slots__ = ('grafo', 'inicio', 'objetivo', 'camino', 'trivial', 'buscando',
+                 'insertados', 'expandidos', 'frontera_maxima')
+
+    def __init__(self, grafo: Dict, inicio: Tuple[int, int], objetivo: Tuple[int, int]):
+        self.grafo = grafo
+        self.inicio = inicio
+        self.objetivo = objetivo
+        self.camino: Optional[List[Tuple[int, int]]] = None
+
+        # Casos triviales: se resuelven sin buscar ni reportar contadores
+        self.trivial = inicio not in grafo or objetivo not in grafo or inicio == objetivo
+        self.buscando = not self.trivial
+        if inicio in grafo and inicio == objetivo:
+            self.camino = [inicio]
+
+        # Contadores de trabajo (solo se reportan si se pidieron estadísticas)
+        self.insertados = [inicio]
+        self.expandidos = []
+        self.frontera_maxima = 1
+
+    def avanzar(self, maximo: Optional[int] = None) -> bool:
+        """
+        Expande nodos hasta terminar o hasta `maximo` expansiones
+
+        Returns:
+            True si la búsqueda sigue
+        """
+        raise NotImplementedError
+
+    def guardar_estadisticas(self, estadisticas: Optional[EstadisticasBusqueda]):
+        """Vuelca los contadores al terminar (no en los casos triviales)"""
+        if not self.trivial:
+            BusquedaEnGrafo._guardar_estadisticas(estadisticas, self.insertados, self.expandidos,
+                                                  self.frontera_maxima)
+
+
+class _AEstrella(_Busqueda):
+    """A*: expande el nodo abierto de menor f = g + distancia al objetivo"""
+
+    __slots__ = ('abiertos', 'cerrados', 'g_score', 'f_score', 'padres')
+
+    def __init__(self, grafo: Dict, inicio: Tuple[int, int], objetivo: Tuple[int, int]):
+        super().__init__(grafo, inicio, objetivo)
+        self.abiertos = [inicio]
+        self.cerrados = set()
+        self.g_score = {inicio: 0}
+        self.f_score = {inicio: BusquedaEnGrafo.distancia_euclidiana(inicio, objetivo)}
+        self.padres = {}
+
+    def avanzar(self, maximo: Optional[int] = None) -> bool:
+        if not self.buscando:
+            return False
+
+        grafo, objetivo = self.grafo, self.objetivo
+        abiertos, cerrados = self.abiertos, self.cerrados
+        g_score, f_score, padres = self.g_score, self.f_score, self.padres
+        insertados, expandidos = self.insertados, self.expandidos
+        distancia = BusquedaEnGrafo.distancia_euclidiana
+        hechas = 0
 
         while abiertos:
             # Nodo con menor f_score
             actual = min(abiertos, key=lambda n: f_score.get(n, float('inf')))
 
             if actual == objetivo:
-                return BusquedaEnGrafo.reconstruir_camino(padres, inicio, objetivo)
+                self.camino = BusquedaEnGrafo.reconstruir_camino(padres, self.inicio, objetivo)
+                self.buscando = False
+                return False
 
             abiertos.remove(actual)
             cerrados.add(actual)
+            expandidos.append(actual)
 
             for vecino in grafo[actual]:
                 if vecino in cerrados:
                     continue
 
-                g_tentativo = g_score[actual] + BusquedaEnGrafo.distancia_euclidiana(actual, vecino)
+                g_tentativo = g_score[actual] + distancia(actual, vecino)
 
                 if vecino not in abiertos:
                     abiertos.append(vecino)
+                    insertados.append(vecino)
                 elif g_tentativo >= g_score.get(vecino, float('inf')):
                     continue
 
                 padres[vecino] = actual
                 g_score[vecino] = g_tentativo
-                f_score[vecino] = g_tentativo + BusquedaEnGrafo.distancia_euclidiana(vecino, objetivo)
+                f_score[vecino] = g_tentativo + distancia(vecino, objetivo)
 
-        return None
+            self.frontera_maxima = max(self.frontera_maxima, len(abiertos))
+            hechas += 1
+            if hechas == maximo:
+                return True
 
-    @staticmethod
-    def bpa_grafo(grafo: Dict, inicio: Tuple[int, int], objetivo: Tuple[int, int]) -> Optional[List[Tuple[int, int]]]:
-        """
-        Búsqueda Primero en Anchura sobre el grafo
-        """
-        if inicio not in grafo or objetivo not in grafo:
-            return None
+        self.buscando = False
+        return False
+
+
+class _PrimeroEnFrontera(_Busqueda):
+    """
+    BPA (cola FIFO) o Greedy (frontera ordenada por distancia al objetivo);
+    cada entrada de la frontera lleva su camino desde el inicio
+    """
+
+    __slots__ = ('heuristica', 'visitados', 'abiertos')
 
-        if inicio == objetivo:
-            return [inicio]
+    def __init__(self, grafo: Dict, inicio: Tuple[int, int], objetivo: Tuple[int, int],
+                 heuristica: bool = False):
+        super().__init__(grafo, inicio, objetivo)
+        self.heuristica = heuristica
+        self.visitados = set()
+        self.abiertos = [(inicio, [inicio])]
 
-        visitados = set()
-        cola = [(inicio, [inicio])]
+    def avanzar(self, maximo: Optional[int] = None) -> bool:
+        if not self.buscando:
+            return False
 
-        while cola:
-            actual, camino = cola.pop(0)
+        grafo, objetivo, heuristica = self.grafo, self.objetivo, self.heuristica
+        abiertos, visitados = self.abiertos, self.visitados
+        insertados, expandidos = self.insertados, self.expandidos
+        hechas = 0
+
+        while abiertos:
+            if heuristica:
+                # Ordenar por heurística (distancia al objetivo)
+                abiertos.sort(key=lambda x: BusquedaEnGrafo.distancia_euclidiana(x[0], objetivo))
+            actual, camino = abiertos.pop(0)
 
             if actual == objetivo:
-                return camino
+                self.camino = camino
+                self.buscando = False
+                return False
 
             if actual in visitados:
                 continue
 
             visitados.add(actual)
+            expandidos.append(actual)
 
             for vecino in grafo[actual]:
                 if vecino not in visitados:
-                    cola.append((vecino, camino + [vecino]))
+                    abiertos.append((vecino, camino + [vecino]))
+                    insertados.append(vecino)
 
-        return None
+            self.frontera_maxima = max(self.frontera_maxima, len(abiertos))
+            hechas += 1
+            if hechas == maximo:
+                return True
 
-    @staticmethod
-    def greedy_grafo(grafo: Dict, inicio: Tuple[int, int], objetivo: Tuple[int, int]) -> Optional[
-        List[Tuple[int, int]]]:
-        """
-        Búsqueda Greedy sobre el grafo
-        """
-        if inicio not in grafo or objetivo not in grafo:
-            return None
+        self.buscando = False
+        return False
 
-        if inicio == objetivo:
-            return [inicio]
 
-        visitados = set()
-        abiertos = [(inicio, [inicio])]
+def _ejecutar(busqueda: _Busqueda, estadisticas: Optional[EstadisticasBusqueda]) -> Optional[List[Tuple[int, int]]]:
+    """Corre una búsqueda hasta el final"""
+    busqueda.avanzar()
+    busqueda.guardar_estadisticas(estadisticas)
+    return busqueda.camino
 
-        while abiertos:
-            # Ordenar por heurística (distancia al objetivo)
-            abiertos.sort(key=lambda x: BusquedaEnGrafo.distancia_euclidiana(x[0], objetivo))
-            actual, camino = abiertos.pop(0)
 
-            if actual == objetivo:
-                return camino
+def _ejecutar_pasos(busqueda: _Busqueda, estadisticas: Optional[EstadisticasBusqueda]) -> Generator[
+        str, None, Optional[List[Tuple[int, int]]]]:
+    """Corre una búsqueda cediendo PASO_BUSQUEDA después de cada expansión"""
+    while busqueda.avanzar(1):
+        yield PASO_BUSQUEDA
+    busqueda.guardar_estadisticas(estadisticas)
+    return busqueda.camino
 
-            if actual in visitados:
-                continue
-
-            visitados.add(actual)
 
-            for vecino in grafo[actual]:
-                if vecino not in visitados:
-                    abiertos.append((vecino, camino + [vecino]))
+ALGORITMOS = {
+    "bpa": BusquedaEnGrafo.bpa_grafo,
+    "greedy": BusquedaEnGrafo.greedy_grafo,
+    "a_star": BusquedaEnGrafo.a_estrella_grafo,
+}
 
-        return None
\ No newline at end of file
+# Versiones reanudables (mismo núcleo _Busqueda), para la planificación repartida entre frames
+ALGORITMOS_PASOS = {
+    "bpa": BusquedaEnGrafo.bpa_pasos,
+    "greedy": BusquedaEnGrafo.greedy_pasos,
+    "a_star": BusquedaEnGrafo.a_estrella_pasos,
+}
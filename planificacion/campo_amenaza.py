@@ -0,0 +1,202 @@
+"""
+Campo de amenaza de los fantasmas
+Distancia de camino (en pasos de grilla, respetando paredes) desde cada celda
+al fantasma más cercano, calculada con un BFS multiorigen vectorizado sobre la
+grilla de ocupación. Las consultas de seguridad pasan a ser lecturas O(1) y
+Pac-Man puede planificar rutas con A* penalizando las celdas peligrosas.
+"""
+import heapq
+import time
+from typing import Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from planificacion.estadisticas import EstadisticasBusqueda
+from planificacion.grilla import construir_grilla_libre
+from config.configuracion import LIMITE, RADIO_AMENAZA, PESO_AMENAZA
+
+Punto = Tuple[int, int]
+
+# Movimientos 4-conexos (los de Pac-Man)
+DIRECCIONES = ((0, 1), (1, 0), (0, -1), (-1, 0))
+
+
+def bfs_multiorigen(transitable: np.ndarray, origenes: Iterable[Tuple[int, int]]) -> np.ndarray:
+    """
+    BFS 4-conexo desde varios orígenes a la vez, un frente completo por iteración
+
+    Args:
+        transitable: Grilla bool de celdas por las que se propaga
+        origenes: Índices (i, j) de la grilla
+
+    Returns:
+        Arreglo float con la distancia en pasos al origen más cercano (inf si no se alcanza)
+    """
+    distancias = np.full(transitable.shape, np.inf)
+    frontera = np.zeros(transitable.shape, dtype=bool)
+    for i, j in origenes:
+        frontera[i, j] = True
+    visitado = frontera.copy()
+
+    paso = 0
+    vecinos = np.empty_like(frontera)
+    while frontera.any():
+        distancias[frontera] = paso
+        vecinos[:] = False
+        vecinos[1:, :] |= frontera[:-1, :]
+        vecinos[:-1, :] |= frontera[1:, :]
+        vecinos[:, 1:] |= frontera[:, :-1]
+        vecinos[:, :-1] |= frontera[:, 1:]
+        frontera = vecinos & transitable & ~visitado
+        visitado |= frontera
+        paso += 1
+
+    return distancias
+
+
+class CampoAmenaza:
+    """
+    Distancia al fantasma más cercano para todas las celdas de un nivel.
+    `actualizar` se llama una vez por tick y solo recalcula si los fantasmas se movieron.
+    """
+
+    def __init__(self, obstaculos: List, limite: int = LIMITE,
+                 radio: float = RADIO_AMENAZA, peso: float = PESO_AMENAZA):
+        """
+        Args:
+            obstaculos: Obstáculos del nivel
+            limite: Coordenada máxima en cada eje
+            radio: Distancia (en pasos) a partir de la cual una celda no tiene peligro
+            peso: Costo extra de una celda junto a un fantasma en rutas_seguras
+        """
+        self.limite = limite
+        self.radio = radio
+        self.peso = peso
+
+        # Pac-Man no pisa obstáculos; los fantasmas recorren sus bordes
+        self.libre = construir_grilla_libre(obstaculos, limite)
+        self.transitable_fantasmas = construir_grilla_libre(obstaculos, limite, bordes_transitables=True)
+
+        self.distancias = np.full(self.libre.shape, np.inf)
+        self.costos = np.ones(self.libre.shape)
+        self._posiciones: Optional[Tuple[Punto, ...]] = None
+
+        self.recalculos = 0
+        self.tiempo_calculo = 0.0
+
+    def _indice(self, pos: Sequence[int]) -> Optional[Tuple[int, int]]:
+        i, j = pos[0] + self.limite, pos[1] + self.limite
+        lado = 2 * self.limite + 1
+        if 0 <= i < lado and 0 <= j < lado:
+            return i, j
+        return None
+
+    def actualizar(self, fantasmas: Iterable) -> bool:
+        """
+        Recalcula el campo para las posiciones actuales de los fantasmas
+
+        Returns:
+            True si hubo que recalcular
+        """
+        posiciones = tuple(f.get_pos_tuple() for f in fantasmas)
+        if posiciones == self._posiciones:
+            return False
+
+        inicio = time.perf_counter()
+        origenes = [indice for indice in map(self._indice, posiciones) if indice is not None]
+        self.distancias = bfs_multiorigen(self.transitable_fantasmas, origenes)
+
+        # Costo de pisar cada celda: 1 lejos de los fantasmas, hasta 1 + peso al lado;
+        # la celda de un fantasma no se puede pisar
+        peligro = np.clip((self.radio - self.distancias) / self.radio, 0.0, 1.0)
+        self.costos = 1.0 + self.peso * peligro
+        self.costos[self.distancias == 0] = np.inf
+
+        self._posiciones = posiciones
+        self.recalculos += 1
+        self.tiempo_calculo += time.perf_counter() - inicio
+        return True
+
+    def distancia(self, pos: Sequence[int]) -> float:
+        """Pasos hasta el fantasma más cercano (inf fuera del mundo o si ninguno llega)"""
+        indice = self._indice(pos)
+        if indice is None:
+            return float('inf')
+        return float(self.distancias[indice])
+
+    def es_seguro(self, pos: Sequence[int], margen: float) -> bool:
+        """True si ningún fantasma está a menos de `margen` pasos"""
+        return self.distancia(pos) >= margen
+
+    def costo(self, pos: Sequence[int]) -> float:
+        """Costo de pisar una celda en las rutas ponderadas"""
+        indice = self._indice(pos)
+        if indice is None:
+            return float('inf')
+        return float(self.costos[indice])
+
+    def ruta_segura(self, inicio: Punto, objetivo: Punto,
+                    estadisticas: Optional[EstadisticasBusqueda] = None) -> Optional[List[Punto]]:
+        """
+        A* 4-conexo sobre las celdas libres con costo 1 + peligro por celda
+        (la distancia Manhattan es admisible porque cada paso cuesta al menos 1)
+
+        Returns:
+            Celdas desde inicio hasta objetivo, o None si no hay ruta
+        """
+        indice_inicio = self._indice(inicio)
+        indice_objetivo = self._indice(objetivo)
+        if indice_inicio is None or indice_objetivo is None or not self.libre[indice_objetivo]:
+            return None
+
+        oi, oj = indice_objetivo
+        libre = self.libre
+        costos = self.costos
+        lado = libre.shape[0]
+
+        g = {indice_inicio: 0.0}
+        padres = {}
+        abiertos = [(abs(indice_inicio[0] - oi) + abs(indice_inicio[1] - oj), 0.0, indice_inicio)]
+        expansiones = 0
+        inserciones = 1
+        frontera_maxima = 1
+        encontrado = False
+
+        while abiertos:
+            _, g_actual, actual = heapq.heappop(abiertos)
+            if g_actual > g[actual]:
+                continue
+            if actual == indice_objetivo:
+                encontrado = True
+                break
+            expansiones += 1
+
+            i, j = actual
+            for di, dj in DIRECCIONES:
+                ni, nj = i + di, j + dj
+                if not (0 <= ni < lado and 0 <= nj < lado) or not libre[ni, nj]:
+                    continue
+                nuevo = g_actual + costos[ni, nj]
+                if nuevo < g.get((ni, nj), np.inf):
+                    g[(ni, nj)] = nuevo
+                    padres[(ni, nj)] = actual
+                    heapq.heappush(abiertos, (nuevo + abs(ni - oi) + abs(nj - oj), nuevo, (ni, nj)))
+                    inserciones += 1
+            frontera_maxima = max(frontera_maxima, len(abiertos))
+
+        camino = None
+        if encontrado:
+            camino = [indice_objetivo]
+            while camino[-1] != indice_inicio:
+                camino.append(padres[camino[-1]])
+            camino = [(i - self.limite, j - self.limite) for i, j in reversed(camino)]
+
+        if estadisticas is not None:
+            estadisticas.algoritmo = 'a_star'
+            estadisticas.expansiones = expansiones
+            estadisticas.inserciones = inserciones
+            estadisticas.frontera_maxima = frontera_maxima
+            estadisticas.encontrado = encontrado
+            if camino:
+                estadisticas.longitud_camino = len(camino)
+                estadisticas.costo_camino = float(g[indice_objetivo])
+
+        return camino
@@ -3,8 +3,10 @@ Diagrama de Voronoi - Planificación de caminos seguros
 Maximiza la distancia a los obstáculos
 """
 import numpy as np
-from typing import List, Tuple, Dict, Set
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 from clases.obstaculo import Obstaculo
+from planificacion.grilla import construir_grilla_libre
+from planificacion.rasterizacion import CacheRasterizacion
 
 
 class DiagramaVoronoi:
@@ -14,13 +16,15 @@ class DiagramaVoronoi:
     proporcionando rutas más seguras (aunque potencialmente más largas).
     """
 
-    def __init__(self, obstaculos: List[Obstaculo], limites: Tuple[int, int]):
+    def __init__(self, obstaculos: List[Obstaculo], limites: Tuple[int, int],
+                 silencioso: bool = False):
         """
         Inicializa el diagrama de Voronoi
 
         Args:
             obstaculos: Lista de obstáculos en el entorno
             limites: Tupla (limite_x, limite_y) del mundo
+            silencioso: Suprime los mensajes de construcción
         """
         self.obstaculos = obstaculos
         self.limites = limites
@@ -28,10 +32,18 @@ class DiagramaVoronoi:
         self.mapa_distancias: Dict[Tuple[int, int], float] = {}
         self.puntos_voronoi: Set[Tuple[int, int]] = set()
 
-        print(f"Construyendo Diagrama de Voronoi...")
+        if not silencioso:
+            print(f"Construyendo Diagrama de Voronoi...")
         self.construir_voronoi()
-        print(f"   ✓ {len(self.grafo)} nodos en el diagrama")
-        print(f"   ✓ {sum(len(vecinos) for vecinos in self.grafo.values()) // 2} conexiones")
+
+        # Celdas de cada arista para recorrer las rutas paso a paso
+        libre = construir_grilla_libre(obstaculos, limites[0], bordes_transitables=True)
+        self.rasterizacion = CacheRasterizacion(libre=libre, limite=limites[0])
+        self.rasterizacion.precalcular(self.grafo)
+
+        if not silencioso:
+            print(f"   ✓ {len(self.grafo)} nodos en el diagrama")
+            print(f"   ✓ {sum(len(vecinos) for vecinos in self.grafo.values()) // 2} conexiones")
 
     def distancia_punto_a_obstaculo(self, punto: Tuple[int, int],
                                     obstaculo: Obstaculo) -> float:
@@ -220,22 +232,45 @@ class DiagramaVoronoi:
                         if punto not in self.grafo[vecino]:
                             self.grafo[vecino].append(punto)
 
-    def agregar_punto_temporal(self, punto: Tuple[int, int]):
+    def agregar_punto_temporal(self, punto: Tuple[int, int]) -> bool:
         """
         Agrega un punto temporal al grafo (posición de agentes).
         Conecta el punto con nodos cercanos del diagrama.
 
         Args:
             punto: Coordenadas del punto temporal
+
+        Returns:
+            True si se agregó; False si ya era parte del grafo (no debe eliminarse)
         """
         if punto in self.grafo:
-            return  # Ya existe
+            return False  # Ya existe
+
+        vecinos = [nodo for nodo, conecta in self.vecinos_temporales(punto) if conecta]
+
+        self.grafo[punto] = vecinos
+        for nodo in vecinos:
+            self.grafo[nodo].append(punto)
+
+        return True
 
-        self.grafo[punto] = []
+    def vecinos_temporales(self, punto: Tuple[int, int],
+                           candidatos: Optional[List[Tuple[int, int]]] = None) -> Iterator[Tuple[Tuple[int, int], bool]]:
+        """
+        Evalúa de a uno los nodos con los que se conectaría un punto temporal,
+        sin modificar el grafo
+
+        Args:
+            punto: Punto temporal
+            candidatos: Nodos a evaluar (por defecto todos los del grafo)
+
+        Returns:
+            Iterador de (nodo, se_conecta)
+        """
         radio_conexion = 5.0  # Radio más amplio para puntos temporales
 
         # Conectar con nodos cercanos del diagrama
-        for nodo in list(self.grafo.keys()):
+        for nodo in (candidatos if candidatos is not None else list(self.grafo.keys())):
             if nodo == punto:
                 continue
 
@@ -244,11 +279,14 @@ class DiagramaVoronoi:
                 (nodo[1] - punto[1]) ** 2
             )
 
-            if distancia <= radio_conexion:
-                # Verificar que el camino sea seguro (clearance menor para conexión temporal)
-                if self.camino_seguro(punto, nodo, min_clearance=0.5):
-                    self.grafo[punto].append(nodo)
-                    self.grafo[nodo].append(punto)
+            # Verificar que el camino sea seguro (clearance menor para conexión temporal)
+            yield nodo, bool(distancia <= radio_conexion and self.camino_seguro(punto, nodo, min_clearance=0.5))
+
+    def segmento_valido(self, p1: Tuple[int, int], p2: Tuple[int, int]) -> bool:
+        """True si una ruta puede ir de p1 a p2 (arista del diagrama o conexión temporal segura)"""
+        if p1 == p2 or p2 in self.grafo.get(p1, ()):
+            return True
+        return self.camino_seguro(p1, p2, min_clearance=0.5)
 
     def eliminar_punto_temporal(self, punto: Tuple[int, int]):
         """
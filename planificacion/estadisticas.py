@@ -0,0 +1,45 @@
+"""
+Estadísticas de una búsqueda sobre el grafo de planificación
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+
+@dataclass
+class EstadisticasBusqueda:
+    """
+    Trabajo realizado por una búsqueda.
+    Los algoritmos de BusquedaEnGrafo lo llenan si se les pasa una instancia.
+    """
+    algoritmo: str = ''
+    metodo: str = ''
+    expansiones: int = 0
+    inserciones: int = 0
+    frontera_maxima: int = 0
+    longitud_camino: int = 0
+    costo_camino: float = 0.0
+    tiempo_busqueda: float = 0.0
+    tiempo_conexion: float = 0.0
+    encontrado: bool = False
+    nodos_visitados: List[Tuple[int, int]] = field(default_factory=list, repr=False)
+    nodos_expandidos: List[Tuple[int, int]] = field(default_factory=list, repr=False)
+
+    @property
+    def tiempo_total(self) -> float:
+        """Búsqueda más conexión/desconexión de puntos temporales"""
+        return self.tiempo_busqueda + self.tiempo_conexion
+
+    def a_dict(self) -> Dict:
+        """Convierte a diccionario serializable (sin las listas de nodos)"""
+        return {
+            'algoritmo': self.algoritmo,
+            'metodo': self.metodo,
+            'expansiones': self.expansiones,
+            'inserciones': self.inserciones,
+            'frontera_maxima': self.frontera_maxima,
+            'longitud_camino': self.longitud_camino,
+            'costo_camino': self.costo_camino,
+            'tiempo_busqueda': self.tiempo_busqueda,
+            'tiempo_conexion': self.tiempo_conexion,
+            'encontrado': self.encontrado,
+        }
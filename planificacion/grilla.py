@@ -0,0 +1,44 @@
+"""
+Grilla de ocupación del mundo discreto
+Traduce los obstáculos a un arreglo booleano indexado por celdas
+"""
+import numpy as np
+from typing import List, Tuple
+from clases.obstaculo import Obstaculo
+
+
+def construir_grilla_libre(obstaculos: List[Obstaculo], limite: int,
+                           bordes_transitables: bool = False) -> np.ndarray:
+    """
+    Construye la grilla de celdas libres del mundo [-limite, limite]²
+
+    Args:
+        obstaculos: Lista de obstáculos del nivel
+        limite: Coordenada máxima en cada eje
+        bordes_transitables: Solo bloquea el interior de los obstáculos (los
+            fantasmas recorren sus bordes siguiendo las rutas de los planificadores)
+
+    Returns:
+        Arreglo bool de forma (2*limite+1, 2*limite+1) indexado [x + limite, y + limite]
+    """
+    lado = 2 * limite + 1
+    coords = np.arange(-limite, limite + 1)
+    xs, ys = np.meshgrid(coords, coords, indexing='ij')
+    libre = np.ones((lado, lado), dtype=bool)
+
+    # Misma regla que Obstaculo.in_collission, aplicada a toda la grilla
+    for obs in obstaculos:
+        desp = obs.tam / 2
+        ox, oy = obs.pos
+        if bordes_transitables:
+            libre &= ~((np.abs(xs - ox) < desp) & (np.abs(ys - oy) < desp))
+        else:
+            libre &= ~((ox - desp <= xs) & (xs <= ox + desp) &
+                       (oy - desp <= ys) & (ys <= oy + desp))
+
+    return libre
+
+
+def celdas_libres(libre: np.ndarray, limite: int) -> List[Tuple[int, int]]:
+    """Lista de coordenadas del mundo de todas las celdas libres"""
+    return [(int(i) - limite, int(j) - limite) for i, j in zip(*np.nonzero(libre))]
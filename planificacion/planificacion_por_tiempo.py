@@ -0,0 +1,140 @@
+"""
+Planificación repartida en el tiempo con un presupuesto por frame
+Las búsquedas reanudables (BusquedaEnGrafo.planificar_ruta_pasos) avanzan
+de a un paso hasta agotar el presupuesto del frame y continúan en el siguiente
+"""
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Generator, Hashable, List, Optional, Tuple
+from planificacion.busqueda_grafo import BusquedaEnGrafo, PASO_CONEXION
+from planificacion.estadisticas import EstadisticasBusqueda
+
+Camino = Optional[List[Tuple[int, int]]]
+
+
+@dataclass
+class TareaPlanificacion:
+    """Búsqueda en curso y a quién avisarle cuando termine"""
+    pasos: Generator
+    al_terminar: Callable[[Camino, EstadisticasBusqueda], None]
+    estadisticas: EstadisticasBusqueda = field(default_factory=EstadisticasBusqueda)
+    frames: int = 0
+
+
+class PlanificadorPorTiempo:
+    """
+    Reparte un presupuesto de microsegundos por frame entre las búsquedas
+    pendientes, en ronda. Cada clave (p.ej. un fantasma) tiene a lo sumo una
+    búsqueda: pedir otra descarta la anterior por obsoleta.
+    """
+
+    # Pasos que avanza una tarea antes de ceder el turno a la siguiente
+    PASOS_POR_TURNO = 32
+
+    def __init__(self, presupuesto_us: float = 2000.0, tiempo: Callable[[], float] = time.perf_counter):
+        """
+        Args:
+            presupuesto_us: Microsegundos de planificación por frame
+            tiempo: Fuente de tiempo en segundos
+        """
+        self.presupuesto_us = presupuesto_us
+        self.tiempo = tiempo
+        self.tareas: "OrderedDict[Hashable, TareaPlanificacion]" = OrderedDict()
+
+        self.completadas = 0
+        self.descartadas = 0
+        self.pasos = 0
+
+    def solicitar(self, clave: Hashable, planificador, algoritmo: str,
+                  inicio: Tuple[int, int], objetivo: Tuple[int, int],
+                  al_terminar: Callable[[Camino, EstadisticasBusqueda], None], metodo: str = ''):
+        """
+        Encola una búsqueda entre dos posiciones
+
+        Args:
+            clave: Dueño de la búsqueda (reemplaza la pendiente con la misma clave)
+            planificador: VisibilityGraph o DiagramaVoronoi (no se modifica)
+            algoritmo: 'bpa', 'greedy' o 'a_star'
+            inicio: Posición inicial
+            objetivo: Posición objetivo
+            al_terminar: Recibe (camino o None, estadísticas) al completar
+            metodo: Nombre del método para las estadísticas
+        """
+        if clave in self.tareas:
+            self.descartadas += 1
+            del self.tareas[clave]
+
+        estadisticas = EstadisticasBusqueda(metodo=metodo)
+        pasos = BusquedaEnGrafo.planificar_ruta_pasos(planificador, algoritmo, inicio, objetivo, estadisticas)
+        self.tareas[clave] = TareaPlanificacion(pasos, al_terminar, estadisticas)
+
+    def pendiente(self, clave: Hashable) -> bool:
+        """True si la clave tiene una búsqueda en curso"""
+        return clave in self.tareas
+
+    def cancelar(self, clave: Optional[Hashable] = None):
+        """Descarta la búsqueda de una clave (o todas si no se indica)"""
+        if clave is None:
+            self.descartadas += len(self.tareas)
+            self.tareas.clear()
+        elif self.tareas.pop(clave, None) is not None:
+            self.descartadas += 1
+
+    def ejecutar(self, presupuesto_us: Optional[float] = None) -> int:
+        """
+        Avanza las búsquedas pendientes hasta agotar el presupuesto
+
+        Args:
+            presupuesto_us: Presupuesto de este frame (por defecto el configurado)
+
+        Returns:
+            Cantidad de búsquedas completadas en este frame
+        """
+        if not self.tareas:
+            return 0
+
+        presupuesto = (presupuesto_us if presupuesto_us is not None else self.presupuesto_us) / 1e6
+        ahora = self.tiempo()
+        limite = ahora + presupuesto
+        completadas = 0
+
+        for tarea in self.tareas.values():
+            tarea.frames += 1
+
+        while self.tareas and ahora < limite:
+            clave, tarea = next(iter(self.tareas.items()))
+            estadisticas = tarea.estadisticas
+            terminada = False
+            camino = None
+
+            for _ in range(self.PASOS_POR_TURNO):
+                try:
+                    tipo = next(tarea.pasos)
+                except StopIteration as fin:
+                    camino = fin.value
+                    terminada = True
+                    tipo = None
+
+                # El tiempo de cada paso se atribuye a su fase
+                despues = self.tiempo()
+                if tipo == PASO_CONEXION:
+                    estadisticas.tiempo_conexion += despues - ahora
+                else:
+                    estadisticas.tiempo_busqueda += despues - ahora
+                ahora = despues
+                self.pasos += 1
+
+                if terminada or ahora >= limite:
+                    break
+
+            if terminada:
+                del self.tareas[clave]
+                self.completadas += 1
+                completadas += 1
+                tarea.al_terminar(camino, estadisticas)
+            else:
+                # Ronda: la tarea pasa al final de la cola
+                self.tareas.move_to_end(clave)
+
+        return completadas
@@ -0,0 +1,141 @@
+"""
+Política de replanificación bajo demanda para los fantasmas
+En lugar de replanificar solo al agotar la trayectoria (o en cada tick), decide
+por fantasma entre seguir la ruta vigente, extenderla desde su final hasta la
+nueva posición de Pac-Man o replanificar desde cero, y cuenta cada decisión.
+"""
+import math
+from collections import Counter
+from typing import Dict, List, Sequence, Tuple
+from config.configuracion import UMBRAL_REPLANIFICACION, SEGMENTOS_VALIDADOS
+
+Punto = Tuple[int, int]
+
+# Acciones
+SEGUIR = 'seguir'
+EXTENDER = 'extender'
+REPLANIFICAR = 'replanificar'
+
+# Motivos (claves de los contadores)
+MOTIVO_VIGENTE = 'vigente'          # La ruta sigue sirviendo: no se planifica
+MOTIVO_EXTENSION = 'extension'      # Ruta por agotarse y Pac-Man cerca del objetivo
+MOTIVO_SIN_RUTA = 'sin_ruta'        # No hay ruta (o no hay objetivo registrado)
+MOTIVO_DESVIO = 'desvio'            # Pac-Man se alejó más del umbral del objetivo
+MOTIVO_INVALIDA = 'invalida'        # La ruta no parte del fantasma o un tramo dejó de ser válido
+
+
+class PoliticaReplanificacion:
+    """
+    Decide cuándo vale la pena planificar. Reglas, en orden:
+      1. Sin ruta u objetivo registrado -> replanificar
+      2. La ruta no empieza en el fantasma o sus próximos tramos no son
+         válidos para su planificador -> replanificar
+      3. Pac-Man está a más de `umbral` del objetivo planificado -> replanificar
+      4. A la ruta le queda a lo sumo un paso y Pac-Man ya no está en su
+         final -> extender desde el final
+      5. En otro caso -> seguir
+    """
+
+    def __init__(self, umbral: float = UMBRAL_REPLANIFICACION,
+                 segmentos_validados: int = SEGMENTOS_VALIDADOS):
+        """
+        Args:
+            umbral: Distancia entre Pac-Man y el objetivo planificado que obliga a replanificar
+            segmentos_validados: Tramos de la ruta (desde el fantasma) que se verifican
+        """
+        self.umbral = umbral
+        self.segmentos_validados = segmentos_validados
+
+        self.motivos: Counter = Counter()
+        self.tiempo_planificacion: Dict[str, float] = {EXTENDER: 0.0, REPLANIFICAR: 0.0}
+        self.fallidas = 0
+
+    def ruta_valida(self, fantasma, planificador) -> bool:
+        """
+        True si la ruta parte del fantasma y sus próximos tramos siguen siendo
+        válidos (aristas del grafo en O(grado); el resto con el criterio de
+        conexión temporal del planificador). Los pasos de una celda salen de
+        aristas rasterizadas ya validadas y no se vuelven a verificar.
+        """
+        trayectoria = fantasma.trayectoria
+        if trayectoria[0] != fantasma.get_pos_tuple():
+            return False
+
+        anterior = trayectoria[0]
+        for i in range(1, min(len(trayectoria), self.segmentos_validados + 1)):
+            siguiente = trayectoria[i]
+            paso_celda = abs(siguiente[0] - anterior[0]) + abs(siguiente[1] - anterior[1]) == 1
+            if not paso_celda and not planificador.segmento_valido(anterior, siguiente):
+                return False
+            anterior = siguiente
+        return True
+
+    def decidir(self, fantasma, pacman_pos: List[int], visibility_graph,
+                voronoi_diagram) -> Tuple[str, str]:
+        """
+        Returns:
+            (acción, motivo)
+        """
+        if not fantasma.trayectoria or fantasma.objetivo_plan is None:
+            return REPLANIFICAR, MOTIVO_SIN_RUTA
+
+        if not self.ruta_valida(fantasma, fantasma.planificador(visibility_graph, voronoi_diagram)):
+            return REPLANIFICAR, MOTIVO_INVALIDA
+
+        objetivo = fantasma.objetivo_plan
+        desvio = math.hypot(pacman_pos[0] - objetivo[0], pacman_pos[1] - objetivo[1])
+        if desvio > self.umbral:
+            return REPLANIFICAR, MOTIVO_DESVIO
+
+        if len(fantasma.trayectoria) <= 2 and desvio > 0:
+            return EXTENDER, MOTIVO_EXTENSION
+
+        return SEGUIR, MOTIVO_VIGENTE
+
+    def aplicar(self, fantasma, pacman_pos: List[int], visibility_graph, voronoi_diagram,
+                obstaculos: Sequence) -> str:
+        """
+        Decide y, si corresponde, planifica (de forma sincrónica)
+
+        Returns:
+            Acción tomada; el costo queda en fantasma.tiempo_calculo
+        """
+        accion, motivo = self.decidir(fantasma, pacman_pos, visibility_graph, voronoi_diagram)
+        self.motivos[motivo] += 1
+
+        if accion == SEGUIR:
+            return accion
+
+        if accion == EXTENDER:
+            exito = fantasma.extender_persecucion(pacman_pos, visibility_graph, voronoi_diagram)
+        else:
+            exito = fantasma.perseguir_pacman(pacman_pos, visibility_graph, voronoi_diagram, obstaculos)
+
+        self.tiempo_planificacion[accion] += fantasma.tiempo_calculo
+        if not exito:
+            self.fallidas += 1
+        return accion
+
+    @property
+    def planificaciones(self) -> int:
+        """Búsquedas lanzadas (extensiones + replanificaciones)"""
+        return sum(n for motivo, n in self.motivos.items() if motivo != MOTIVO_VIGENTE)
+
+    def resumen(self) -> Dict:
+        """Contadores para ajustar el umbral (calidad de persecución vs. costo)"""
+        decisiones = sum(self.motivos.values())
+        return {
+            'umbral': self.umbral,
+            'decisiones': decisiones,
+            'motivos': dict(self.motivos),
+            'planificaciones': self.planificaciones,
+            'fallidas': self.fallidas,
+            'tasa_reutilizacion': self.motivos[MOTIVO_VIGENTE] / decisiones if decisiones else 0.0,
+            'tiempo_extension': self.tiempo_planificacion[EXTENDER],
+            'tiempo_replanificacion': self.tiempo_planificacion[REPLANIFICAR],
+        }
+
+    def reiniciar_contadores(self):
+        self.motivos.clear()
+        self.tiempo_planificacion = {EXTENDER: 0.0, REPLANIFICAR: 0.0}
+        self.fallidas = 0
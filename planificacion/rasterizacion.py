@@ -0,0 +1,243 @@
+"""
+Rasterización de aristas en celdas de la grilla
+Los caminos de los planificadores son secuencias de vértices que pueden estar a
+varias celdas de distancia. Cada arista se convierte una sola vez en la secuencia
+de celdas 4-conexas que recorre, así los agentes avanzan una celda por paso
+(como Pac-Man) sin cálculos geométricos durante el movimiento.
+"""
+from array import array
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+
+Punto = Tuple[int, int]
+Celdas = Tuple[Punto, ...]
+
+
+def rasterizar_segmento(p1: Punto, p2: Punto) -> Celdas:
+    """
+    Celdas 4-conexas del segmento p1 -> p2 (sin p1, con p2). En cada paso se
+    avanza en el eje cuyo próximo borde de celda cruza antes la recta.
+
+    Returns:
+        Tupla de celdas (vacía si p1 == p2)
+    """
+    x, y = p1
+    dx, dy = p2[0] - x, p2[1] - y
+    nx, ny = abs(dx), abs(dy)
+    sx = 1 if dx > 0 else -1
+    sy = 1 if dy > 0 else -1
+
+    celdas = []
+    ix = iy = 0
+    while ix < nx or iy < ny:
+        # (0.5 + ix) / nx < (0.5 + iy) / ny, en enteros
+        if iy >= ny or (ix < nx and (1 + 2 * ix) * ny < (1 + 2 * iy) * nx):
+            x += sx
+            ix += 1
+        else:
+            y += sy
+            iy += 1
+        celdas.append((x, y))
+
+    return tuple(celdas)
+
+
+def _transitable(libre: np.ndarray, limite: int, celda: Punto) -> bool:
+    x, y = celda
+    return -limite <= x <= limite and -limite <= y <= limite and bool(libre[x + limite, y + limite])
+
+
+def _escalera_libre(p1: Punto, p2: Punto, libre: np.ndarray, limite: int) -> Optional[Celdas]:
+    """
+    Escalera p1 -> p2 (solo pasos hacia p2) que no pisa celdas bloqueadas. En
+    cada paso se prefiere el eje de rasterizar_segmento y se toma el otro
+    cuando el preferido no permite llegar a p2.
+
+    Returns:
+        Tupla de celdas, o None si ninguna escalera evita los obstáculos
+    """
+    dx, dy = p2[0] - p1[0], p2[1] - p1[1]
+    nx, ny = abs(dx), abs(dy)
+    sx = 1 if dx > 0 else -1
+    sy = 1 if dy > 0 else -1
+
+    # alcanza[i][j]: desde el desplazamiento (i, j) se llega a p2 por celdas libres
+    alcanza = [[False] * (ny + 2) for _ in range(nx + 2)]
+    alcanza[nx][ny] = True
+    for i in range(nx, -1, -1):
+        for j in range(ny, -1, -1):
+            if (i, j) == (nx, ny):
+                continue
+            celda = (p1[0] + sx * i, p1[1] + sy * j)
+            if (i, j) != (0, 0) and not _transitable(libre, limite, celda):
+                continue
+            alcanza[i][j] = alcanza[i + 1][j] or alcanza[i][j + 1]
+
+    if not alcanza[0][0]:
+        return None
+
+    celdas = []
+    ix = iy = 0
+    while ix < nx or iy < ny:
+        en_x = iy >= ny or (ix < nx and (1 + 2 * ix) * ny < (1 + 2 * iy) * nx)
+        if en_x and not alcanza[ix + 1][iy]:
+            en_x = False
+        elif not en_x and not alcanza[ix][iy + 1]:
+            en_x = True
+        if en_x:
+            ix += 1
+        else:
+            iy += 1
+        celdas.append((p1[0] + sx * ix, p1[1] + sy * iy))
+
+    return tuple(celdas)
+
+
+def _desvio_libre(p1: Punto, p2: Punto, libre: np.ndarray, limite: int) -> Optional[Celdas]:
+    """
+    Camino 4-conexo más corto p1 -> p2 por celdas libres (BFS), para aristas
+    sin escalera libre
+
+    Returns:
+        Tupla de celdas (sin p1, con p2), o None si p2 no es alcanzable
+    """
+    padres: Dict[Punto, Optional[Punto]] = {p1: None}
+    cola = deque([p1])
+    while cola:
+        celda = cola.popleft()
+        if celda == p2:
+            camino = []
+            while celda != p1:
+                camino.append(celda)
+                celda = padres[celda]
+            return tuple(reversed(camino))
+        x, y = celda
+        for vecino in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if vecino not in padres and (vecino == p2 or _transitable(libre, limite, vecino)):
+                padres[vecino] = celda
+                cola.append(vecino)
+    return None
+
+
+def rasterizar_segmento_libre(p1: Punto, p2: Punto, libre: np.ndarray, limite: int) -> Celdas:
+    """
+    rasterizar_segmento sin entrar en celdas bloqueadas de `libre` (los
+    extremos siempre se aceptan: algunos vértices quedan sobre obstáculos).
+    Si la escalera de la recta pisa un obstáculo se busca otra escalera libre
+    y, si no la hay, el desvío libre más corto.
+
+    Args:
+        libre: Grilla de construir_grilla_libre, indexada [x + limite, y + limite]
+        limite: Coordenada máxima en cada eje
+
+    Returns:
+        Tupla de celdas (vacía si p1 == p2)
+    """
+    celdas = rasterizar_segmento(p1, p2)
+    if all(_transitable(libre, limite, c) for c in celdas[:-1]):
+        return celdas
+    alternativa = _escalera_libre(p1, p2, libre, limite)
+    if alternativa is None:
+        alternativa = _desvio_libre(p1, p2, libre, limite)
+    # Sin camino libre (p2 encerrado) se conserva la recta
+    return alternativa if alternativa is not None else celdas
+
+
+class CacheRasterizacion:
+    """
+    Celdas de cada arista, guardadas por par de extremos. Las aristas del grafo
+    se precalculan al construir el planificador; las de los puntos temporales
+    (posiciones de agentes) se agregan al usarlas y se descartan al superar
+    `capacidad_temporales`. Con una grilla `libre` las celdas evitan los obstáculos.
+
+    Las aristas precalculadas se guardan una vez por arista no dirigida, con las
+    coordenadas de todas seguidas en un arreglo plano de enteros: una tupla de
+    tuplas por arista ocupaba unas 50 veces más que el grafo de visibilidad.
+    """
+
+    def __init__(self, capacidad_temporales: int = 20000,
+                 libre: Optional[np.ndarray] = None, limite: int = 0):
+        """
+        Args:
+            capacidad_temporales: Aristas no precalculadas guardadas antes de vaciarlas
+            libre: Grilla de celdas transitables (None = solo la recta)
+            limite: Coordenada máxima de la grilla en cada eje
+        """
+        self.capacidad_temporales = capacidad_temporales
+        self.libre = libre
+        self.limite = limite
+        # Arista (extremo menor, extremo mayor) -> índice en _inicios
+        self.aristas: Dict[Tuple[Punto, Punto], int] = {}
+        # x, y de las celdas de cada arista precalculada, una a continuación de otra
+        self._coordenadas = array('h')
+        # Inicio de cada arista en _coordenadas (la última entrada es el total)
+        self._inicios = array('l', [0])
+        self.temporales: Dict[Tuple[Punto, Punto], Celdas] = {}
+
+        self.aciertos = 0
+        self.fallos = 0
+
+    def precalcular(self, grafo: Dict[Punto, Iterable[Punto]]):
+        """Rasteriza todas las aristas de un grafo de adyacencia"""
+        for nodo, vecinos in grafo.items():
+            for vecino in vecinos:
+                clave = (nodo, vecino) if nodo <= vecino else (vecino, nodo)
+                if clave not in self.aristas:
+                    self.aristas[clave] = len(self._inicios) - 1
+                    for celda in self.rasterizar(*clave):
+                        self._coordenadas.extend(celda)
+                    self._inicios.append(len(self._coordenadas))
+
+    def rasterizar(self, p1: Punto, p2: Punto) -> Celdas:
+        """Celdas de p1 -> p2, evitando obstáculos si hay grilla"""
+        if self.libre is None:
+            return rasterizar_segmento(p1, p2)
+        return rasterizar_segmento_libre(p1, p2, self.libre, self.limite)
+
+    def celdas(self, p1: Punto, p2: Punto) -> Celdas:
+        """
+        Celdas de la arista p1 -> p2 (sin p1, con p2). Se guarda una sola
+        dirección; la otra se obtiene invirtiéndola, así ambos sentidos
+        recorren las mismas celdas.
+        """
+        invertida = p2 < p1
+        clave = (p2, p1) if invertida else (p1, p2)
+
+        indice = self.aristas.get(clave)
+        if indice is not None:
+            planas = iter(self._coordenadas[self._inicios[indice]:self._inicios[indice + 1]])
+            celdas = tuple(zip(planas, planas))
+        else:
+            celdas = self.temporales.get(clave)
+        if celdas is None:
+            self.fallos += 1
+            if len(self.temporales) >= self.capacidad_temporales:
+                self.temporales = {}
+            celdas = self.rasterizar(*clave)
+            self.temporales[clave] = celdas
+        else:
+            self.aciertos += 1
+
+        if not invertida:
+            return celdas
+        # Guardada como p2 -> p1: las celdas intermedias al revés, terminando en p2
+        return celdas[-2::-1] + (p2,)
+
+    def expandir(self, camino: List[Punto]) -> List[Punto]:
+        """
+        Camino de vértices -> camino de celdas adyacentes
+
+        Returns:
+            Lista que empieza en el primer vértice y avanza una celda por paso
+        """
+        if len(camino) < 2:
+            return list(camino)
+
+        resultado = [tuple(camino[0])]
+        for i in range(1, len(camino)):
+            resultado.extend(self.celdas(resultado[-1], tuple(camino[i])))
+        return resultado
+
+    def __len__(self) -> int:
+        return len(self.aristas) + len(self.temporales)
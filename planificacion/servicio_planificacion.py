@@ -0,0 +1,267 @@
+"""
+Servicio de planificación asíncrona
+Las búsquedas se resuelven en un pool de hilos o de procesos sobre
+instantáneas inmutables de los planificadores; los resultados se aplican
+desde el hilo del juego en un tick posterior (aplicar_resultados)
+"""
+import copy
+import itertools
+import os
+import pickle
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, List, Optional, Set, Tuple
+from planificacion.busqueda_grafo import BusquedaEnGrafo, PASO_CONEXION
+from planificacion.estadisticas import EstadisticasBusqueda
+
+Camino = Optional[List[Tuple[int, int]]]
+
+MODO_HILOS = 'hilos'
+MODO_PROCESOS = 'procesos'
+
+# Respuesta de un proceso que todavía no recibió la versión pedida
+FALTA_INSTANTANEA = 'falta_instantanea'
+
+# Versiones que conserva cada proceso (dos planificadores por nivel más margen)
+MAX_INSTANTANEAS_TRABAJADOR = 8
+
+# Instantáneas ya recibidas por este proceso: versión -> planificador
+_instantaneas_trabajador: Dict[int, object] = {}
+
+
+def instantanea(planificador):
+    """
+    Copia de solo lectura de un planificador: las listas de adyacencia pasan a
+    tuplas (agregar puntos temporales sobre ella falla en lugar de corromperla)
+    y el resto de los contenedores se copian para no compartir estado mutable.
+    """
+    copia = copy.copy(planificador)
+    for nombre, valor in vars(planificador).items():
+        if isinstance(valor, (dict, list, set)):
+            setattr(copia, nombre, copy.copy(valor))
+    copia.grafo = {nodo: tuple(vecinos) for nodo, vecinos in planificador.grafo.items()}
+    return copia
+
+
+def resolver_plan(planificador, algoritmo: str, inicio: Tuple[int, int], objetivo: Tuple[int, int],
+                  metodo: str = '') -> Tuple[Camino, EstadisticasBusqueda]:
+    """
+    Resuelve una búsqueda sin modificar el planificador (se ejecuta en el pool)
+
+    Returns:
+        (camino o None, estadísticas con tiempos de conexión y de búsqueda)
+    """
+    estadisticas = EstadisticasBusqueda(metodo=metodo)
+    pasos = BusquedaEnGrafo.planificar_ruta_pasos(planificador, algoritmo, inicio, objetivo, estadisticas)
+
+    ahora = time.perf_counter()
+    while True:
+        try:
+            tipo = next(pasos)
+        except StopIteration as fin:
+            estadisticas.tiempo_busqueda += time.perf_counter() - ahora
+            return fin.value, estadisticas
+
+        despues = time.perf_counter()
+        if tipo == PASO_CONEXION:
+            estadisticas.tiempo_conexion += despues - ahora
+        else:
+            estadisticas.tiempo_busqueda += despues - ahora
+        ahora = despues
+
+
+def iniciar_trabajador():
+    """Inicializador del pool de procesos: cada proceso arranca sin instantáneas"""
+    _instantaneas_trabajador.clear()
+
+
+def resolver_plan_remoto(version: int, datos: Optional[bytes], algoritmo: str,
+                         inicio: Tuple[int, int], objetivo: Tuple[int, int], metodo: str = ''):
+    """
+    resolver_plan en un proceso del pool, sobre la instantánea cacheada de `version`
+
+    Args:
+        version: Clave de la instantánea
+        datos: Instantánea serializada, o None si ya debería estar en la caché
+
+    Returns:
+        (pid del proceso, resultado de resolver_plan), o (pid, FALTA_INSTANTANEA)
+        si el proceso no tiene la versión y no vinieron los datos
+    """
+    planificador = _instantaneas_trabajador.get(version)
+    if planificador is None:
+        if datos is None:
+            return os.getpid(), FALTA_INSTANTANEA
+        planificador = pickle.loads(datos)
+        if len(_instantaneas_trabajador) >= MAX_INSTANTANEAS_TRABAJADOR:
+            del _instantaneas_trabajador[min(_instantaneas_trabajador)]
+        _instantaneas_trabajador[version] = planificador
+    return os.getpid(), resolver_plan(planificador, algoritmo, inicio, objetivo, metodo)
+
+
+@dataclass
+class Instantanea:
+    """Instantánea vigente de un planificador"""
+    original: object            # Se guarda para que su id no se reutilice
+    copia: object
+    version: int
+    datos: Optional[bytes]      # Serializada una vez (solo en modo procesos)
+
+
+@dataclass
+class SolicitudPlan:
+    """Pedido en vuelo de un agente"""
+    futuro: Future
+    al_terminar: Callable[[Camino, EstadisticasBusqueda], None]
+    inicio: Tuple[int, int]
+    objetivo: Tuple[int, int]
+    instantanea: Optional[Instantanea] = None
+    argumentos: Tuple = ()
+
+
+class ServicioPlanificacion:
+    """
+    Misma interfaz que PlanificadorPorTiempo (solicitar / pendiente / cancelar),
+    pero el trabajo corre fuera del hilo del juego. Cada clave tiene a lo sumo un
+    pedido vigente: uno nuevo reemplaza al anterior, cuyo resultado se descarta.
+    """
+
+    def __init__(self, modo: str = MODO_HILOS, trabajadores: int = 1):
+        """
+        Args:
+            modo: 'hilos' (comparte las instantáneas en memoria) o 'procesos'
+                (cada instantánea se serializa una vez y cada proceso la recibe
+                una sola vez por versión)
+            trabajadores: Tamaño del pool
+        """
+        self.modo = modo
+        self.trabajadores = trabajadores
+        if modo == MODO_PROCESOS:
+            self.pool: Executor = ProcessPoolExecutor(max_workers=trabajadores,
+                                                      initializer=iniciar_trabajador)
+        else:
+            self.pool = ThreadPoolExecutor(max_workers=trabajadores, thread_name_prefix="planificacion")
+
+        self.solicitudes: Dict[Hashable, SolicitudPlan] = {}
+        # Instantánea vigente por planificador
+        self._instantaneas: Dict[int, Instantanea] = {}
+        self._versiones = itertools.count()
+        # Procesos que confirmaron tener cada versión
+        self._receptores: Dict[int, Set[int]] = {}
+
+        self.completadas = 0
+        self.descartadas = 0
+        self.reenvios = 0
+
+    def _instantanea(self, planificador) -> Instantanea:
+        """Instantánea vigente del planificador, con su versión y sus datos serializados"""
+        clave = id(planificador)
+        if clave not in self._instantaneas:
+            copia = instantanea(planificador)
+            datos = pickle.dumps(copia, pickle.HIGHEST_PROTOCOL) if self.modo == MODO_PROCESOS else None
+            self._instantaneas[clave] = Instantanea(planificador, copia, next(self._versiones), datos)
+        return self._instantaneas[clave]
+
+    def instantanea(self, planificador):
+        """Instantánea (cacheada) del planificador"""
+        return self._instantanea(planificador).copia
+
+    def solicitar(self, clave: Hashable, planificador, algoritmo: str,
+                  inicio: Tuple[int, int], objetivo: Tuple[int, int],
+                  al_terminar: Callable[[Camino, EstadisticasBusqueda], None], metodo: str = ''):
+        """
+        Envía una búsqueda al pool
+
+        Args:
+            clave: Dueño del pedido (reemplaza el vigente con la misma clave)
+            planificador: VisibilityGraph o DiagramaVoronoi (se usa su instantánea)
+            algoritmo: 'bpa', 'greedy' o 'a_star'
+            inicio: Posición inicial
+            objetivo: Posición objetivo
+            al_terminar: Recibe (camino o None, estadísticas) en aplicar_resultados
+            metodo: Nombre del método para las estadísticas
+        """
+        self.cancelar(clave)
+        vigente = self._instantanea(planificador)
+        if self.modo != MODO_PROCESOS:
+            futuro = self.pool.submit(resolver_plan, vigente.copia, algoritmo, inicio, objetivo, metodo)
+            self.solicitudes[clave] = SolicitudPlan(futuro, al_terminar, inicio, objetivo)
+            return
+
+        # Los datos viajan hasta que todos los procesos confirmaron la versión;
+        # si igual llega a uno que no la tiene, responde FALTA_INSTANTANEA y
+        # el pedido se reenvía con los datos
+        argumentos = (algoritmo, inicio, objetivo, metodo)
+        receptores = self._receptores.get(vigente.version, ())
+        datos = vigente.datos if len(receptores) < self.trabajadores else None
+        futuro = self.pool.submit(resolver_plan_remoto, vigente.version, datos, *argumentos)
+        self.solicitudes[clave] = SolicitudPlan(futuro, al_terminar, inicio, objetivo,
+                                                vigente, argumentos)
+
+    def pendiente(self, clave: Hashable) -> bool:
+        """True si la clave tiene un pedido sin aplicar"""
+        return clave in self.solicitudes
+
+    def cancelar(self, clave: Optional[Hashable] = None):
+        """Descarta el pedido de una clave (o todos si no se indica)"""
+        claves = list(self.solicitudes) if clave is None else [clave]
+        for c in claves:
+            solicitud = self.solicitudes.pop(c, None)
+            if solicitud is not None:
+                solicitud.futuro.cancel()  # Si ya está corriendo, el resultado se ignora
+                self.descartadas += 1
+
+    def invalidar_instantaneas(self):
+        """Olvida las instantáneas (nuevo nivel) y descarta los pedidos en vuelo"""
+        self.cancelar()
+        self._instantaneas.clear()
+        self._receptores.clear()
+
+    def aplicar_resultados(self) -> int:
+        """
+        Entrega los pedidos terminados a sus callbacks, en el hilo que llama.
+        Nunca espera a los que siguen en curso.
+
+        Returns:
+            Cantidad de resultados aplicados
+        """
+        listas = [c for c, s in self.solicitudes.items() if s.futuro.done()]
+        aplicados = 0
+        for clave in listas:
+            solicitud = self.solicitudes.pop(clave)
+            resultado = solicitud.futuro.result()
+            if solicitud.instantanea is not None:
+                pid, resultado = resultado
+                if resultado != FALTA_INSTANTANEA:
+                    self._receptores.setdefault(solicitud.instantanea.version, set()).add(pid)
+            if resultado == FALTA_INSTANTANEA:
+                # Vuelve al pool con los datos; se aplica en un tick posterior
+                self.reenvios += 1
+                vigente = solicitud.instantanea
+                solicitud.futuro = self.pool.submit(resolver_plan_remoto, vigente.version,
+                                                    vigente.datos, *solicitud.argumentos)
+                self.solicitudes[clave] = solicitud
+                continue
+            camino, estadisticas = resultado
+            self.completadas += 1
+            aplicados += 1
+            solicitud.al_terminar(camino, estadisticas)
+        return aplicados
+
+    def ejecutar(self, presupuesto_us: Optional[float] = None) -> int:
+        """Compatibilidad con PlanificadorPorTiempo: el trabajo ya corre en el pool"""
+        return self.aplicar_resultados()
+
+    def cerrar(self):
+        """Cancela lo pendiente y libera el pool"""
+        self.cancelar()
+        # Los hilos pueden terminar su búsqueda en curso por su cuenta; los
+        # procesos se esperan para cerrar sus tuberías de forma ordenada
+        self.pool.shutdown(wait=self.modo == MODO_PROCESOS, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
@@ -0,0 +1,250 @@
+"""
+Planificador de recorrido de puntos (modo automático de Pac-Man)
+Construye una vez por nivel la matriz de distancias de camino más corto entre
+los puntos (y la posición inicial) sobre un planificador, ordena la visita con
+inserción más cercana + 2-opt (con reubicación de puntos, or-opt) y repara el
+orden a medida que se comen puntos.
+"""
+import heapq
+import math
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from planificacion.busqueda_grafo import BusquedaEnGrafo
+from planificacion.vista_grafo import VistaGrafoTemporal
+
+Punto = Tuple[int, int]
+
+# Costo de los pares sin camino (finito para que las sumas del 2-opt no den nan)
+INALCANZABLE = 1e6
+
+
+def dijkstra(grafo, origen: Punto) -> Tuple[Dict[Punto, float], Dict[Punto, Punto]]:
+    """
+    Distancias euclidianas de camino más corto desde `origen` a todo el grafo
+
+    Returns:
+        (distancias, padres) para reconstruir los caminos
+    """
+    distancias = {origen: 0.0}
+    padres: Dict[Punto, Punto] = {}
+    abiertos = [(0.0, origen)]
+
+    while abiertos:
+        distancia, nodo = heapq.heappop(abiertos)
+        if distancia > distancias[nodo]:
+            continue
+        for vecino in grafo[nodo]:
+            nueva = distancia + math.hypot(vecino[0] - nodo[0], vecino[1] - nodo[1])
+            if nueva < distancias.get(vecino, math.inf):
+                distancias[vecino] = nueva
+                padres[vecino] = nodo
+                heapq.heappush(abiertos, (nueva, vecino))
+
+    return distancias, padres
+
+
+class TourPuntos:
+    """
+    Orden de visita de los puntos de un nivel. El índice 0 es la posición
+    inicial de Pac-Man; el recorrido es abierto (no vuelve al inicio) y parte
+    siempre del último lugar conocido de Pac-Man (`ancla`).
+    """
+
+    def __init__(self, planificador, puntos: Sequence[Punto], inicio: Punto,
+                 max_pasadas_2opt: int = 50, guardar_caminos: bool = True):
+        """
+        Args:
+            planificador: VisibilityGraph o DiagramaVoronoi (no se modifica)
+            puntos: Posiciones de los puntos a recolectar
+            inicio: Posición actual de Pac-Man
+            max_pasadas_2opt: Tope de pasadas completas de 2-opt por optimización
+            guardar_caminos: Conserva los árboles de Dijkstra para `ruta` (no
+                hacen falta si las rutas se calculan de otra forma, p. ej. rutas seguras)
+        """
+        self.max_pasadas_2opt = max_pasadas_2opt
+        self.guardar_caminos = guardar_caminos
+
+        # Posiciones únicas (dos puntos en la misma celda se comen juntos)
+        self.nodos: List[Punto] = [tuple(inicio)]
+        for punto in puntos:
+            punto = tuple(punto)
+            if punto not in self.nodos:
+                self.nodos.append(punto)
+        self.indices: Dict[Punto, int] = {nodo: i for i, nodo in enumerate(self.nodos)}
+
+        self.mejoras_2opt = 0  # Movimientos de 2-opt / reubicación aplicados
+        self.reparaciones = 0
+
+        inicio_t = time.perf_counter()
+        self.distancias, self._padres = self._matriz_distancias(planificador)
+        self.tiempo_matriz = time.perf_counter() - inicio_t
+
+        inicio_t = time.perf_counter()
+        self.ancla = 0
+        self.orden: List[int] = self._insercion_mas_cercana()
+        self._dos_opt()
+        self.tiempo_orden = time.perf_counter() - inicio_t
+
+    def _matriz_distancias(self, planificador) -> Tuple[np.ndarray, Optional[List[Dict[Punto, Punto]]]]:
+        """
+        Conecta los nodos al grafo como puntos temporales (una sola vez) y
+        corre un Dijkstra desde cada uno (los padres solo si guardar_caminos)
+        """
+        temporales: Dict[Punto, List[Punto]] = {}
+        for nodo in self.nodos:
+            if nodo in planificador.grafo:
+                continue
+            candidatos = list(planificador.grafo.keys()) + list(temporales.keys())
+            temporales[nodo] = [vecino for vecino, conecta
+                                in planificador.vecinos_temporales(nodo, candidatos) if conecta]
+        vista = VistaGrafoTemporal(planificador.grafo, temporales)
+
+        n = len(self.nodos)
+        distancias = np.full((n, n), INALCANZABLE)
+        padres = []
+        for i, origen in enumerate(self.nodos):
+            alcanzados, padres_origen = dijkstra(vista, origen)
+            if self.guardar_caminos:
+                padres.append(padres_origen)
+            for j, destino in enumerate(self.nodos):
+                if destino in alcanzados:
+                    distancias[i, j] = alcanzados[destino]
+
+        return distancias, padres if self.guardar_caminos else None
+
+    def _insercion_mas_cercana(self) -> List[int]:
+        """Orden inicial: se agrega el punto más cercano al recorrido en su mejor posición"""
+        d = self.distancias
+        pendientes = set(range(1, len(self.nodos)))
+        recorrido = [0]
+        # Distancia de cada pendiente al recorrido
+        cercania = {j: d[0, j] for j in pendientes}
+
+        while pendientes:
+            elegido = min(pendientes, key=lambda j: (cercania[j], j))
+            pendientes.remove(elegido)
+
+            # Al final del recorrido abierto solo se suma la arista de llegada
+            mejor_pos, mejor_costo = len(recorrido), d[recorrido[-1], elegido]
+            for pos in range(1, len(recorrido)):
+                a, b = recorrido[pos - 1], recorrido[pos]
+                costo = d[a, elegido] + d[elegido, b] - d[a, b]
+                if costo < mejor_costo:
+                    mejor_pos, mejor_costo = pos, costo
+            recorrido.insert(mejor_pos, elegido)
+
+            for j in pendientes:
+                cercania[j] = min(cercania[j], d[elegido, j])
+
+        return recorrido[1:]
+
+    def _dos_opt(self):
+        """
+        Invierte tramos del recorrido mientras acorten el camino (el ancla queda
+        fija); cada pasada además prueba reubicar puntos sueltos (or-opt)
+        """
+        d = self.distancias
+        recorrido = [self.ancla] + self.orden
+        n = len(recorrido)
+
+        for _ in range(self.max_pasadas_2opt):
+            mejoro = self._reubicar(recorrido)
+            for i in range(1, n - 1):
+                for j in range(i + 1, n):
+                    a, b = recorrido[i - 1], recorrido[i]
+                    c = recorrido[j]
+                    antes = d[a, b]
+                    despues = d[a, c]
+                    if j + 1 < n:
+                        e = recorrido[j + 1]
+                        antes += d[c, e]
+                        despues += d[b, e]
+                    if despues < antes - 1e-9:
+                        recorrido[i:j + 1] = recorrido[i:j + 1][::-1]
+                        self.mejoras_2opt += 1
+                        mejoro = True
+            if not mejoro:
+                break
+
+        self.orden = recorrido[1:]
+
+    def _reubicar(self, recorrido: List[int]) -> bool:
+        """Mueve cada punto a la posición donde más acorta el recorrido (en el lugar)"""
+        d = self.distancias
+        mejoro = False
+
+        for i in range(1, len(recorrido)):
+            nodo = recorrido[i]
+            anterior = recorrido[i - 1]
+            siguiente = recorrido[i + 1] if i + 1 < len(recorrido) else None
+            # Ahorro de sacarlo de su lugar
+            ahorro = d[anterior, nodo]
+            if siguiente is not None:
+                ahorro += d[nodo, siguiente] - d[anterior, siguiente]
+
+            resto = recorrido[:i] + recorrido[i + 1:]
+            mejor_pos, mejor_costo = None, ahorro - 1e-9
+            for pos in range(1, len(resto) + 1):
+                a = resto[pos - 1]
+                if pos < len(resto):
+                    b = resto[pos]
+                    costo = d[a, nodo] + d[nodo, b] - d[a, b]
+                else:
+                    costo = d[a, nodo]
+                if costo < mejor_costo:
+                    mejor_pos, mejor_costo = pos, costo
+
+            if mejor_pos is not None:
+                resto.insert(mejor_pos, nodo)
+                recorrido[:] = resto
+                self.mejoras_2opt += 1
+                mejoro = True
+
+        return mejoro
+
+    def recolectar(self, punto: Punto) -> bool:
+        """
+        Reparación incremental al comer un punto: se quita del orden (sus
+        vecinos quedan enlazados), pasa a ser el ancla y se vuelve a aplicar
+        2-opt sobre lo que queda
+
+        Returns:
+            True si el punto era parte del recorrido
+        """
+        indice = self.indices.get(tuple(punto))
+        if indice is None or indice not in self.orden:
+            return False
+
+        self.orden.remove(indice)
+        self.ancla = indice
+        self.reparaciones += 1
+        if len(self.orden) > 2:
+            self._dos_opt()
+        return True
+
+    def siguientes(self) -> List[Punto]:
+        """Posiciones de los puntos pendientes, en orden de visita"""
+        return [self.nodos[i] for i in self.orden]
+
+    def costo(self) -> float:
+        """Longitud del recorrido pendiente desde el ancla"""
+        recorrido = [self.ancla] + self.orden
+        return float(sum(self.distancias[recorrido[i], recorrido[i + 1]]
+                         for i in range(len(recorrido) - 1)))
+
+    def ruta(self, desde: Punto, hasta: Punto) -> Optional[List[Punto]]:
+        """
+        Camino ya calculado entre dos nodos del recorrido (sin búsqueda)
+
+        Returns:
+            Lista de vértices o None si alguno no es nodo del recorrido, no hay
+            camino o el tour no guarda caminos
+        """
+        if self._padres is None:
+            return None
+        i = self.indices.get(tuple(desde))
+        j = self.indices.get(tuple(hasta))
+        if i is None or j is None or self.distancias[i, j] >= INALCANZABLE:
+            return None
+        return BusquedaEnGrafo.reconstruir_camino(self._padres[i], self.nodos[i], self.nodos[j])
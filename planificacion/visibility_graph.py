@@ -2,8 +2,10 @@
 Construye un grafo de visibilidad para planificación de movimientos
 """
 import numpy as np
-from typing import List, Tuple, Set, Dict
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 from clases.obstaculo import Obstaculo
+from planificacion.grilla import construir_grilla_libre
+from planificacion.rasterizacion import CacheRasterizacion
 
 
 class VisibilityGraph:
@@ -17,6 +19,11 @@ class VisibilityGraph:
         self.grafo: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
         self.construir_grafo()
 
+        # Celdas de cada arista para recorrer las rutas paso a paso
+        libre = construir_grilla_libre(obstaculos, limites[0], bordes_transitables=True)
+        self.rasterizacion = CacheRasterizacion(libre=libre, limite=limites[0])
+        self.rasterizacion.precalcular(self.grafo)
+
     def obtener_vertices_obstaculos(self) -> List[Tuple[int, int]]:
         """
         Obtiene todos los vértices de los obstáculos cuadrados
@@ -156,20 +163,44 @@ class VisibilityGraph:
                     self.grafo[v1].append(v2)
                     self.grafo[v2].append(v1)
 
-    def agregar_punto_temporal(self, punto: Tuple[int, int]):
+    def agregar_punto_temporal(self, punto: Tuple[int, int]) -> bool:
         """
         Agrega un punto temporal al grafo (posición de Pac-Man o fantasmas)
+        Retorna False si el punto ya era parte del grafo (no debe eliminarse luego)
         """
         if punto in self.grafo:
-            return  # Ya existe
+            return False  # Ya existe
+
+        vecinos = [v for v, conecta in self.vecinos_temporales(punto) if conecta]
+
+        self.grafo[punto] = vecinos
+        for vertice in vecinos:
+            self.grafo[vertice].append(punto)
 
-        self.grafo[punto] = []
+        return True
+
+    def vecinos_temporales(self, punto: Tuple[int, int],
+                           candidatos: Optional[List[Tuple[int, int]]] = None) -> Iterator[Tuple[Tuple[int, int], bool]]:
+        """
+        Evalúa de a uno los nodos con los que se conectaría un punto temporal,
+        sin modificar el grafo (conecta con todos los nodos visibles)
 
-        # Conectar con todos los nodos visibles
-        for vertice in list(self.grafo.keys()):
-            if vertice != punto and self.es_visible(punto, vertice):
-                self.grafo[punto].append(vertice)
-                self.grafo[vertice].append(punto)
+        Args:
+            punto: Punto temporal
+            candidatos: Nodos a evaluar (por defecto todos los del grafo)
+
+        Returns:
+            Iterador de (nodo, se_conecta)
+        """
+        for vertice in (candidatos if candidatos is not None else list(self.grafo.keys())):
+            if vertice != punto:
+                yield vertice, self.es_visible(punto, vertice)
+
+    def segmento_valido(self, p1: Tuple[int, int], p2: Tuple[int, int]) -> bool:
+        """True si una ruta puede ir de p1 a p2 (arista del grafo o puntos visibles)"""
+        if p1 == p2 or p2 in self.grafo.get(p1, ()):
+            return True
+        return self.es_visible(p1, p2)
 
     def eliminar_punto_temporal(self, punto: Tuple[int, int]):
         """
@@ -0,0 +1,51 @@
+"""
+Vista de solo lectura de un grafo con puntos temporales agregados
+Permite buscar entre posiciones arbitrarias sin modificar el grafo del
+planificador (que puede estar compartido con otras búsquedas en curso)
+"""
+from typing import Dict, Iterator, List, Tuple
+
+Punto = Tuple[int, int]
+
+
+class VistaGrafoTemporal:
+    """
+    Se comporta como el diccionario de adyacencia del planificador para las
+    búsquedas (`in`, `[]`), sumando las aristas de los puntos temporales.
+    """
+
+    def __init__(self, grafo: Dict[Punto, List[Punto]], temporales: Dict[Punto, List[Punto]]):
+        """
+        Args:
+            grafo: Adyacencia del planificador (no se modifica; admite listas o tuplas)
+            temporales: Vecinos de cada punto temporal (pueden incluir otros temporales)
+        """
+        self.grafo = grafo
+        self.temporales = temporales
+
+        # Aristas inversas: nodos del grafo (o temporales) que ganan un vecino temporal
+        self._inversas: Dict[Punto, List[Punto]] = {}
+        for punto, vecinos in temporales.items():
+            for vecino in vecinos:
+                self._inversas.setdefault(vecino, []).append(punto)
+
+    def __contains__(self, nodo: Punto) -> bool:
+        return nodo in self.temporales or nodo in self.grafo
+
+    def __getitem__(self, nodo: Punto) -> List[Punto]:
+        if nodo in self.temporales:
+            vecinos = self.temporales[nodo]
+        else:
+            vecinos = self.grafo[nodo]
+        extra = self._inversas.get(nodo)
+        return [*vecinos, *extra] if extra else vecinos
+
+    def __iter__(self) -> Iterator[Punto]:
+        yield from self.grafo
+        yield from (p for p in self.temporales if p not in self.grafo)
+
+    def __len__(self) -> int:
+        return len(self.grafo) + sum(1 for p in self.temporales if p not in self.grafo)
+
+    def keys(self):
+        return list(self)
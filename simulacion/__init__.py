@@ -0,0 +1,12 @@
+"""
+Módulo de simulación headless (sin pygame)
+"""
+from .motor_headless import MotorHeadless, ResultadoEpisodio
+from .torneo import Torneo
+from .entorno_vectorizado import EntornoVectorizado
+from .entorno_multiproceso import EntornoMultiproceso
+from .reloj import RelojSimulacion
+from .eventos import SimuladorEventos
+
+__all__ = ['MotorHeadless', 'ResultadoEpisodio', 'Torneo', 'EntornoVectorizado',
+           'EntornoMultiproceso', 'RelojSimulacion', 'SimuladorEventos']
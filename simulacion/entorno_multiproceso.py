@@ -0,0 +1,179 @@
+"""
+Entorno vectorizado repartido entre procesos trabajadores
+Acciones y observaciones se intercambian por memoria compartida
+"""
+import multiprocessing as mp
+import numpy as np
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+from clases.entorno import CONFIGURACIONES_FANTASMAS
+from config.niveles import NIVELES
+from simulacion.entorno_vectorizado import EntornoVectorizado
+
+
+# Separación entre las semillas de cada trabajador
+SALTO_SEMILLA_TRABAJADOR = 1_000_000
+
+
+def _crear_vista(shm: shared_memory.SharedMemory, forma: Tuple, dtype) -> np.ndarray:
+    """Arreglo NumPy sobre un bloque de memoria compartida"""
+    return np.ndarray(forma, dtype=dtype, buffer=shm.buf)
+
+
+def _trabajador(conexion, especificaciones: Dict, inicio: int, fin: int, parametros: Dict):
+    """
+    Proceso trabajador: posee las partidas [inicio, fin) y responde a comandos
+    ('reset', 'step', 'cerrar') leyendo y escribiendo en memoria compartida
+    """
+    bloques = {nombre: shared_memory.SharedMemory(name=shm_nombre)
+               for nombre, (shm_nombre, _, _) in especificaciones.items()}
+    vistas = {nombre: _crear_vista(bloques[nombre], forma, dtype)[inicio:fin]
+              for nombre, (_, forma, dtype) in especificaciones.items()}
+
+    entorno = EntornoVectorizado(fin - inicio, **parametros)
+
+    try:
+        while True:
+            comando = conexion.recv()
+
+            if comando == 'step':
+                obs, recompensas, terminados = entorno.step(vistas['acciones'])
+                vistas['recompensas'][:] = recompensas
+                vistas['terminados'][:] = terminados
+            elif comando == 'reset':
+                obs = entorno.reset()
+            else:  # 'cerrar'
+                break
+
+            vistas['observaciones'][:] = obs
+            conexion.send(True)
+    finally:
+        del vistas
+        for bloque in bloques.values():
+            bloque.close()
+        conexion.close()
+
+
+class EntornoMultiproceso:
+    """
+    Misma API reset/step que EntornoVectorizado, pero cada proceso trabajador
+    posee una porción de las partidas. Por las tuberías solo viajan comandos;
+    acciones, observaciones, recompensas y terminados viven en memoria compartida.
+    """
+
+    def __init__(self, num_entornos: int, num_procesos: Optional[int] = None,
+                 nivel: int = 0, semilla: int = 0,
+                 configuraciones: Optional[List[Tuple[str, str]]] = None,
+                 max_pasos: int = 1000):
+        """
+        Args:
+            num_entornos: Número total K de partidas
+            num_procesos: Procesos trabajadores (por defecto todos los núcleos)
+            nivel: Índice del nivel
+            semilla: Semilla base (cada trabajador usa un rango disjunto)
+            configuraciones: (algoritmo, método) de cada fantasma (None = las 4 fijas)
+            max_pasos: Pasos tras los cuales una partida se trunca
+        """
+        self.num_entornos = num_entornos
+        self.num_procesos = max(1, min(num_procesos or mp.cpu_count(), num_entornos))
+
+        num_fantasmas = len(configuraciones) if configuraciones else len(CONFIGURACIONES_FANTASMAS)
+        num_puntos = NIVELES[nivel]['puntos']
+        dim_observacion = 2 + 2 * num_fantasmas + 3 * num_puntos
+
+        formas = {
+            'acciones': ((num_entornos,), np.int64),
+            'observaciones': ((num_entornos, dim_observacion), np.float32),
+            'recompensas': ((num_entornos,), np.float32),
+            'terminados': ((num_entornos,), np.bool_),
+        }
+
+        self._bloques: Dict[str, shared_memory.SharedMemory] = {}
+        especificaciones = {}
+        for nombre, (forma, dtype) in formas.items():
+            tamanio = max(1, int(np.prod(forma)) * np.dtype(dtype).itemsize)
+            bloque = shared_memory.SharedMemory(create=True, size=tamanio)
+            self._bloques[nombre] = bloque
+            especificaciones[nombre] = (bloque.name, forma, dtype)
+
+        self.acciones = _crear_vista(self._bloques['acciones'], *formas['acciones'])
+        self.observaciones = _crear_vista(self._bloques['observaciones'], *formas['observaciones'])
+        self.recompensas = _crear_vista(self._bloques['recompensas'], *formas['recompensas'])
+        self.terminados = _crear_vista(self._bloques['terminados'], *formas['terminados'])
+
+        # Repartir las partidas en porciones contiguas
+        limites = np.linspace(0, num_entornos, self.num_procesos + 1).astype(int)
+        self._conexiones = []
+        self._procesos = []
+        for i in range(self.num_procesos):
+            parametros = {
+                'nivel': nivel,
+                'semilla': semilla + i * SALTO_SEMILLA_TRABAJADOR,
+                'configuraciones': configuraciones,
+                'max_pasos': max_pasos,
+            }
+            local, remoto = mp.Pipe()
+            proceso = mp.Process(
+                target=_trabajador,
+                args=(remoto, especificaciones, limites[i], limites[i + 1], parametros),
+                daemon=True
+            )
+            proceso.start()
+            remoto.close()
+            self._conexiones.append(local)
+            self._procesos.append(proceso)
+
+        self._cerrado = False
+
+    def _difundir(self, comando: str):
+        """Envía un comando a todos los trabajadores y espera sus respuestas"""
+        for conexion in self._conexiones:
+            conexion.send(comando)
+        for conexion in self._conexiones:
+            conexion.recv()
+
+    def reset(self) -> np.ndarray:
+        """Reinicia todas las partidas y retorna las observaciones"""
+        self._difundir('reset')
+        return self.observaciones.copy()
+
+    def step(self, acciones: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Aplica una acción por partida en todos los trabajadores
+
+        Args:
+            acciones: Arreglo (K,) de índices de acción
+
+        Returns:
+            (observaciones, recompensas, terminados)
+        """
+        self.acciones[:] = acciones
+        self._difundir('step')
+        return self.observaciones.copy(), self.recompensas.copy(), self.terminados.copy()
+
+    def close(self):
+        """Detiene los trabajadores y libera la memoria compartida"""
+        if self._cerrado:
+            return
+        self._cerrado = True
+
+        for conexion in self._conexiones:
+            try:
+                conexion.send('cerrar')
+            except (BrokenPipeError, OSError):
+                pass
+        for proceso in self._procesos:
+            proceso.join(timeout=5)
+        for conexion in self._conexiones:
+            conexion.close()
+
+        del self.acciones, self.observaciones, self.recompensas, self.terminados
+        for bloque in self._bloques.values():
+            bloque.close()
+            bloque.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,266 @@
+"""
+Entorno vectorizado: K partidas de Pac-Man avanzando en paralelo
+El estado de todas las partidas vive en arreglos NumPy
+"""
+import random
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+from clases.agente import Agente
+from clases.entorno import (Entorno, POSICION_INICIAL_PACMAN, generar_posiciones_puntos,
+                            posiciones_iniciales_fantasmas)
+from config.configuracion import LIMITE
+from config.niveles import NIVELES
+from planificacion.busqueda_grafo import BusquedaEnGrafo
+from planificacion.grilla import construir_grilla_libre
+
+
+# Acciones de Pac-Man: índice -> desplazamiento (dx, dy)
+ACCIONES = np.array([
+    [0, 0],    # 0: quieto
+    [0, 1],    # 1: arriba
+    [0, -1],   # 2: abajo
+    [-1, 0],   # 3: izquierda
+    [1, 0],    # 4: derecha
+], dtype=np.int64)
+
+# Recompensas
+RECOMPENSA_CAPTURA = -100.0
+RECOMPENSA_VICTORIA = 100.0
+
+
+class EntornoVectorizado:
+    """
+    Mantiene K partidas de un mismo nivel en arreglos y las avanza en lockstep.
+
+    Las reglas son las de Entorno.actualizar: Pac-Man se mueve según la acción
+    (si la celda destino es válida), recolecta puntos, cada fantasma replanifica
+    cuando agota su trayectoria y avanza una celda, y se verifica la captura
+    (misma celda o intercambio de celdas en el paso).
+    Las rutas de los fantasmas se calculan con los mismos planificadores,
+    rasterizadas como en Fantasma.perseguir_pacman, y se guardan en caché por
+    (configuración, inicio, objetivo).
+    """
+
+    def __init__(self, num_entornos: int, nivel: int = 0, semilla: int = 0,
+                 configuraciones: Optional[List[Tuple[str, str]]] = None,
+                 max_pasos: int = 1000, max_rutas_cache: int = 200000):
+        """
+        Args:
+            num_entornos: Número K de partidas simultáneas
+            nivel: Índice del nivel (de config.niveles)
+            semilla: Semilla base; cada reinicio usa una semilla distinta
+            configuraciones: (algoritmo, método) de cada fantasma (None = las 4 fijas)
+            max_pasos: Pasos tras los cuales una partida se trunca
+            max_rutas_cache: Rutas de fantasmas guardadas antes de vaciar la caché
+        """
+        self.num_entornos = num_entornos
+        self.nivel = nivel
+        self.semilla = semilla
+        self.configuraciones = configuraciones
+        self.max_pasos = max_pasos
+        self.max_rutas_cache = max_rutas_cache
+
+        # Entorno de referencia: obstáculos, planificadores y fantasmas del nivel
+        self._referencia = self._crear_entorno(semilla)
+        self.libre = construir_grilla_libre(self._referencia.obstaculos, LIMITE)
+        self.num_fantasmas = len(self._referencia.fantasmas)
+        self.num_puntos = NIVELES[nivel]['puntos']
+        self._planes_fantasmas = [
+            (f.algoritmo,
+             self._referencia.voronoi_diagram if f.metodo_planificacion == 'voronoi'
+             else self._referencia.visibility_graph)
+            for f in self._referencia.fantasmas
+        ]
+
+        k, g, p = num_entornos, self.num_fantasmas, self.num_puntos
+        self.pacman = np.zeros((k, 2), dtype=np.int64)
+        self.fantasmas = np.zeros((k, g, 2), dtype=np.int64)
+        self.puntos = np.zeros((k, p, 2), dtype=np.int64)
+        self.puntos_activos = np.zeros((k, p), dtype=bool)
+        self.pasos = np.zeros(k, dtype=np.int64)
+        self.puntaje = np.zeros(k, dtype=np.int64)
+
+        # Trayectoria de cada fantasma: _buffer_rutas[cursor:fin], la cabeza es su posición
+        self.cursor = np.zeros((k, g), dtype=np.int64)
+        self.fin = np.zeros((k, g), dtype=np.int64)
+        self._buffer_rutas = np.zeros((1024, 2), dtype=np.int64)
+        self._uso_buffer = 0
+        self._cache_rutas: Dict[Tuple[int, Tuple[int, int], Tuple[int, int]], Optional[Tuple[int, int]]] = {}
+
+        self._episodios = 0
+        self.reset()
+
+    def _crear_entorno(self, semilla: int) -> Entorno:
+        """Entorno silencioso con los planificadores compartidos del nivel"""
+        return Entorno(
+            nivel=self.nivel,
+            modo_interactivo=True,
+            silencioso=True,
+            semilla=semilla,
+            avanzar_niveles=False,
+            configuraciones=self.configuraciones,
+            reutilizar_planificadores=True
+        )
+
+    def reset(self, indices: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Reinicia las partidas indicadas (todas por defecto)
+
+        Returns:
+            Observaciones de todas las partidas
+        """
+        if indices is None:
+            indices = np.arange(self.num_entornos)
+
+        # Mismos spawns y puntos que un Entorno con la semilla del episodio,
+        # sin construir uno por partida terminada
+        fantasmas = posiciones_iniciales_fantasmas(self.num_fantasmas)
+        for i in indices:
+            rng = random.Random(self.semilla + self._episodios)
+            self._episodios += 1
+
+            self.pacman[i] = POSICION_INICIAL_PACMAN
+            self.fantasmas[i] = fantasmas
+            self.puntos_activos[i] = False
+            posiciones = generar_posiciones_puntos(
+                rng, self._referencia.obstaculos, fantasmas, self.num_puntos)
+            for j, posicion in enumerate(posiciones):
+                self.puntos[i, j] = posicion
+                self.puntos_activos[i, j] = True
+
+        self.pasos[indices] = 0
+        self.puntaje[indices] = 0
+        self.cursor[indices] = 0
+        self.fin[indices] = 0
+
+        return self.observar()
+
+    def observar(self) -> np.ndarray:
+        """
+        Observación por partida: [pacman(2), fantasmas(2G), puntos(2P), activos(P)]
+
+        Returns:
+            Arreglo float32 de forma (K, 2 + 2G + 3P)
+        """
+        k = self.num_entornos
+        return np.concatenate([
+            self.pacman,
+            self.fantasmas.reshape(k, -1),
+            self.puntos.reshape(k, -1),
+            self.puntos_activos
+        ], axis=1).astype(np.float32)
+
+    def step(self, acciones: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Aplica una acción de Pac-Man por partida y avanza todas un paso.
+        Las partidas terminadas se reinician automáticamente.
+
+        Args:
+            acciones: Arreglo (K,) de índices en ACCIONES
+
+        Returns:
+            (observaciones, recompensas, terminados)
+        """
+        acciones = np.asarray(acciones, dtype=np.int64)
+        recompensas = np.zeros(self.num_entornos, dtype=np.float32)
+        self.pasos += 1
+        pacman_anterior = self.pacman.copy()
+        fantasmas_anteriores = self.fantasmas.copy()
+
+        # MOVER PAC-MAN (límites y obstáculos como PacMan.mover_en_direccion)
+        destino = self.pacman + ACCIONES[acciones]
+        dentro = np.all((destino >= -LIMITE) & (destino <= LIMITE), axis=1)
+        idx = np.clip(destino + LIMITE, 0, 2 * LIMITE)
+        valido = dentro & self.libre[idx[:, 0], idx[:, 1]]
+        self.pacman[valido] = destino[valido]
+
+        # Recolección de puntos
+        comidos = self.puntos_activos & np.all(self.puntos == self.pacman[:, None, :], axis=2)
+        self.puntos_activos &= ~comidos
+        ganados = comidos.sum(axis=1) * 10
+        self.puntaje += ganados
+        recompensas += ganados
+
+        # MOVER FANTASMAS
+        self._mover_fantasmas()
+
+        # VERIFICAR COLISIONES Y FIN DE PARTIDA (como PacMan.verificar_colision_fantasma)
+        misma_celda = np.all(self.fantasmas == self.pacman[:, None, :], axis=2)
+        cruce = (np.all(fantasmas_anteriores == self.pacman[:, None, :], axis=2) &
+                 np.all(self.fantasmas == pacman_anterior[:, None, :], axis=2))
+        capturado = np.any(misma_celda | cruce, axis=1)
+        victoria = ~capturado & ~self.puntos_activos.any(axis=1)
+        truncado = self.pasos >= self.max_pasos
+
+        recompensas[capturado] += RECOMPENSA_CAPTURA
+        recompensas[victoria] += RECOMPENSA_VICTORIA
+        terminados = capturado | victoria | truncado
+
+        if terminados.any():
+            self.reset(np.nonzero(terminados)[0])
+
+        return self.observar(), recompensas, terminados
+
+    def _mover_fantasmas(self):
+        """Replanifica los fantasmas sin trayectoria y avanza todos una celda"""
+        sin_ruta = (self.fin - self.cursor) <= 1
+        for i, j in zip(*np.nonzero(sin_ruta)):
+            ruta = self._ruta(j, tuple(self.fantasmas[i, j]), tuple(self.pacman[i]))
+            if ruta is not None:
+                self.cursor[i, j], self.fin[i, j] = ruta
+
+        mover = (self.fin - self.cursor) > 1
+        self.cursor[mover] += 1
+        self.fantasmas[mover] = self._buffer_rutas[self.cursor[mover]]
+
+    def _ruta(self, fantasma: int, inicio: Tuple[int, int],
+              objetivo: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        """
+        Ruta del fantasma entre dos celdas como rango (inicio, fin) del buffer.
+        Se calcula una sola vez con el planificador y algoritmo del fantasma y
+        se expande a celdas adyacentes con su rasterización.
+        """
+        clave = (fantasma, inicio, objetivo)
+        if clave in self._cache_rutas:
+            return self._cache_rutas[clave]
+
+        if len(self._cache_rutas) >= self.max_rutas_cache:
+            self._compactar_cache()
+
+        algoritmo, planificador = self._planes_fantasmas[fantasma]
+        camino = BusquedaEnGrafo.planificar_ruta(planificador, algoritmo, inicio, objetivo)
+
+        rango = None
+        if camino:
+            rango = self._guardar_ruta(Agente.celdas_camino(camino, planificador.rasterizacion))
+        self._cache_rutas[clave] = rango
+        return rango
+
+    def _guardar_ruta(self, camino: List[Tuple[int, int]]) -> Tuple[int, int]:
+        """Copia un camino al buffer compartido y retorna su rango"""
+        n = len(camino)
+        if self._uso_buffer + n > len(self._buffer_rutas):
+            nuevo = np.zeros((max(2 * len(self._buffer_rutas), self._uso_buffer + n), 2), dtype=np.int64)
+            nuevo[:self._uso_buffer] = self._buffer_rutas[:self._uso_buffer]
+            self._buffer_rutas = nuevo
+
+        inicio = self._uso_buffer
+        self._buffer_rutas[inicio:inicio + n] = camino
+        self._uso_buffer += n
+        return inicio, inicio + n
+
+    def _compactar_cache(self):
+        """
+        Vacía la caché de rutas conservando las trayectorias en curso,
+        que se copian al inicio de un buffer nuevo
+        """
+        viejo = self._buffer_rutas
+        self._cache_rutas = {}
+        self._buffer_rutas = np.zeros_like(viejo)
+        self._uso_buffer = 0
+
+        for i in range(self.num_entornos):
+            for j in range(self.num_fantasmas):
+                if self.fin[i, j] > self.cursor[i, j]:
+                    restante = viejo[self.cursor[i, j]:self.fin[i, j]]
+                    self.cursor[i, j], self.fin[i, j] = self._guardar_ruta(restante)
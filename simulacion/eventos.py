@@ -0,0 +1,148 @@
+"""
+Núcleo de simulación por eventos discretos
+Cada agente tiene programado el tick de su próximo movimiento en una cola de
+prioridad; el simulador salta de evento en evento en lugar de recorrer ticks
+vacíos, así el costo de un episodio es proporcional a la cantidad de movimientos.
+Las reglas son las de Entorno (mover_pacman, mover_fantasma, verificaciones).
+"""
+import heapq
+from typing import Dict, List, Optional, Tuple
+from clases.entorno import Entorno
+from config.configuracion import VELOCIDAD_PACMAN
+from config.niveles import NIVELES
+
+# Tipos de evento, en el orden en que se resuelven dentro de un mismo tick
+EVENTO_ENTRADA = 0
+EVENTO_PACMAN = 1
+EVENTO_FANTASMA = 2
+
+
+class SimuladorEventos:
+    """
+    Simula un Entorno con velocidades en ticks, como el modo Pygame:
+    Pac-Man se mueve cada `periodo_pacman` ticks y los fantasmas cada
+    `velocidad_fantasmas` del nivel. Después de los eventos de cada tick se
+    verifican colisiones, captura y fin de nivel.
+    """
+
+    def __init__(self, entorno: Entorno, periodo_pacman: int = VELOCIDAD_PACMAN,
+                 periodo_fantasmas: Optional[int] = None,
+                 entradas: Optional[Dict[int, str]] = None):
+        """
+        Args:
+            entorno: Mundo a simular (en su estado actual)
+            periodo_pacman: Ticks entre movimientos de Pac-Man
+            periodo_fantasmas: Ticks entre movimientos de fantasmas
+                (por defecto la velocidad de cada nivel)
+            entradas: Direcciones del jugador por tick ('up', 'down', ...) para
+                reproducir partidas en modo interactivo
+        """
+        self.entorno = entorno
+        self.periodo_pacman = periodo_pacman
+        self.periodo_fantasmas = periodo_fantasmas
+        self.entradas = dict(entradas or {})
+
+        self.tick = 0
+        self.eventos_procesados = 0
+        self.ticks_con_eventos = 0
+        self._cola: List[Tuple[int, int, int]] = []
+        self._programar_nivel()
+
+    def _periodo_fantasmas(self) -> int:
+        if self.periodo_fantasmas is not None:
+            return self.periodo_fantasmas
+        return NIVELES[self.entorno.nivel_actual]['velocidad_fantasmas']
+
+    def _programar_nivel(self):
+        """Programa los primeros eventos de cada agente a partir del tick actual"""
+        self._cola = []
+        self._nivel = self.entorno.nivel_actual
+        if self.entorno.juego_terminado:
+            return
+
+        self._cola.append((self.tick + self.periodo_pacman, EVENTO_PACMAN, 0))
+        periodo = self._periodo_fantasmas()
+        for i in range(len(self.entorno.fantasmas)):
+            self._cola.append((self.tick + periodo, EVENTO_FANTASMA, i))
+        for tick_entrada in self.entradas:
+            if tick_entrada > self.tick:
+                self._cola.append((tick_entrada, EVENTO_ENTRADA, tick_entrada))
+        heapq.heapify(self._cola)
+
+    def proximo_evento(self) -> Optional[int]:
+        """Tick del próximo evento (None si el juego terminó)"""
+        if self.entorno.juego_terminado or not self._cola:
+            return None
+        return self._cola[0][0]
+
+    def _procesar_tick(self, tick: int):
+        """Resuelve todos los eventos de un tick y las verificaciones posteriores"""
+        entorno = self.entorno
+        self.tick = tick
+        entorno.pasos = tick
+        entorno.recordar_posiciones()
+        self.ticks_con_eventos += 1
+
+        while self._cola and self._cola[0][0] == tick:
+            _, tipo, indice = heapq.heappop(self._cola)
+            self.eventos_procesados += 1
+
+            if tipo == EVENTO_ENTRADA:
+                entorno.pacman.set_direccion(self.entradas[indice])
+            elif tipo == EVENTO_PACMAN:
+                entorno.mover_pacman()
+                heapq.heappush(self._cola, (tick + self.periodo_pacman, EVENTO_PACMAN, 0))
+            else:
+                entorno.mover_fantasma(entorno.fantasmas[indice])
+                heapq.heappush(self._cola, (tick + self._periodo_fantasmas(), EVENTO_FANTASMA, indice))
+
+        entorno.pacman.verificar_colision_fantasma(entorno.fantasmas)
+        if entorno.verificar_captura() or entorno.verificar_nivel_completado():
+            # Nuevo nivel: agentes nuevos, se reprograma desde este tick
+            if not entorno.juego_terminado and entorno.nivel_actual != self._nivel:
+                self._programar_nivel()
+
+    def avanzar(self) -> bool:
+        """
+        Salta directamente al próximo tick con eventos y lo resuelve
+
+        Returns:
+            False si el juego ya terminó
+        """
+        proximo = self.proximo_evento()
+        if proximo is None:
+            return False
+        self._procesar_tick(proximo)
+        return True
+
+    def avanzar_hasta(self, tick: int) -> int:
+        """
+        Resuelve los eventos hasta `tick` inclusive (modo en tiempo real:
+        se llama con el tick del reloj y los ticks sin eventos no cuestan nada)
+
+        Returns:
+            Cantidad de ticks con eventos resueltos
+        """
+        resueltos = 0
+        while True:
+            proximo = self.proximo_evento()
+            if proximo is None or proximo > tick:
+                break
+            self._procesar_tick(proximo)
+            resueltos += 1
+        self.tick = max(self.tick, tick)
+        return resueltos
+
+    def ejecutar(self, max_ticks: Optional[int] = None) -> Entorno:
+        """
+        Avance rápido hasta el fin del juego o hasta `max_ticks`
+
+        Returns:
+            El entorno en su estado final
+        """
+        while True:
+            proximo = self.proximo_evento()
+            if proximo is None or (max_ticks is not None and proximo > max_ticks):
+                break
+            self._procesar_tick(proximo)
+        return self.entorno
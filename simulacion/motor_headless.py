@@ -0,0 +1,262 @@
+"""
+Motor de simulación headless (sin pygame)
+Ejecuta episodios automáticos de Entorno lo más rápido posible
+"""
+import time
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Tuple
+from clases.entorno import Entorno
+from planificacion.politica_replanificacion import PoliticaReplanificacion
+from ia.alfa_beta import AgenteAlfaBeta
+from ia.mcts import AgenteMCTS
+from config.configuracion import PRESUPUESTO_JUGADA_MS, MCTS_PROCESOS, TOUR_PUNTOS, RUTAS_SEGURAS
+
+
+# Posibles resultados de un episodio
+RESULTADO_VICTORIA = 'victoria'
+RESULTADO_CAPTURADO = 'capturado'
+RESULTADO_LIMITE_PASOS = 'limite_pasos'
+
+
+@dataclass
+class ResultadoEpisodio:
+    """Resumen de un episodio headless"""
+    nivel: int
+    semilla: Optional[int]
+    resultado: str
+    pasos: int
+    puntaje: int
+    puntos_recolectados: int
+    tiempo_total: float
+    tiempo_planificacion: float
+    configuracion: str = ''
+    busquedas: Optional[List[Dict]] = None
+    replanificacion: Optional[Dict] = None
+    agente: Optional[Dict] = None
+
+    @property
+    def pasos_por_segundo(self) -> float:
+        """Throughput del episodio (sin contar la construcción del nivel)"""
+        if self.tiempo_total <= 0:
+            return 0.0
+        return self.pasos / self.tiempo_total
+
+    def a_dict(self) -> Dict:
+        """Convierte el resultado a un diccionario serializable"""
+        datos = asdict(self)
+        datos['pasos_por_segundo'] = self.pasos_por_segundo
+        if self.busquedas is None:
+            del datos['busquedas']
+        if self.replanificacion is None:
+            del datos['replanificacion']
+        if self.agente is None:
+            del datos['agente']
+        return datos
+
+
+class MotorHeadless:
+    """
+    Ejecuta episodios de Entorno en modo automático sin renderizado.
+    Cada episodio juega un único nivel hasta victoria, captura o límite de pasos.
+    """
+
+    def __init__(self, max_pasos: int = 5000, reutilizar_planificadores: bool = True,
+                 registrar_busquedas: bool = False,
+                 umbral_replanificacion: Optional[float] = None,
+                 agente: Optional[str] = None,
+                 presupuesto_jugada_ms: float = PRESUPUESTO_JUGADA_MS,
+                 procesos_mcts: int = MCTS_PROCESOS,
+                 tour_puntos: bool = TOUR_PUNTOS,
+                 rutas_seguras: bool = RUTAS_SEGURAS):
+        """
+        Args:
+            max_pasos: Límite de llamadas a Entorno.actualizar por episodio
+            reutilizar_planificadores: Construye los grafos de cada nivel una sola vez
+            registrar_busquedas: Adjunta al resultado las estadísticas de cada búsqueda
+            umbral_replanificacion: Si se indica, los fantasmas usan una
+                PoliticaReplanificacion con ese umbral y el resultado incluye sus contadores
+            agente: 'alfa_beta' o 'expectimax' (AgenteAlfaBeta) o 'mcts'
+                (AgenteMCTS) para que Pac-Man decida cada paso (None = rutas a los puntos)
+            presupuesto_jugada_ms: Tiempo de búsqueda por jugada del agente
+            procesos_mcts: Árboles en paralelo del agente 'mcts'
+            tour_puntos: Pac-Man sigue un TourPuntos en lugar de ir al punto más cercano
+            rutas_seguras: Las rutas de Pac-Man evitan a los fantasmas (CampoAmenaza)
+        """
+        self.max_pasos = max_pasos
+        self.reutilizar_planificadores = reutilizar_planificadores
+        self.registrar_busquedas = registrar_busquedas
+        self.umbral_replanificacion = umbral_replanificacion
+        self.agente = agente
+        self.presupuesto_jugada_ms = presupuesto_jugada_ms
+        self.procesos_mcts = procesos_mcts
+        self.tour_puntos = tour_puntos
+        self.rutas_seguras = rutas_seguras
+
+    def crear_agente(self, semilla: Optional[int]):
+        """Agente de búsqueda de Pac-Man del episodio (None si juega por rutas)"""
+        if self.agente is None:
+            return None
+        if self.agente == 'mcts':
+            return AgenteMCTS(presupuesto_ms=self.presupuesto_jugada_ms,
+                              procesos=self.procesos_mcts, semilla=semilla or 0)
+        return AgenteAlfaBeta(presupuesto_ms=self.presupuesto_jugada_ms, modo=self.agente)
+
+    def crear_entorno(self, nivel: int, semilla: Optional[int],
+                      configuraciones: Optional[List[Tuple[str, str]]] = None) -> Entorno:
+        """Crea un entorno silencioso en modo automático"""
+        return Entorno(
+            nivel=nivel,
+            modo_interactivo=False,
+            silencioso=True,
+            semilla=semilla,
+            avanzar_niveles=False,
+            configuraciones=configuraciones,
+            reutilizar_planificadores=self.reutilizar_planificadores,
+            registrar_busquedas=self.registrar_busquedas,
+            politica_replanificacion=(PoliticaReplanificacion(self.umbral_replanificacion)
+                                      if self.umbral_replanificacion is not None else None),
+            agente_pacman=self.crear_agente(semilla),
+            tour_puntos=self.tour_puntos,
+            rutas_seguras=self.rutas_seguras
+        )
+
+    def ejecutar_episodio(self, nivel: int = 0, semilla: Optional[int] = None,
+                          configuraciones: Optional[List[Tuple[str, str]]] = None
+                          ) -> ResultadoEpisodio:
+        """
+        Ejecuta un episodio completo
+
+        Args:
+            nivel: Índice del nivel a jugar
+            semilla: Semilla del episodio
+            configuraciones: (algoritmo, método) de cada fantasma (None = las 4 fijas)
+
+        Returns:
+            Resultado del episodio
+        """
+        entorno = self.crear_entorno(nivel, semilla, configuraciones)
+        return self.jugar(entorno, nivel, semilla)
+
+    def jugar(self, entorno: Entorno, nivel: int,
+              semilla: Optional[int]) -> ResultadoEpisodio:
+        """Avanza un entorno ya creado hasta que termine el episodio"""
+        inicio = time.perf_counter()
+
+        try:
+            while not entorno.juego_terminado and entorno.pasos < self.max_pasos:
+                entorno.actualizar()
+        finally:
+            # Los procesos del agente no deben sobrevivir a un episodio interrumpido
+            if entorno.agente_pacman is not None:
+                entorno.agente_pacman.cerrar()
+
+        tiempo_total = time.perf_counter() - inicio
+
+        if entorno.victoria:
+            resultado = RESULTADO_VICTORIA
+        elif entorno.juego_terminado:
+            resultado = RESULTADO_CAPTURADO
+        else:
+            resultado = RESULTADO_LIMITE_PASOS
+
+        return ResultadoEpisodio(
+            nivel=nivel,
+            semilla=semilla,
+            resultado=resultado,
+            pasos=entorno.pasos,
+            puntaje=entorno.pacman.puntaje,
+            puntos_recolectados=entorno.pacman.puntos_recolectados,
+            tiempo_total=tiempo_total,
+            tiempo_planificacion=entorno.tiempo_planificacion,
+            busquedas=entorno.exportar_estadisticas_busqueda() if self.registrar_busquedas else None,
+            replanificacion=(entorno.politica_replanificacion.resumen()
+                             if entorno.politica_replanificacion is not None else None),
+            agente=entorno.agente_pacman.resumen() if entorno.agente_pacman is not None else None
+        )
+
+    def ejecutar(self, episodios: int, nivel: int = 0,
+                 semilla: int = 0) -> List[ResultadoEpisodio]:
+        """
+        Ejecuta varios episodios con semillas consecutivas
+
+        Args:
+            episodios: Número de episodios
+            nivel: Índice del nivel a jugar
+            semilla: Semilla del primer episodio
+
+        Returns:
+            Lista de resultados
+        """
+        return [
+            self.ejecutar_episodio(nivel, semilla + i)
+            for i in range(episodios)
+        ]
+
+    @staticmethod
+    def resumir(resultados: List[ResultadoEpisodio]) -> Dict:
+        """
+        Agrega los resultados de varios episodios
+
+        Returns:
+            Diccionario con pasos/s, conteo de resultados y tiempos de planificación
+        """
+        pasos = sum(r.pasos for r in resultados)
+        tiempo_total = sum(r.tiempo_total for r in resultados)
+        tiempo_planificacion = sum(r.tiempo_planificacion for r in resultados)
+
+        conteo = {
+            RESULTADO_VICTORIA: 0,
+            RESULTADO_CAPTURADO: 0,
+            RESULTADO_LIMITE_PASOS: 0
+        }
+        for r in resultados:
+            conteo[r.resultado] = conteo.get(r.resultado, 0) + 1
+
+        resumen = {
+            'episodios': len(resultados),
+            'pasos': pasos,
+            'tiempo_total': tiempo_total,
+            'pasos_por_segundo': pasos / tiempo_total if tiempo_total > 0 else 0.0,
+            'tiempo_planificacion': tiempo_planificacion,
+            'fraccion_planificacion': tiempo_planificacion / tiempo_total if tiempo_total > 0 else 0.0,
+            'resultados': conteo
+        }
+
+        politicas = [r.replanificacion for r in resultados if r.replanificacion is not None]
+        if politicas:
+            motivos: Dict[str, int] = {}
+            for politica in politicas:
+                for motivo, cantidad in politica['motivos'].items():
+                    motivos[motivo] = motivos.get(motivo, 0) + cantidad
+            decisiones = sum(p['decisiones'] for p in politicas)
+            resumen['replanificacion'] = {
+                'umbral': politicas[0]['umbral'],
+                'decisiones': decisiones,
+                'motivos': motivos,
+                'planificaciones': sum(p['planificaciones'] for p in politicas),
+                'fallidas': sum(p['fallidas'] for p in politicas),
+                'tasa_reutilizacion': motivos.get('vigente', 0) / decisiones if decisiones else 0.0,
+            }
+
+        agentes = [r.agente for r in resultados if r.agente is not None]
+        if agentes:
+            nodos = sum(a['nodos'] for a in agentes)
+            tiempo = sum(a['tiempo'] for a in agentes)
+            jugadas = sum(a['jugadas'] for a in agentes)
+            resumen['agente'] = {
+                'modo': agentes[0]['modo'],
+                'jugadas': jugadas,
+                'nodos': nodos,
+                'nodos_por_segundo': nodos / tiempo if tiempo > 0 else 0.0,
+            }
+            if 'aciertos_tabla' in agentes[0]:
+                resumen['agente']['aciertos_tabla'] = sum(a['aciertos_tabla'] for a in agentes)
+                resumen['agente']['profundidad_media'] = (
+                    sum(a['profundidad_media'] * a['jugadas'] for a in agentes) / jugadas
+                    if jugadas else 0.0)
+            if 'simulaciones' in agentes[0]:
+                simulaciones = sum(a['simulaciones'] for a in agentes)
+                resumen['agente']['simulaciones'] = simulaciones
+                resumen['agente']['simulaciones_por_segundo'] = simulaciones / tiempo if tiempo > 0 else 0.0
+
+        return resumen
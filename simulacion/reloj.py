@@ -0,0 +1,71 @@
+"""
+Reloj de simulación de paso fijo
+La lógica avanza en ticks de duración constante, independientes de los
+frames dibujados: un frame lento ejecuta varios ticks para ponerse al día
+y uno rápido puede no ejecutar ninguno.
+"""
+import time
+from typing import Callable
+
+
+class RelojSimulacion:
+    """
+    Acumulador de tiempo real en ticks de `duracion_tick` segundos.
+
+    Uso por frame:
+        for _ in range(reloj.avanzar()):
+            actualizar()
+        dibujar(reloj.alfa)
+    """
+
+    def __init__(self, duracion_tick: float, max_ticks_por_frame: int = 5,
+                 tiempo: Callable[[], float] = time.perf_counter):
+        """
+        Args:
+            duracion_tick: Segundos simulados por tick
+            max_ticks_por_frame: Tope de ticks por frame; el atraso que exceda
+                se descarta para no entrar en una espiral de frames cada vez más lentos
+            tiempo: Fuente de tiempo en segundos (inyectable para pruebas o replays)
+        """
+        self.duracion_tick = duracion_tick
+        self.max_ticks_por_frame = max_ticks_por_frame
+        self.tiempo = tiempo
+
+        self.acumulador = 0.0
+        self.ticks = 0
+        self.ticks_descartados = 0  # Atraso descartado por el tope (overlay F3)
+        self._ultimo = None
+
+    def reiniciar(self):
+        """Olvida el tiempo acumulado (p.ej. al salir de una pausa)"""
+        self.acumulador = 0.0
+        self._ultimo = None
+
+    def avanzar(self) -> int:
+        """
+        Suma el tiempo real transcurrido desde la llamada anterior
+
+        Returns:
+            Cantidad de ticks a simular en este frame
+        """
+        ahora = self.tiempo()
+        if self._ultimo is None:
+            self._ultimo = ahora
+        self.acumulador += ahora - self._ultimo
+        self._ultimo = ahora
+
+        ticks = int(self.acumulador // self.duracion_tick)
+        if ticks > self.max_ticks_por_frame:
+            self.ticks_descartados += ticks - self.max_ticks_por_frame
+            ticks = self.max_ticks_por_frame
+            self.acumulador = 0.0
+        else:
+            self.acumulador -= ticks * self.duracion_tick
+
+        self.ticks += ticks
+        return ticks
+
+    @property
+    def alfa(self) -> float:
+        """Fracción del siguiente tick ya transcurrida (0..1), para interpolar"""
+        return min(self.acumulador / self.duracion_tick, 1.0)
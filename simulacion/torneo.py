@@ -0,0 +1,171 @@
+"""
+Torneo de configuraciones de fantasmas
+Reparte miles de episodios headless con semilla entre todos los núcleos
+"""
+import os
+import statistics
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from clases.entorno import CONFIGURACIONES_FANTASMAS
+from config.niveles import NIVELES
+from simulacion.motor_headless import (
+    MotorHeadless, ResultadoEpisodio, RESULTADO_CAPTURADO
+)
+
+
+# Las 4 combinaciones fijas (algoritmo, método) de Entorno
+CONFIGURACIONES_TORNEO: List[Tuple[str, str]] = [
+    (algoritmo, metodo) for algoritmo, metodo, _ in CONFIGURACIONES_FANTASMAS
+]
+
+
+def nombre_configuracion(configuracion: Tuple[str, str]) -> str:
+    """Etiqueta legible de una configuración, p.ej. 'a_star+voronoi'"""
+    algoritmo, metodo = configuracion
+    return f"{algoritmo}+{metodo}"
+
+
+@dataclass(frozen=True)
+class TareaTorneo:
+    """Un episodio del torneo: todos los fantasmas usan la misma configuración"""
+    configuracion: Tuple[str, str]
+    nivel: int
+    semilla: int
+    num_fantasmas: int = 4
+
+
+@dataclass
+class EstadisticasConfiguracion:
+    """Agregado de los episodios de una configuración"""
+    configuracion: str
+    episodios: int = 0
+    capturas: int = 0
+    pasos_captura: List[int] = field(default_factory=list)
+    pasos: int = 0
+    tiempo_planificacion: float = 0.0
+
+    def agregar(self, resultado: ResultadoEpisodio):
+        """Acumula un episodio"""
+        self.episodios += 1
+        self.pasos += resultado.pasos
+        self.tiempo_planificacion += resultado.tiempo_planificacion
+        if resultado.resultado == RESULTADO_CAPTURADO:
+            self.capturas += 1
+            self.pasos_captura.append(resultado.pasos)
+
+    def a_dict(self) -> Dict:
+        """Resumen serializable de la configuración"""
+        return {
+            'configuracion': self.configuracion,
+            'episodios': self.episodios,
+            'tasa_captura': self.capturas / self.episodios if self.episodios else 0.0,
+            'pasos_captura_media': statistics.mean(self.pasos_captura) if self.pasos_captura else None,
+            'pasos_captura_mediana': statistics.median(self.pasos_captura) if self.pasos_captura else None,
+            'planificacion_ms_por_episodio': (
+                1000 * self.tiempo_planificacion / self.episodios if self.episodios else 0.0
+            ),
+            'planificacion_us_por_paso': (
+                1e6 * self.tiempo_planificacion / self.pasos if self.pasos else 0.0
+            ),
+        }
+
+
+# Motor del proceso trabajador (los grafos se construyen una vez por nivel y proceso)
+_motor_trabajador: Optional[MotorHeadless] = None
+
+
+def _inicializar_trabajador(max_pasos: int):
+    """Inicializador de cada proceso del pool"""
+    global _motor_trabajador
+    _motor_trabajador = MotorHeadless(max_pasos=max_pasos, reutilizar_planificadores=True)
+
+
+def _ejecutar_tarea(tarea: TareaTorneo) -> ResultadoEpisodio:
+    """Ejecuta una tarea dentro de un proceso trabajador"""
+    resultado = _motor_trabajador.ejecutar_episodio(
+        tarea.nivel,
+        tarea.semilla,
+        configuraciones=[tarea.configuracion] * tarea.num_fantasmas
+    )
+    resultado.configuracion = nombre_configuracion(tarea.configuracion)
+    return resultado
+
+
+class Torneo:
+    """
+    Barre configuración × nivel × semilla sobre un ProcessPoolExecutor
+    y agrega los resultados a medida que llegan.
+    """
+
+    def __init__(self,
+                 configuraciones: Optional[List[Tuple[str, str]]] = None,
+                 niveles: Optional[List[int]] = None,
+                 semillas: int = 100,
+                 semilla_inicial: int = 0,
+                 max_pasos: int = 5000,
+                 procesos: Optional[int] = None,
+                 num_fantasmas: int = 4):
+        """
+        Args:
+            configuraciones: Combinaciones (algoritmo, método) a comparar
+            niveles: Índices de nivel a jugar (por defecto todos)
+            semillas: Número de semillas por configuración y nivel
+            semilla_inicial: Primera semilla del barrido
+            max_pasos: Límite de pasos por episodio
+            procesos: Procesos del pool (por defecto todos los núcleos)
+            num_fantasmas: Fantasmas por episodio
+        """
+        self.configuraciones = configuraciones or CONFIGURACIONES_TORNEO
+        self.niveles = niveles if niveles is not None else list(range(len(NIVELES)))
+        self.semillas = semillas
+        self.semilla_inicial = semilla_inicial
+        self.max_pasos = max_pasos
+        self.procesos = procesos or os.cpu_count() or 1
+        self.num_fantasmas = num_fantasmas
+
+    def generar_tareas(self) -> List[TareaTorneo]:
+        """Producto cartesiano configuración × nivel × semilla"""
+        return [
+            TareaTorneo(configuracion, nivel, self.semilla_inicial + i, self.num_fantasmas)
+            for nivel in self.niveles
+            for i in range(self.semillas)
+            for configuracion in self.configuraciones
+        ]
+
+    def resultados(self) -> Iterator[ResultadoEpisodio]:
+        """Ejecuta el torneo y entrega cada resultado en cuanto termina"""
+        tareas = self.generar_tareas()
+
+        with ProcessPoolExecutor(
+            max_workers=self.procesos,
+            initializer=_inicializar_trabajador,
+            initargs=(self.max_pasos,)
+        ) as pool:
+            futuros = [pool.submit(_ejecutar_tarea, tarea) for tarea in tareas]
+            for futuro in as_completed(futuros):
+                yield futuro.result()
+
+    def ejecutar(self, al_completar: Optional[Callable[[ResultadoEpisodio, int, int], None]] = None
+                 ) -> Dict[str, EstadisticasConfiguracion]:
+        """
+        Ejecuta el torneo completo
+
+        Args:
+            al_completar: Callback (resultado, completados, total) por episodio
+
+        Returns:
+            Estadísticas agregadas por configuración
+        """
+        estadisticas = {
+            nombre_configuracion(c): EstadisticasConfiguracion(nombre_configuracion(c))
+            for c in self.configuraciones
+        }
+        total = len(self.configuraciones) * len(self.niveles) * self.semillas
+
+        for completados, resultado in enumerate(self.resultados(), start=1):
+            estadisticas[resultado.configuracion].agregar(resultado)
+            if al_completar is not None:
+                al_completar(resultado, completados, total)
+
+        return estadisticas
@@ -0,0 +1,81 @@
+"""
+Cache de superficies de texto
+font.render rasteriza el texto en cada llamada; el HUD repite los mismos
+textos frame tras frame, así que se guardan las superficies ya renderizadas
+"""
+import pygame
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional, Tuple
+
+Color = Tuple[int, int, int]
+
+
+class CacheTexto:
+    """Superficies de texto por (fuente, texto, color) con desalojo LRU"""
+
+    def __init__(self, capacidad: int = 256):
+        """
+        Args:
+            capacidad: Máximo de superficies guardadas
+        """
+        self.capacidad = capacidad
+        self._superficies: "OrderedDict[Tuple[pygame.font.Font, str, Color], pygame.Surface]" = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def __len__(self) -> int:
+        return len(self._superficies)
+
+    def render(self, fuente: pygame.font.Font, texto: str, color: Color) -> pygame.Surface:
+        """Equivalente a fuente.render(texto, True, color), con cache"""
+        clave = (fuente, texto, tuple(color))
+        superficie = self._superficies.get(clave)
+        if superficie is not None:
+            self._superficies.move_to_end(clave)
+            self.aciertos += 1
+            return superficie
+
+        self.fallos += 1
+        superficie = fuente.render(texto, True, color)
+        self._superficies[clave] = superficie
+        if len(self._superficies) > self.capacidad:
+            self._superficies.popitem(last=False)
+        return superficie
+
+    def limpiar(self):
+        """Descarta todas las superficies"""
+        self._superficies.clear()
+
+
+class EtiquetaHUD:
+    """
+    Texto del HUD que depende de un valor: solo se vuelve a formatear y
+    renderizar cuando el valor cambia.
+    """
+
+    def __init__(self, cache: CacheTexto, fuente: pygame.font.Font, color: Color,
+                 formato: Callable[[Hashable], str] = str):
+        """
+        Args:
+            cache: Cache de superficies compartido
+            fuente: Fuente del texto
+            color: Color del texto
+            formato: Convierte el valor en el texto a mostrar
+        """
+        self.cache = cache
+        self.fuente = fuente
+        self.color = color
+        self.formato = formato
+        self._valor: Optional[Hashable] = None
+        self._superficie: Optional[pygame.Surface] = None
+
+    def superficie(self, valor: Hashable) -> pygame.Surface:
+        """Superficie del texto para `valor` (re-renderiza solo si cambió)"""
+        if self._superficie is None or valor != self._valor:
+            self._valor = valor
+            self._superficie = self.cache.render(self.fuente, self.formato(valor), self.color)
+        return self._superficie
+
+    def dibujar(self, destino: pygame.Surface, valor: Hashable, posicion: Tuple[int, int]) -> pygame.Rect:
+        """Dibuja la etiqueta en `posicion` (esquina superior izquierda)"""
+        return destino.blit(self.superficie(valor), posicion)
@@ -0,0 +1,68 @@
+"""
+Capas estáticas pre-renderizadas
+El fondo, los obstáculos y los grafos de planificación no cambian durante un
+nivel: se dibujan una vez en Surfaces y cada frame solo se copia la composición
+"""
+import pygame
+from typing import Callable, Dict, Hashable, Optional, Sequence, Tuple
+
+
+class CapasEstaticas:
+    """
+    Cache de capas por nivel. Cada capa se renderiza la primera vez que se pide
+    y la composición de las capas visibles se rehace solo cuando cambia el
+    conjunto visible o se invalida el cache (cambio o reinicio de nivel).
+    """
+
+    def __init__(self, tamanio: Tuple[int, int]):
+        """
+        Args:
+            tamanio: (ancho, alto) de la pantalla
+        """
+        self.tamanio = tamanio
+        self.capas: Dict[str, pygame.Surface] = {}
+        self._composicion: Optional[pygame.Surface] = None
+        self._clave_composicion: Optional[Hashable] = None
+        self.renderizados = 0
+
+    def invalidar(self):
+        """Descarta todas las capas (nuevo nivel o nuevos planificadores)"""
+        self.capas.clear()
+        self._composicion = None
+        self._clave_composicion = None
+
+    def capa(self, nombre: str, dibujar: Callable[[pygame.Surface], None],
+             opaca: bool = False) -> pygame.Surface:
+        """
+        Devuelve la capa `nombre`, renderizándola con `dibujar` si no está en cache
+
+        Args:
+            nombre: Identificador de la capa
+            dibujar: Función que dibuja la capa sobre la Surface recibida
+            opaca: Las capas opacas no llevan canal alfa (más rápidas de copiar)
+        """
+        if nombre not in self.capas:
+            if opaca:
+                superficie = pygame.Surface(self.tamanio)
+            else:
+                superficie = pygame.Surface(self.tamanio, pygame.SRCALPHA)
+            dibujar(superficie)
+            self.capas[nombre] = superficie.convert() if opaca and pygame.display.get_surface() else superficie
+            self.renderizados += 1
+        return self.capas[nombre]
+
+    def composicion(self, capas: Sequence[Tuple[str, Callable[[pygame.Surface], None], bool]]) -> pygame.Surface:
+        """
+        Surface opaca con las capas indicadas, de abajo hacia arriba
+
+        Args:
+            capas: Tuplas (nombre, dibujar, opaca) de las capas visibles
+        """
+        clave = tuple(nombre for nombre, _, _ in capas)
+        if self._composicion is None or clave != self._clave_composicion:
+            composicion = pygame.Surface(self.tamanio)
+            for nombre, dibujar, opaca in capas:
+                composicion.blit(self.capa(nombre, dibujar, opaca), (0, 0))
+            self._composicion = composicion.convert() if pygame.display.get_surface() else composicion
+            self._clave_composicion = clave
+        return self._composicion
@@ -4,12 +4,32 @@ Incluye visualización de Visibility Graph y Diagrama de Voronoi
 """
 import pygame
 import sys
-from typing import List, Tuple
+import time
+from typing import Callable, Dict, List, Optional, Tuple
 from clases.entorno import Entorno
 from config import configuracion
+from diagnostico.instrumentacion import Instrumentacion
+from diagnostico.perfilador import PerfiladorMuestreo
+from planificacion.planificacion_por_tiempo import PlanificadorPorTiempo
+from planificacion.servicio_planificacion import ServicioPlanificacion
+from simulacion.reloj import RelojSimulacion
+from visualizacion.cache_texto import CacheTexto, EtiquetaHUD
+from visualizacion.capas import CapasEstaticas
 
 class JuegoPygame:
-    def __init__(self, entorno: Entorno):
+    def __init__(self, entorno: Entorno, perfilar: Optional[float] = None,
+                 salida_perfil: Optional[str] = None, rectangulos_sucios: Optional[bool] = None,
+                 planificacion_fantasmas: Optional[str] = None):
+        """
+        Args:
+            entorno: Mundo del juego
+            perfilar: Si se indica, perfila los primeros N segundos de ejecución
+            salida_perfil: Archivo de salida del perfil (collapsed stacks)
+            rectangulos_sucios: Presentar solo las regiones que cambiaron
+                (por defecto configuracion.RECTANGULOS_SUCIOS)
+            planificacion_fantasmas: 'sincronica', 'por_tiempo' o 'asincrona'
+                (por defecto configuracion.PLANIFICACION_FANTASMAS)
+        """
         pygame.init()
 
         self.entorno = entorno
@@ -21,6 +41,12 @@ class JuegoPygame:
         self.clock = pygame.time.Clock()
         self.fps = configuracion.FPS
 
+        # La lógica avanza en ticks fijos; el dibujo interpola entre ticks
+        self.reloj = RelojSimulacion(configuracion.DURACION_TICK, configuracion.MAX_TICKS_POR_FRAME)
+        self.alfa = 1.0
+        # id(agente) -> (posición de partida, tick del último paso, ticks por paso)
+        self.pasos_en_curso: Dict[int, Tuple[Tuple[int, int], int, int]] = {}
+
         # Calcular tamaño de celda
         self.cell_size = self.ancho // (configuracion.TAMANIO_MUNDO + 2)
         self.offset_x = self.ancho // 2
@@ -31,8 +57,17 @@ class JuegoPygame:
         self.font_normal = pygame.font.Font(None, 32)
         self.font_pequeña = pygame.font.Font(None, 24)
 
-        # Contador de frames para controlar velocidad
-        self.frame_count = 0
+        # Superficies de texto: el HUD solo se rasteriza cuando cambian sus valores
+        self.textos = CacheTexto(configuracion.CAPACIDAD_CACHE_TEXTO)
+        self.etiqueta_nivel = EtiquetaHUD(self.textos, self.font_normal, (255, 255, 255),
+                                          lambda nivel: f"NIVEL {nivel + 1}")
+        self.etiqueta_puntaje = EtiquetaHUD(self.textos, self.font_normal, (255, 255, 0),
+                                            lambda puntaje: f"PUNTOS: {puntaje}")
+        self.etiqueta_restantes = EtiquetaHUD(self.textos, self.font_pequeña, (200, 200, 200),
+                                              lambda valor: f"Restantes: {valor[0]}/{valor[1]}")
+
+        # Contador de ticks para controlar velocidad
+        self.ticks = 0
         self.velocidad_pacman = configuracion.VELOCIDAD_PACMAN
 
         # Velocidad de fantasmas según el nivel
@@ -40,33 +75,89 @@ class JuegoPygame:
         nivel_config = NIVELES[entorno.nivel_actual]
         self.velocidad_fantasma = nivel_config['velocidad_fantasmas']
 
-        print(f"Velocidad Pac-Man: {self.velocidad_pacman} frames")
-        print(f"Velocidad Fantasmas: {self.velocidad_fantasma} frames")
+        print(f"Velocidad Pac-Man: {self.velocidad_pacman} ticks")
+        print(f"Velocidad Fantasmas: {self.velocidad_fantasma} ticks")
 
         # Estado del juego
         self.pausa = False
         self.mostrar_ayuda = True
 
-    def mundo_a_pantalla(self, x: int, y: int) -> Tuple[int, int]:
+        # Búsquedas de los fantasmas fuera del tick: repartidas entre frames o en un pool
+        if planificacion_fantasmas is None:
+            planificacion_fantasmas = configuracion.PLANIFICACION_FANTASMAS
+        self.planificacion = None
+        if planificacion_fantasmas == 'por_tiempo':
+            self.planificacion = PlanificadorPorTiempo(configuracion.PRESUPUESTO_PLANIFICACION_US)
+        elif planificacion_fantasmas == 'asincrona':
+            self.planificacion = ServicioPlanificacion(trabajadores=configuracion.TRABAJADORES_PLANIFICACION)
+
+        # Fondo, obstáculos y grafos se renderizan una vez por nivel
+        self.capas = CapasEstaticas((self.ancho, self.alto))
+
+        # Modo de rectángulos sucios: regiones del frame anterior a restaurar
+        if rectangulos_sucios is None:
+            rectangulos_sucios = configuracion.RECTANGULOS_SUCIOS
+        self.rectangulos_sucios = rectangulos_sucios
+        self._rects_sprites: List[pygame.Rect] = []
+        self._rects_hud: List[pygame.Rect] = []
+        self._firma_hud: Optional[tuple] = None
+        self._estado_pantalla: Optional[tuple] = None
+
+        # Temporizadores por frame
+        self.instrumentacion = Instrumentacion(
+            activo=configuracion.INSTRUMENTAR,
+            ventana=configuracion.VENTANA_RENDIMIENTO
+        )
+
+        # Perfilador por muestreo del hilo del juego
+        self.perfilador = PerfiladorMuestreo(intervalo=configuracion.INTERVALO_PERFIL)
+        self.perfilar_al_iniciar = perfilar
+        self.salida_perfil = salida_perfil
+
+    def mundo_a_pantalla(self, x: float, y: float) -> Tuple[float, float]:
         """Convierte coordenadas del mundo a coordenadas de pantalla"""
         screen_x = self.offset_x + (x * self.cell_size)
         screen_y = self.offset_y - (y * self.cell_size)
         return (screen_x, screen_y)
 
-    def dibujar_grid(self):
+    def registrar_paso(self, agente, periodo: int):
+        """
+        Anota desde dónde parte el agente antes de moverse en este tick
+
+        Args:
+            agente: Pac-Man o un fantasma
+            periodo: Ticks entre pasos del agente (su velocidad)
+        """
+        self.pasos_en_curso[id(agente)] = (agente.get_pos_tuple(), self.ticks, periodo)
+
+    def posicion_interpolada(self, agente) -> Tuple[float, float]:
+        """Posición de dibujo a lo largo del último paso, repartido en el período del agente"""
+        paso = self.pasos_en_curso.get(id(agente))
+        x1, y1 = agente.pos
+        if paso is None:
+            return (x1, y1)
+        (x0, y0), tick, periodo = paso
+        avance = min(1.0, (self.ticks - tick + self.alfa) / periodo)
+        return (x0 + (x1 - x0) * avance, y0 + (y1 - y0) * avance)
+
+    def dibujar_grid(self, superficie: pygame.Surface):
         """Dibuja la cuadrícula de fondo"""
+        superficie.fill(configuracion.COLOR_FONDO)
+        if not configuracion.MOSTRAR_GRID:
+            return
+
         for x in range(-configuracion.LIMITE, configuracion.LIMITE + 1):
             for y in range(-configuracion.LIMITE, configuracion.LIMITE + 1):
                 pos_x, pos_y = self.mundo_a_pantalla(x, y)
                 pygame.draw.rect(
-                    self.screen,
+                    superficie,
                     (20, 20, 20),
                     (pos_x - self.cell_size//2, pos_y - self.cell_size//2,
                      self.cell_size, self.cell_size),
                     1
                 )
 
-    def dibujar_visibility_graph(self):
+    def dibujar_visibility_graph(self, superficie: pygame.Surface):
         """
         Dibuja el Visibility Graph (caminos óptimos)
         """
@@ -89,7 +180,7 @@ class JuegoPygame:
                 pos2 = self.mundo_a_pantalla(vecino[0], vecino[1])
 
                 pygame.draw.line(
-                    self.screen,
+                    superficie,
                     configuracion.COLOR_VG_LINEA,
                     pos1,
                     pos2,
@@ -100,13 +191,13 @@ class JuegoPygame:
         for nodo in vg.grafo.keys():
             pos_x, pos_y = self.mundo_a_pantalla(nodo[0], nodo[1])
             pygame.draw.circle(
-                self.screen,
+                superficie,
                 configuracion.COLOR_VG_NODO,
                 (pos_x, pos_y),
                 3
             )
 
-    def dibujar_voronoi(self):
+    def dibujar_voronoi(self, superficie: pygame.Surface):
         """
         Dibuja el diagrama de Voronoi (caminos seguros)
         """
@@ -129,7 +220,7 @@ class JuegoPygame:
                 pos2 = self.mundo_a_pantalla(vecino[0], vecino[1])
 
                 pygame.draw.line(
-                    self.screen,
+                    superficie,
                     configuracion.COLOR_VORONOI_LINEA,
                     pos1,
                     pos2,
@@ -140,13 +231,13 @@ class JuegoPygame:
         for nodo in voronoi.puntos_voronoi:
             pos_x, pos_y = self.mundo_a_pantalla(nodo[0], nodo[1])
             pygame.draw.circle(
-                self.screen,
+                superficie,
                 configuracion.COLOR_VORONOI_NODO,
                 (pos_x, pos_y),
                 2
             )
 
-    def dibujar_obstaculos(self):
+    def dibujar_obstaculos(self, superficie: pygame.Surface):
         """Dibuja los obstáculos (paredes del laberinto)"""
         for obs in self.entorno.obstaculos:
             x, y = obs.pos
@@ -161,8 +252,18 @@ class JuegoPygame:
                 tam * self.cell_size
             )
 
-            pygame.draw.rect(self.screen, configuracion.COLOR_OBSTACULO, rect)
-            pygame.draw.rect(self.screen, (100, 100, 255), rect, 3)
+            pygame.draw.rect(superficie, configuracion.COLOR_OBSTACULO, rect)
+            pygame.draw.rect(superficie, (100, 100, 255), rect, 3)
+
+    def capas_visibles(self) -> List[Tuple[str, Callable[[pygame.Surface], None], bool]]:
+        """Capas estáticas activas, de abajo hacia arriba (nombre, dibujar, opaca)"""
+        capas = [('fondo', self.dibujar_grid, True)]
+        if configuracion.MOSTRAR_VISIBILITY_GRAPH:
+            capas.append(('visibility_graph', self.dibujar_visibility_graph, False))
+        if configuracion.MOSTRAR_VORONOI:
+            capas.append(('voronoi', self.dibujar_voronoi, False))
+        capas.append(('obstaculos', self.dibujar_obstaculos, False))
+        return capas
 
     def dibujar_puntos(self):
         """Dibuja los puntos a recolectar"""
@@ -178,16 +279,16 @@ class JuegoPygame:
                     self.cell_size // 4
                 )
 
-    def dibujar_pacman(self):
-        """Dibuja a Pac-Man"""
+    def dibujar_pacman(self) -> List[pygame.Rect]:
+        """Dibuja a Pac-Man y devuelve el área ocupada"""
         if not self.entorno.pacman.vivo:
-            return
+            return []
 
-        x, y = self.entorno.pacman.pos
+        x, y = self.posicion_interpolada(self.entorno.pacman)
         pos_x, pos_y = self.mundo_a_pantalla(x, y)
 
         radio = int(self.cell_size * 0.4)
-        pygame.draw.circle(
+        rect = pygame.draw.circle(
             self.screen,
             configuracion.COLOR_PACMAN,
             (pos_x, pos_y),
@@ -208,15 +309,18 @@ class JuegoPygame:
             ]
             pygame.draw.polygon(self.screen, configuracion.COLOR_FONDO, puntos)
 
-    def dibujar_fantasmas(self):
-        """Dibuja los fantasmas"""
+        return [rect]
+
+    def dibujar_fantasmas(self) -> List[pygame.Rect]:
+        """Dibuja los fantasmas y devuelve sus áreas"""
+        rects = []
         for fantasma in self.entorno.fantasmas:
-            x, y = fantasma.pos
+            x, y = self.posicion_interpolada(fantasma)
             pos_x, pos_y = self.mundo_a_pantalla(x, y)
 
             radio = int(self.cell_size * 0.35)
 
-            pygame.draw.circle(
+            rect = pygame.draw.circle(
                 self.screen,
                 fantasma.color,
                 (pos_x, pos_y),
@@ -250,66 +354,67 @@ class JuegoPygame:
                 (pos_x + radio//3, pos_y - radio//4),
                 pupila_radio
             )
-
-    def dibujar_hud(self):
-        """Dibuja la información en pantalla"""
-        texto_nivel = self.font_normal.render(
-            f"NIVEL {self.entorno.nivel_actual + 1}",
-            True,
-            (255, 255, 255)
+            rects.append(rect)
+
+        return rects
+
+    def firma_hud(self) -> tuple:
+        """Valores que determinan el contenido del HUD (cambia => hay que presentarlo)"""
+        return (
+            self.entorno.nivel_actual,
+            self.entorno.pacman.puntaje,
+            sum(1 for p in self.entorno.puntos if not p.recolectado),
+            len(self.entorno.puntos),
+            configuracion.MOSTRAR_VISIBILITY_GRAPH,
+            configuracion.MOSTRAR_VORONOI,
+            self.mostrar_ayuda and self.ticks < 300,
         )
-        self.screen.blit(texto_nivel, (20, 20))
 
-        texto_puntaje = self.font_normal.render(
-            f"PUNTOS: {self.entorno.pacman.puntaje}",
-            True,
-            (255, 255, 0)
-        )
-        self.screen.blit(texto_puntaje, (20, 60))
+    def dibujar_hud(self) -> List[pygame.Rect]:
+        """Dibuja la información en pantalla y devuelve las áreas usadas"""
+        rects = [
+            self.etiqueta_nivel.dibujar(self.screen, self.entorno.nivel_actual, (20, 20)),
+            self.etiqueta_puntaje.dibujar(self.screen, self.entorno.pacman.puntaje, (20, 60)),
+        ]
 
         puntos_restantes = sum(1 for p in self.entorno.puntos if not p.recolectado)
-        texto_restantes = self.font_pequeña.render(
-            f"Restantes: {puntos_restantes}/{len(self.entorno.puntos)}",
-            True,
-            (200, 200, 200)
-        )
-        self.screen.blit(texto_restantes, (20, 100))
+        rects.append(self.etiqueta_restantes.dibujar(
+            self.screen, (puntos_restantes, len(self.entorno.puntos)), (20, 100)
+        ))
 
         # Indicadores de visualización de grafos ← LEER DIRECTAMENTE DEL MÓDULO
         y_offset = 140
         if configuracion.MOSTRAR_VISIBILITY_GRAPH:
-            texto_vg = self.font_pequeña.render(
-                "Visibility Graph: ON",
-                True,
-                configuracion.COLOR_VG_NODO
-            )
-            self.screen.blit(texto_vg, (20, y_offset))
+            texto_vg = self.textos.render(self.font_pequeña, "Visibility Graph: ON",
+                                          configuracion.COLOR_VG_NODO)
+            rects.append(self.screen.blit(texto_vg, (20, y_offset)))
             y_offset += 30
 
         if configuracion.MOSTRAR_VORONOI:
-            texto_voronoi = self.font_pequeña.render(
-                "Voronoi Diagram: ON",
-                True,
-                configuracion.COLOR_VORONOI_NODO
-            )
-            self.screen.blit(texto_voronoi, (20, y_offset))
+            texto_voronoi = self.textos.render(self.font_pequeña, "Voronoi Diagram: ON",
+                                               configuracion.COLOR_VORONOI_NODO)
+            rects.append(self.screen.blit(texto_voronoi, (20, y_offset)))
 
-        if self.mostrar_ayuda and self.frame_count < 300:
+        if self.mostrar_ayuda and self.ticks < 300:
             ayuda_textos = [
                 "Usa las FLECHAS para mover",
                 "ESPACIO para pausar",
                 "V para toggle Visibility Graph",
                 "W para toggle Voronoi",
                 "R para REINICIAR nivel",
+                "F3 para ver rendimiento",
+                "F5 para perfilar",
                 "ESC para salir"
             ]
 
             for i, texto in enumerate(ayuda_textos):
-                superficie = self.font_pequeña.render(texto, True, (100, 255, 100))
-                self.screen.blit(
+                superficie = self.textos.render(self.font_pequeña, texto, (100, 255, 100))
+                rects.append(self.screen.blit(
                     superficie,
                     (self.ancho - 350, 20 + i * 30)
-                )
+                ))
+
+        return rects
 
     def dibujar_pausa(self):
         """Dibuja la pantalla de pausa"""
@@ -318,13 +423,13 @@ class JuegoPygame:
         overlay.fill((0, 0, 0))
         self.screen.blit(overlay, (0, 0))
 
-        texto = self.font_grande.render("PAUSA", True, (255, 255, 0))
+        texto = self.textos.render(self.font_grande, "PAUSA", (255, 255, 0))
         rect = texto.get_rect(center=(self.ancho // 2, self.alto // 2))
         self.screen.blit(texto, rect)
 
-        texto_continuar = self.font_pequeña.render(
+        texto_continuar = self.textos.render(
+            self.font_pequeña,
             "Presiona ESPACIO para continuar",
-            True,
             (255, 255, 255)
         )
         rect_continuar = texto_continuar.get_rect(
@@ -340,43 +445,84 @@ class JuegoPygame:
         self.screen.blit(overlay, (0, 0))
 
         if self.entorno.victoria:
-            texto = self.font_grande.render("¡VICTORIA!", True, (0, 255, 0))
+            texto = self.textos.render(self.font_grande, "¡VICTORIA!", (0, 255, 0))
             mensaje = "¡Completaste todos los niveles!"
         else:
-            texto = self.font_grande.render("GAME OVER", True, (255, 0, 0))
+            texto = self.textos.render(self.font_grande, "GAME OVER", (255, 0, 0))
             mensaje = "Pac-Man fue atrapado"
 
         rect = texto.get_rect(center=(self.ancho // 2, self.alto // 2 - 80))
         self.screen.blit(texto, rect)
 
-        texto_mensaje = self.font_normal.render(mensaje, True, (255, 255, 255))
+        texto_mensaje = self.textos.render(self.font_normal, mensaje, (255, 255, 255))
         rect_mensaje = texto_mensaje.get_rect(center=(self.ancho // 2, self.alto // 2 - 20))
         self.screen.blit(texto_mensaje, rect_mensaje)
 
-        texto_puntaje = self.font_normal.render(
+        texto_puntaje = self.textos.render(
+            self.font_normal,
             f"Puntaje Final: {self.entorno.pacman.puntaje}",
-            True,
             (255, 255, 0)
         )
         rect_puntaje = texto_puntaje.get_rect(center=(self.ancho // 2, self.alto // 2 + 30))
         self.screen.blit(texto_puntaje, rect_puntaje)
 
-        texto_reiniciar = self.font_normal.render(
+        texto_reiniciar = self.textos.render(
+            self.font_normal,
             "Presiona R para REINICIAR",
-            True,
             (100, 255, 100)
         )
         rect_reiniciar = texto_reiniciar.get_rect(center=(self.ancho // 2, self.alto // 2 + 80))
         self.screen.blit(texto_reiniciar, rect_reiniciar)
 
-        texto_salir = self.font_pequeña.render(
+        texto_salir = self.textos.render(
+            self.font_pequeña,
             "Presiona ESC para salir",
-            True,
             (200, 200, 200)
         )
         rect_salir = texto_salir.get_rect(center=(self.ancho // 2, self.alto // 2 + 130))
         self.screen.blit(texto_salir, rect_salir)
 
+    def dibujar_rendimiento(self):
+        """Dibuja el overlay de tiempos por frame y puntos calientes"""
+        if not configuracion.MOSTRAR_RENDIMIENTO:
+            return
+
+        p50, p90, p99 = self.instrumentacion.percentiles_frame()
+        lineas = [
+            (f"Frame p50 {p50:.2f}  p90 {p90:.2f}  p99 {p99:.2f} ms", (255, 255, 255)),
+            (f"FPS {self.clock.get_fps():.1f}  ticks descartados {self.reloj.ticks_descartados}",
+             (200, 200, 200)),
+        ]
+        for nombre, media, pico in self.instrumentacion.puntos_calientes(6):
+            lineas.append((f"{media:7.3f} ms  (p99 {pico:.2f})  {nombre}", (255, 200, 100)))
+
+        alto_linea = 22
+        panel = pygame.Surface((self.ancho - 40, alto_linea * len(lineas) + 10))
+        panel.set_alpha(180)
+        panel.fill((0, 0, 0))
+        y_panel = self.alto - panel.get_height() - 20
+        self.screen.blit(panel, (20, y_panel))
+
+        for i, (texto, color) in enumerate(lineas):
+            superficie = self.font_pequeña.render(texto, True, color)
+            self.screen.blit(superficie, (28, y_panel + 5 + i * alto_linea))
+
+    def iniciar_perfil(self, duracion: float):
+        """Perfila la ventana de `duracion` segundos y guarda las pilas al terminar"""
+        if self.perfilador.activo:
+            return
+
+        ruta = self.salida_perfil or time.strftime("perfil_%Y%m%d_%H%M%S.folded")
+
+        def guardar():
+            self.perfilador.escribir_collapsed(ruta)
+            print(f"Perfil guardado en {ruta} ({self.perfilador.muestras} muestras)")
+            for etiqueta, muestras in self.perfilador.puntos_calientes(5):
+                print(f"   {muestras:6d}  {etiqueta}")
+
+        print(f"Perfilando {duracion:.1f} s...")
+        self.perfilador.iniciar(duracion, al_terminar=guardar)
+
     def manejar_eventos(self):
         """Maneja los eventos del teclado"""
         for event in pygame.event.get():
@@ -389,6 +535,9 @@ class JuegoPygame:
 
                 if event.key == pygame.K_SPACE:
                     self.pausa = not self.pausa
+                    if not self.pausa:
+                        # El tiempo en pausa no se recupera con ticks al reanudar
+                        self.reloj.reiniciar()
 
                 # Toggle Visibility Graph ← MODIFICAR DIRECTAMENTE EL MÓDULO
                 if event.key == pygame.K_v:
@@ -402,6 +551,17 @@ class JuegoPygame:
                     estado = "ON" if configuracion.MOSTRAR_VORONOI else "OFF"
                     print(f"Voronoi Diagram: {estado}")
 
+                # Toggle overlay de rendimiento
+                if event.key == pygame.K_F3:
+                    configuracion.MOSTRAR_RENDIMIENTO = not configuracion.MOSTRAR_RENDIMIENTO
+
+                # Perfilador: inicia una ventana o corta la actual
+                if event.key == pygame.K_F5:
+                    if self.perfilador.activo:
+                        self.perfilador.detener()
+                    else:
+                        self.iniciar_perfil(configuracion.DURACION_PERFIL)
+
                 if event.key == pygame.K_r:
                     if self.entorno.juego_terminado:
                         print("\nReiniciando juego...")
@@ -423,14 +583,19 @@ class JuegoPygame:
         return True
 
     def actualizar(self):
-        """Actualiza la lógica del juego"""
+        """Avanza la lógica del juego un tick"""
         if self.pausa or self.entorno.juego_terminado:
             return
 
-        self.frame_count += 1
+        self.ticks += 1
+        self.entorno.recordar_posiciones()
 
-        if self.frame_count % self.velocidad_pacman == 0:
-            self.entorno.pacman.actualizar_movimiento_interactivo(self.entorno.obstaculos)
+        medir = self.instrumentacion.medir
+
+        if self.ticks % self.velocidad_pacman == 0:
+            self.registrar_paso(self.entorno.pacman, self.velocidad_pacman)
+            with medir("actualizar/pacman"):
+                self.entorno.pacman.actualizar_movimiento_interactivo(self.entorno.obstaculos)
 
             for punto in self.entorno.puntos:
                 if not punto.recolectado and self.entorno.pacman.pos == punto.pos:
@@ -438,20 +603,27 @@ class JuegoPygame:
                     self.entorno.puntaje = self.entorno.pacman.puntaje
                     print(f"Punto! Puntaje: {self.entorno.puntaje}")
 
-        if self.frame_count % self.velocidad_fantasma == 0:
+        if self.ticks % self.velocidad_fantasma == 0:
             for fantasma in self.entorno.fantasmas:
-                if not fantasma.trayectoria or len(fantasma.trayectoria) <= 1:
-                    fantasma.perseguir_pacman(
-                        self.entorno.pacman.pos,
-                        self.entorno.visibility_graph,
-                        self.entorno.voronoi_diagram,
-                        self.entorno.obstaculos
-                    )
+                self.registrar_paso(fantasma, self.velocidad_fantasma)
+                if self.planificacion is not None:
+                    self.perseguir_diferido(fantasma)
+                elif not fantasma.trayectoria or len(fantasma.trayectoria) <= 1:
+                    with medir(f"actualizar/perseguir_pacman [{fantasma.algoritmo_usado}]"):
+                        fantasma.perseguir_pacman(
+                            self.entorno.pacman.pos,
+                            self.entorno.visibility_graph,
+                            self.entorno.voronoi_diagram,
+                            self.entorno.obstaculos
+                        )
 
                 if fantasma.trayectoria and len(fantasma.trayectoria) > 1:
                     fantasma.mover_siguiente()
 
-        if self.entorno.pacman.verificar_colision_fantasma(self.entorno.fantasmas):
+        with medir("actualizar/colisiones"):
+            capturado = self.entorno.pacman.verificar_colision_fantasma(self.entorno.fantasmas)
+
+        if capturado:
             self.entorno.juego_terminado = True
             self.entorno.victoria = False
             print("\nGAME OVER")
@@ -468,40 +640,117 @@ class JuegoPygame:
                 print("\n¡GANASTE TODO!")
             else:
                 self.entorno._reiniciar_nivel()
-                self.frame_count = 0
+                self.capas.invalidar()
+                self.cancelar_planificacion()
+                self.ticks = 0
+                self.pasos_en_curso.clear()
                 nivel_config = NIVELES[self.entorno.nivel_actual]
                 self.velocidad_fantasma = nivel_config['velocidad_fantasmas']
                 pygame.display.set_caption(f"Pac-Man IA - Nivel {self.entorno.nivel_actual + 1}")
 
+    def perseguir_diferido(self, fantasma):
+        """
+        Pide la siguiente ruta cuando al fantasma le queda un paso, para que
+        esté lista al terminar la actual. Si una ruta sigue pendiente desde el
+        turno anterior, el fantasma avanza en la grilla y se vuelve a pedir.
+        """
+        pacman = self.entorno.pacman
+        pendiente = self.planificacion.pendiente(fantasma)
+
+        if len(fantasma.trayectoria) <= 2 and not pendiente:
+            fantasma.solicitar_persecucion(self.planificacion, pacman.pos,
+                                           self.entorno.visibility_graph,
+                                           self.entorno.voronoi_diagram)
+        elif len(fantasma.trayectoria) <= 1 and pendiente and configuracion.FALLBACK_GREEDY:
+            if fantasma.paso_greedy(pacman.pos, self.entorno.obstaculos):
+                fantasma.solicitar_persecucion(self.planificacion, pacman.pos,
+                                               self.entorno.visibility_graph,
+                                               self.entorno.voronoi_diagram)
+
     def dibujar(self):
         """Dibuja todos los elementos en el orden correcto"""
-        self.screen.fill(configuracion.COLOR_FONDO)
-
-        # Dibujar grafos de planificación PRIMERO (fondo)
-        self.dibujar_visibility_graph()
-        self.dibujar_voronoi()
+        medir = self.instrumentacion.medir
+
+        # Fondo, grafos de planificación y obstáculos (capas pre-renderizadas)
+        with medir("dibujar/capas_estaticas"):
+            fondo = self.capas.composicion(self.capas_visibles())
+            completo = self._requiere_redibujo_completo(fondo)
+            if completo:
+                self.screen.blit(fondo, (0, 0))
+            else:
+                # Restaurar solo lo que ocupaban los sprites y el HUD
+                for rect in self._rects_sprites + self._rects_hud:
+                    self.screen.blit(fondo, rect, rect)
 
         # Luego los elementos del juego
-        self.dibujar_obstaculos()
-        self.dibujar_puntos()
-        self.dibujar_fantasmas()
-        self.dibujar_pacman()
-        self.dibujar_hud()
+        with medir("dibujar/puntos"):
+            self.dibujar_puntos()
+        with medir("dibujar/fantasmas"):
+            rects_sprites = self.dibujar_fantasmas()
+        with medir("dibujar/pacman"):
+            rects_sprites += self.dibujar_pacman()
+        with medir("dibujar/hud"):
+            rects_hud = self.dibujar_hud()
 
         if self.pausa:
-            self.dibujar_pausa()
+            with medir("dibujar/pausa"):
+                self.dibujar_pausa()
 
         if self.entorno.juego_terminado:
-            self.dibujar_game_over()
+            with medir("dibujar/game_over"):
+                self.dibujar_game_over()
+
+        # El overlay va al final para quedar encima de todo
+        self.dibujar_rendimiento()
+
+        with medir("dibujar/flip"):
+            if completo:
+                pygame.display.flip()
+            else:
+                sucios = self._rects_sprites + rects_sprites
+                firma = self.firma_hud()
+                if firma != self._firma_hud:
+                    sucios += self._rects_hud + rects_hud
+                    self._firma_hud = firma
+                pygame.display.update(sucios)
 
-        pygame.display.flip()
+        self._rects_sprites = rects_sprites
+        self._rects_hud = rects_hud
+
+    def _requiere_redibujo_completo(self, fondo: pygame.Surface) -> bool:
+        """
+        En modo de rectángulos sucios, el frame completo solo se redibuja al
+        cambiar las capas estáticas o mientras haya overlays de pantalla completa
+        (y en el frame siguiente, para borrarlos).
+        """
+        if not self.rectangulos_sucios:
+            return True
+
+        estado = (id(fondo), self.pausa, self.entorno.juego_terminado,
+                  configuracion.MOSTRAR_RENDIMIENTO)
+        completo = (estado != self._estado_pantalla or self.pausa
+                    or self.entorno.juego_terminado or configuracion.MOSTRAR_RENDIMIENTO)
+        self._estado_pantalla = estado
+        if completo:
+            self._firma_hud = None
+        return completo
+
+    def cancelar_planificacion(self):
+        """Descarta las búsquedas en curso (los planificadores del nivel cambiaron)"""
+        if isinstance(self.planificacion, ServicioPlanificacion):
+            self.planificacion.invalidar_instantaneas()
+        elif self.planificacion is not None:
+            self.planificacion.cancelar()
 
     def reiniciar_nivel(self):
         """Reinicia el nivel actual"""
-        self.frame_count = 0
+        self.ticks = 0
+        self.pasos_en_curso.clear()
         self.pausa = False
 
         self.entorno._reiniciar_nivel()
+        self.capas.invalidar()
+        self.cancelar_planificacion()
 
         from config.niveles import NIVELES
         nivel_config = NIVELES[self.entorno.nivel_actual]
@@ -512,13 +761,16 @@ class JuegoPygame:
 
     def reiniciar_juego(self):
         """Reinicia el juego desde el nivel 1"""
-        self.frame_count = 0
+        self.ticks = 0
+        self.pasos_en_curso.clear()
         self.pausa = False
 
         self.entorno.nivel_actual = 0
         self.entorno.juego_terminado = False
         self.entorno.victoria = False
         self.entorno._reiniciar_nivel()
+        self.capas.invalidar()
+        self.cancelar_planificacion()
 
         from config.niveles import NIVELES
         nivel_config = NIVELES[self.entorno.nivel_actual]
@@ -536,16 +788,42 @@ class JuegoPygame:
         print("  V - Toggle Visibility Graph")
         print("  W - Toggle Voronoi Diagram")
         print("  R - Reiniciar nivel/juego")
+        print("  F3 - Overlay de rendimiento")
+        print("  F5 - Perfilar (muestreo)")
         print("  ESC - Salir")
         print("="*60 + "\n")
 
+        medir = self.instrumentacion.medir
+
+        if self.perfilar_al_iniciar:
+            self.iniciar_perfil(self.perfilar_al_iniciar)
+
         ejecutando = True
         while ejecutando:
-            ejecutando = self.manejar_eventos()
-            self.actualizar()
-            self.dibujar()
+            self.instrumentacion.iniciar_frame()
+            with medir("manejar_eventos"):
+                ejecutando = self.manejar_eventos()
+            with medir("actualizar"):
+                for _ in range(self.reloj.avanzar()):
+                    self.actualizar()
+            if self.planificacion is not None and not self.pausa:
+                with medir("planificacion"):
+                    self.planificacion.ejecutar()
+            # En pausa o fin de juego no hay tick en curso que interpolar
+            detenido = self.pausa or self.entorno.juego_terminado
+            self.alfa = 1.0 if detenido else self.reloj.alfa
+            with medir("dibujar"):
+                self.dibujar()
+            # La espera del reloj no cuenta como tiempo de frame
+            self.instrumentacion.terminar_frame()
             self.clock.tick(self.fps)
 
+        if self.perfilador.activo:
+            self.perfilador.detener()
+
+        if isinstance(self.planificacion, ServicioPlanificacion):
+            self.planificacion.cerrar()
+
         pygame.quit()
 
         print("\n" + "="*60)